@@ -0,0 +1,433 @@
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
+
+/**
+ * Chomper Benchmark – Page Harness
+ *
+ * Loaded ahead of the extension scripts on every page
+ * generated by benchmark.py. It stands in for the
+ * chrome.* APIs the content scripts use, replays the
+ * page's scripted mutations once it has loaded, and
+ * posts the measurements back to the benchmark server.
+ * It also times how long after navigation start the
+ * first ad node is hidden, and in how many frames
+ * before that it was visible, and how long the extension
+ * scripts took to evaluate. Ads inside shadow roots
+ * and frames are counted with the rest. It counts the
+ * mutation records the page sees and, when the page
+ * asks for it, puts back removed ads and overlays.
+ *
+ * On idle pages nothing changes after load. Instead the
+ * harness counts the timer, frame and idle callbacks the
+ * extension scripts get woken for, per minute: while the
+ * sweep backs off, once it has backed off, and while the
+ * tab is hidden (emulated through document.hidden and a
+ * visibilitychange event). It also times the first sweep
+ * after the tab is shown again.
+ */
+
+(() => {
+  const config = window.CHOMPER_BENCH;
+  const reports = [];      // Perf counter reports sent by content.js
+  const latencies = [];    // Mutation-to-flush times (ms)
+  let mutationStart = 0;   // Time of the oldest mutation not yet flushed
+  let firstAd = null;      // First ad node the parser added
+  let firstHiddenMs = null;
+  let adVisibleFrames = 0;
+  let mutationRecords = 0;
+  let reinserted = 0;
+  const dropped = new WeakSet();     // Feed items the harness removed itself
+  const reinsertCounts = new WeakMap();
+  let wakeupPhase = null;  // Idle phase being counted, if any
+  const wakeups = {};      // Idle phase -> { ms, timers, sweeps }
+  let hidden = false;      // Emulated document.hidden on idle pages
+  let shownAt = null;
+  let resumeMs = null;     // From showing the tab to the next sweep
+
+  // The harness's own timers, taken before the extension's are wrapped
+  const benchTimeout = window.setTimeout;
+  const benchFrame = window.requestAnimationFrame;
+
+  /* -----------------------------
+     chrome.* stand-ins
+  ------------------------------*/
+
+  window.chrome = {
+    storage: {
+      local: {
+        get(keys, callback) {
+          const result = {};
+          [].concat(keys).forEach(key => {
+            if (key in config.storage) result[key] = config.storage[key];
+          });
+          // Answer asynchronously, like the real IPC round trip
+          benchTimeout(() => callback(result), config.storageDelay);
+        }
+      },
+      onChanged: { addListener() {} }
+    },
+    runtime: {
+      sendMessage(message) {
+        if (message.type === "chomper:stats") reports.push(message.stats);
+        return Promise.resolve();
+      },
+      onMessage: { addListener() {} }
+    }
+  };
+
+  /* -----------------------------
+     Wake-ups
+  ------------------------------*/
+
+  /**
+   * Wraps one timer API so that, during an idle phase,
+   * every callback it runs is counted as a wake-up, and
+   * content.js's sweep ticks also as sweeps.
+   */
+  function countWakeups(name) {
+    const schedule = window[name];
+    if (!schedule) return;
+    window[name] = function (callback, ...args) {
+      if (typeof callback !== "function") return schedule.call(window, callback, ...args);
+      return schedule.call(window, function () {
+        if (wakeupPhase) {
+          wakeups[wakeupPhase].timers++;
+          if (callback === window.runSweep) wakeups[wakeupPhase].sweeps++;
+        }
+        if (callback === window.runSweep && shownAt !== null && resumeMs === null) {
+          resumeMs = performance.now() - shownAt;
+        }
+        return callback.apply(this, arguments);
+      }, ...args);
+    };
+  }
+
+  /**
+   * Emulates the tab being hidden or shown, the way the
+   * browser reports it to content.js.
+   */
+  function setHidden(value) {
+    hidden = value;
+    document.dispatchEvent(new Event("visibilitychange"));
+  }
+
+  /**
+   * Counts wake-ups for each idle phase in turn, then
+   * shows the tab again and finishes once the sweep has
+   * resumed.
+   */
+  function runIdlePhases(phases) {
+    const order = ["backoff", "visible", "hidden"];
+    const next = index => {
+      if (wakeupPhase) wakeups[wakeupPhase].ms = performance.now() - wakeups[wakeupPhase].start;
+      if (index === order.length) {
+        wakeupPhase = null;
+        shownAt = performance.now();
+        // runSweep runs synchronously from the visibilitychange handler
+        const sweep = window.runSweep;
+        window.runSweep = function () {
+          if (resumeMs === null) resumeMs = performance.now() - shownAt;
+          return sweep.apply(this, arguments);
+        };
+        setHidden(false);
+        window.runSweep = sweep;
+        benchTimeout(finish, config.settle);
+        return;
+      }
+      wakeupPhase = order[index];
+      wakeups[wakeupPhase] = { start: performance.now(), ms: 0, timers: 0, sweeps: 0 };
+      if (wakeupPhase === "hidden") setHidden(true);
+      benchTimeout(() => next(index + 1), phases[wakeupPhase]);
+    };
+    next(0);
+  }
+
+  if (config.idle) {
+    ["setTimeout", "setInterval", "requestAnimationFrame", "requestIdleCallback"].forEach(countWakeups);
+    Object.defineProperty(document, "hidden", { get: () => hidden });
+    Object.defineProperty(document, "visibilityState", { get: () => (hidden ? "hidden" : "visible") });
+  }
+
+  /* -----------------------------
+     Measurement
+  ------------------------------*/
+
+  /**
+   * Checks once per frame whether the first ad node is
+   * hidden yet, counting the frames it was visible.
+   */
+  function checkFirstAd() {
+    if (getComputedStyle(firstAd).display === "none") {
+      firstHiddenMs = performance.now();
+      return;
+    }
+    adVisibleFrames++;
+    benchFrame(checkFirstAd);
+  }
+
+  // Registered before content.js, so it sees the parser add the first ad
+  const adWatcher = new MutationObserver(mutations => {
+    for (const mutation of mutations) {
+      for (const node of mutation.addedNodes) {
+        if (node.nodeType !== Node.ELEMENT_NODE) continue;
+        firstAd = node.matches("[data-bench='ad']") ? node : node.querySelector("[data-bench='ad']");
+        if (firstAd) {
+          adWatcher.disconnect();
+          checkFirstAd();
+          return;
+        }
+      }
+    }
+  });
+  adWatcher.observe(document.documentElement, { childList: true, subtree: true });
+
+  /**
+   * Puts a fresh copy of a removed ad or overlay back
+   * where it was, like a site rebuilding its ad slot,
+   * at most config.reinsert times per original node.
+   */
+  function reinsert(node, mutation) {
+    const count = reinsertCounts.get(node) || 0;
+    if (count >= config.reinsert || !mutation.target.isConnected) return;
+    const copy = node.cloneNode(true);
+    reinsertCounts.set(copy, count + 1);
+    const next = mutation.nextSibling;
+    mutation.target.insertBefore(copy, next && next.parentNode === mutation.target ? next : null);
+    reinserted++;
+  }
+
+  // Counts every record, including the ones the harness itself causes
+  const pageWatcher = new MutationObserver(mutations => {
+    mutationRecords += mutations.length;
+    if (!config.reinsert) return;
+    for (const mutation of mutations) {
+      for (const node of mutation.removedNodes) {
+        if (node.nodeType === Node.ELEMENT_NODE && node.hasAttribute("data-bench") && !dropped.has(node)) {
+          reinsert(node, mutation);
+        }
+      }
+    }
+  });
+  pageWatcher.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+  });
+
+  /**
+   * Wraps content.js's flush so the time from a scripted
+   * mutation to the end of the pass that handled it is
+   * recorded.
+   */
+  function measureFlushes() {
+    const flush = window.flushAddedNodes;
+    window.flushAddedNodes = function () {
+      const result = flush.apply(this, arguments);
+      if (mutationStart) {
+        latencies.push(performance.now() - mutationStart);
+        mutationStart = 0;
+      }
+      return result;
+    };
+  }
+
+  /**
+   * Gives a new shadow host its root with attachShadow(),
+   * moving in the items of its template.
+   */
+  function attachBenchShadow(host) {
+    const template = host.matches(".bench-host") && host.querySelector(":scope > template");
+    if (!template) return;
+    host.attachShadow({ mode: "open" }).append(template.content.cloneNode(true));
+    template.remove();
+  }
+
+  /**
+   * Returns the document plus every shadow root and frame
+   * document the page holds.
+   */
+  function benchRoots() {
+    const roots = [document];
+    document.querySelectorAll(".bench-host").forEach(host => host.shadowRoot && roots.push(host.shadowRoot));
+    document.querySelectorAll(".bench-frame").forEach(frame => frame.contentDocument && roots.push(frame.contentDocument));
+    return roots;
+  }
+
+  /**
+   * Applies one round of scripted mutations: a batch of
+   * new feed items or shadow hosts, and class/text
+   * changes on the live nodes. The oldest feed items are
+   * dropped so the page size stays constant.
+   */
+  function mutate(round) {
+    if (!mutationStart) mutationStart = performance.now();
+
+    const feed = document.getElementById("bench-feed");
+    const last = feed.lastElementChild;
+    feed.insertAdjacentHTML("beforeend", config.mutations.batches[round]);
+    for (let node = last ? last.nextElementSibling : feed.firstElementChild; node; node = node.nextElementSibling) {
+      attachBenchShadow(node);
+    }
+    for (let i = 0; i < config.mutations.batchSize && feed.firstElementChild; i++) {
+      dropped.add(feed.firstElementChild);
+      feed.firstElementChild.remove();
+    }
+
+    document.querySelectorAll("[data-bench='live']").forEach((node, i) => {
+      node.classList.toggle("live-active", (round + i) % 2 === 0);
+      node.textContent = "Live update " + round;
+    });
+
+    if (config.player) playback(round);
+  }
+
+  /**
+   * Imitates a playing YouTube player: progress and
+   * time updates every round, plus ad breaks that set
+   * the ad-showing class and add a skip button.
+   */
+  function playback(round) {
+    const player = document.getElementById("movie_player");
+    player.querySelector(".ytp-progress-bar").style.width = round + "%";
+    player.querySelector(".ytp-time-current").textContent = "0:" + String(round).padStart(2, "0");
+
+    const adModule = player.querySelector(".ytp-ad-module");
+    const { adRounds, adLength } = config.player;
+    if (adRounds.includes(round)) {
+      player.classList.add("ad-showing");
+      adModule.insertAdjacentHTML("beforeend", '<button class="ytp-ad-skip-button">Skip</button>');
+    } else if (adRounds.includes(round - adLength)) {
+      player.classList.remove("ad-showing");
+      adModule.replaceChildren();
+    }
+  }
+
+  /**
+   * Returns the bytes of the extension scripts and the
+   * time they took to evaluate: from the mark the page
+   * set before each one, or from when its download
+   * finished if that came later, to the mark after it.
+   */
+  function scriptEvaluation() {
+    let ms = 0;
+    let bytes = 0;
+    for (const script of config.scripts) {
+      const [before] = performance.getEntriesByName(`chomper:before:${script}`);
+      const [after] = performance.getEntriesByName(`chomper:after:${script}`);
+      const [download] = performance.getEntriesByName(new URL(`ext/${script}`, location.href).href);
+      if (!before || !after || !download) return { ms: null, bytes: null };
+      ms += after.startTime - Math.max(before.startTime, download.responseEnd);
+      bytes += download.decodedBodySize;
+    }
+    return { ms, bytes };
+  }
+
+  function percentile(sorted, fraction) {
+    if (!sorted.length) return null;
+    return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * fraction))];
+  }
+
+  /**
+   * Collects the final counters and posts them to the
+   * benchmark server.
+   */
+  function finish() {
+    reportPerf();
+    pageWatcher.disconnect();
+
+    const passes = {};
+    reports.forEach(report => {
+      for (const [name, pass] of Object.entries(report.passes)) {
+        const sum = passes[name] || (passes[name] = { count: 0, total_ms: 0, max_ms: 0 });
+        sum.count += pass.count;
+        sum.total_ms += pass.total;
+        sum.max_ms = Math.max(sum.max_ms, pass.max);
+      }
+    });
+    const minutes = (performance.now() - startedAt) / 60000;
+    Object.values(passes).forEach(pass => {
+      pass.mean_ms = pass.total_ms / pass.count;
+      pass.per_minute = pass.count / minutes;
+    });
+
+    const roots = benchRoots();
+    const ads = roots.flatMap(root => Array.from(root.querySelectorAll("[data-bench='ad']")));
+    const hidden = ads.filter(ad => ad.ownerDocument.defaultView.getComputedStyle(ad).display === "none").length;
+    const sorted = latencies.slice().sort((a, b) => a - b);
+    const evaluation = scriptEvaluation();
+    const memory = performance.memory
+      ? performance.memory.usedJSHeapSize
+      : (window.chomperBenchHeap ? window.chomperBenchHeap() : null);
+
+    const result = {
+      passes,
+      skipped: reports.reduce((sum, report) => sum + report.skipped, 0),
+      removed: reports.reduce((sum, report) =>
+        sum + Object.values(report.removed).reduce((a, b) => a + b, 0), 0),
+      reinserted,
+      mutation_records: mutationRecords,
+      mutation_latency_ms: {
+        count: sorted.length,
+        p50: percentile(sorted, 0.5),
+        p95: percentile(sorted, 0.95),
+        max: sorted.length ? sorted[sorted.length - 1] : null
+      },
+      heap_bytes: memory,
+      first_hidden_ms: firstHiddenMs,
+      ad_visible_frames: adVisibleFrames,
+      ads: ads.length,
+      hidden_ads: hidden,
+      dom_nodes: document.getElementsByTagName("*").length,
+      roots: roots.length - 1,
+      // content.js's map of shadow hosts and frames, to check roots are untracked on removal
+      tracked_roots: typeof trackedRoots === "undefined" ? null : trackedRoots.size,
+      wakeups: config.idle ? summarizeWakeups() : null,
+      script_eval_ms: evaluation.ms,
+      script_bytes: evaluation.bytes
+    };
+
+    const request = new XMLHttpRequest();
+    request.open("POST", "/results/" + config.runId);
+    request.setRequestHeader("Content-Type", "application/json");
+    request.send(JSON.stringify(result));
+  }
+
+  /**
+   * Returns the wake-ups of every idle phase, per minute.
+   */
+  function summarizeWakeups() {
+    const result = { resume_ms: resumeMs };
+    for (const [phase, counts] of Object.entries(wakeups)) {
+      const minutes = counts.ms / 60000;
+      result[phase] = {
+        ms: counts.ms,
+        timers: counts.timers,
+        sweeps: counts.sweeps,
+        timers_per_minute: counts.timers / minutes,
+        sweeps_per_minute: counts.sweeps / minutes
+      };
+    }
+    return result;
+  }
+
+  let startedAt = 0;
+  window.addEventListener("load", () => {
+    startedAt = performance.now();
+    measureFlushes();
+    if (config.idle) {
+      runIdlePhases(config.idle);
+      return;
+    }
+
+    const { rounds, interval } = config.mutations;
+    let round = 0;
+    const tick = () => {
+      if (round < rounds) {
+        mutate(round++);
+        benchTimeout(tick, interval);
+      } else {
+        benchTimeout(finish, config.settle);
+      }
+    };
+    benchTimeout(tick, interval);
+  });
+})();
+
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
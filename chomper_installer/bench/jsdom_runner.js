@@ -0,0 +1,108 @@
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
+
+/**
+ * Chomper Benchmark – jsdom Runner
+ *
+ * Loads one benchmark page in jsdom for benchmark.py
+ * when no headless Chromium is available:
+ *
+ *     node jsdom_runner.js http://127.0.0.1:8000/youtube.html
+ *
+ * jsdom lacks constructable stylesheets (on the document
+ * and on shadow roots) and idle callbacks, so minimal
+ * stand-ins are added before the page's scripts run.
+ * The page posts its own results to the benchmark
+ * server; this process is stopped by benchmark.py
+ * afterwards.
+ */
+
+let jsdom;
+try {
+  jsdom = require("jsdom");
+} catch (error) {
+  console.error("jsdom is not installed (npm install jsdom)");
+  process.exit(1);
+}
+const { JSDOM, VirtualConsole } = jsdom;
+
+const url = process.argv[2];
+
+/**
+ * Adds the browser APIs content.js needs that jsdom
+ * does not implement.
+ */
+function addPolyfills(window) {
+  const { document } = window;
+
+  // Adopted sheets are mirrored into a <style> element in every root adopting them
+  class CSSStyleSheet {
+    constructor() {
+      this.text = "";
+      this.elements = new Set();
+    }
+
+    replaceSync(text) {
+      this.text = text;
+      this.elements.forEach(element => { element.textContent = text; });
+    }
+  }
+
+  const adoptedByRoot = new WeakMap(); // Document or shadow root -> Map(sheet -> <style>)
+
+  /**
+   * Returns the sheets a root adopted, in order.
+   */
+  function getAdopted() {
+    return Array.from((adoptedByRoot.get(this) || new Map()).keys());
+  }
+
+  /**
+   * Replaces the sheets a root adopted, adding and
+   * removing their <style> copies in the root.
+   */
+  function setAdopted(sheets) {
+    const previous = adoptedByRoot.get(this) || new Map();
+    const next = new Map();
+    const parent = this.nodeType === window.Node.DOCUMENT_NODE ? this.documentElement : this;
+    previous.forEach((element, sheet) => {
+      if (sheets.includes(sheet)) return;
+      element.remove();
+      sheet.elements.delete(element);
+    });
+    sheets.forEach(sheet => {
+      let element = previous.get(sheet);
+      if (!element) {
+        element = (this.ownerDocument || this).createElement("style");
+        element.textContent = sheet.text;
+        sheet.elements.add(element);
+      }
+      if (!element.isConnected || element.parentNode !== parent) parent.appendChild(element);
+      next.set(sheet, element);
+    });
+    adoptedByRoot.set(this, next);
+  }
+
+  const adoptedStyleSheets = { get: getAdopted, set: setAdopted, configurable: true };
+  Object.defineProperty(document, "adoptedStyleSheets", adoptedStyleSheets);
+  Object.defineProperty(window.ShadowRoot.prototype, "adoptedStyleSheets", adoptedStyleSheets);
+
+  window.CSSStyleSheet = CSSStyleSheet;
+  window.requestIdleCallback = callback => window.setTimeout(callback, 1);
+  window.chomperBenchHeap = () => process.memoryUsage().heapUsed;
+}
+
+const virtualConsole = new VirtualConsole();
+virtualConsole.on("jsdomError", error => console.error(error.message));
+
+JSDOM.fromURL(url, {
+  runScripts: "dangerously",
+  resources: "usable",
+  pretendToBeVisual: true,
+  virtualConsole,
+  beforeParse: addPolyfills
+}).catch(error => {
+  console.error(error.message);
+  process.exit(1);
+});
+
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
@@ -0,0 +1,731 @@
+"""
+Chomper Ad Blocker - Content Script Benchmark
+Measures what the content scripts cost on deterministic synthetic pages, so
+changes to content.js can be compared run against run.
+
+Every scenario is generated from a fixed seed: a YouTube-like player, thousands
+of decoy nodes, ad nodes matching the compiled rules, fixed-position overlays
+and a feed that keeps receiving new and changing nodes. Some scenarios stress
+one part of the content scripts:
+  shadow  most of the feed sits inside 1000 shadow hosts, whose roots are
+          attached by the parser at first and by attachShadow() as the feed
+          turns over, plus a few same-origin frames, so the cost of tracking
+          roots can be checked against what is actually added and removed
+  large   22000 feed items on one page, so the cost of each sweep tick and
+          flush can be compared across revisions of the rule matching
+  positioned
+          5000 absolutely positioned layers, plus more in every feed batch;
+          most carry an inline z-index, the rest only get one from the
+          page's stylesheet, and a few of either kind are high-z overlays
+  reinsert
+          the page puts back every ad or overlay node that something other
+          than its own feed turnover removes, up to 3 times per node, the
+          way sites rebuild removed ads; the mutation records the page sees
+          and the scripting time show what removing instead of hiding costs
+  sites, sites-flat
+          100000 site-specific rules spread over 20000 hostnames; "sites"
+          gets only the page host's entry, the way the per-site index hands
+          it out, while "sites-flat" gets every rule as one generic ruleset,
+          as if there were no index
+  idle    a page that does not change after load, to count how often the
+          content scripts wake up (timer, frame and idle callbacks, and
+          sweep ticks) per minute while the sweep backs off, once it has
+          backed off, and while the tab is hidden
+
+The pages and the extension scripts are served from a local http.server and
+loaded in headless Chromium (or jsdom under Node when no Chromium is
+installed), with every other host unreachable. The page harness
+(bench/harness.js) reports pass timings from content.js's perf counters,
+mutation-to-flush latency, JS heap size and the time from navigation start to
+the first hidden ad node, plus the mutation records the page saw and the
+removed nodes it put back, and on the idle page the wake-ups per minute.
+
+Pages link hide.css and the site rules as CSS ahead of the scripts, the way the
+background script registers and inserts them. --no-registered-css leaves them
+out, so content.js falls back to its own adopted stylesheet.
+
+Every page also reports how long the extension scripts took to evaluate
+(compile and run their top-level code) on that navigation. --bundle built
+loads build_extension.py's output instead of the sources, so running once
+with each and comparing with --baseline shows what the build saves
+("sites-flat" needs the sources and is left out).
+
+Usage:
+    python benchmark.py [--runner auto|chromium|jsdom] [--runs 3] [--output results.json]
+                        [--no-registered-css] [--bundle source|built]
+    python benchmark.py --baseline before.json [--tolerance 0.2]
+
+With --baseline the exit code is 1 if any scenario got slower than the
+baseline by more than the tolerance, which makes the run usable as a gate.
+bench/baseline.json is the recorded reference: every scenario, three runs
+each, in chrome-headless-shell 141.0.7390.54 with the source bundle. Timings
+depend on the machine, so record a baseline of your own before gating on
+another one.
+"""
+
+import argparse
+import html
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import build_extension
+import rule_compiler
+from browser_discovery import default_discovery
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(BASE_DIR, "bench")
+EXTENSION_DIR = os.path.join(BASE_DIR, "chomper-ad-blocker")
+
+# Files the background script registers for each kind of page, from the
+# sources or from build_extension.py's output, which inlines rules.js
+GENERIC_SCRIPTS = {"source": ["rules.js", "content.js"], "built": ["content.js"]}
+VIDEO_SCRIPTS = {bundle: scripts + ["video.js"] for bundle, scripts in GENERIC_SCRIPTS.items()}
+SHADOW_HOOK_SCRIPTS = ["shadow_hook.js"]
+
+SCENARIOS = {
+    "youtube": {"player": True, "decoys": 3000, "ads": 300, "overlays": 10,
+                "rounds": 40, "batch": 25, "live": 50, "shadow_hosts": 0, "frames": 0,
+                "positioned": 0, "reinsert": 0, "site_rules": None, "idle": False},
+    "news": {"player": False, "decoys": 6000, "ads": 600, "overlays": 30,
+             "rounds": 40, "batch": 50, "live": 100, "shadow_hosts": 0, "frames": 0,
+             "positioned": 0, "reinsert": 0, "site_rules": None, "idle": False},
+    "static": {"player": False, "decoys": 4000, "ads": 400, "overlays": 0,
+               "rounds": 0, "batch": 0, "live": 0, "shadow_hosts": 0, "frames": 0,
+               "positioned": 0, "reinsert": 0, "site_rules": None, "idle": False},
+    "shadow": {"player": False, "decoys": 1000, "ads": 100, "overlays": 0,
+               "rounds": 40, "batch": 25, "live": 0, "shadow_hosts": 1000, "frames": 10,
+               "positioned": 0, "reinsert": 0, "site_rules": None, "idle": False},
+    "large": {"player": False, "decoys": 20000, "ads": 2000, "overlays": 0,
+              "rounds": 40, "batch": 50, "live": 0, "shadow_hosts": 0, "frames": 0,
+              "positioned": 0, "reinsert": 0, "site_rules": None, "idle": False},
+    "positioned": {"player": False, "decoys": 1000, "ads": 100, "overlays": 0,
+                   "rounds": 40, "batch": 50, "live": 0, "shadow_hosts": 0, "frames": 0,
+                   "positioned": 5000, "reinsert": 0, "site_rules": None, "idle": False},
+    "reinsert": {"player": False, "decoys": 3000, "ads": 300, "overlays": 30,
+                 "rounds": 40, "batch": 25, "live": 0, "shadow_hosts": 0, "frames": 0,
+                 "positioned": 0, "reinsert": 3, "site_rules": None, "idle": False},
+    "sites": {"player": False, "decoys": 3000, "ads": 300, "overlays": 0,
+              "rounds": 40, "batch": 25, "live": 0, "shadow_hosts": 0, "frames": 0,
+              "positioned": 0, "reinsert": 0, "site_rules": "indexed", "idle": False},
+    "sites-flat": {"player": False, "decoys": 3000, "ads": 300, "overlays": 0,
+                   "rounds": 40, "batch": 25, "live": 0, "shadow_hosts": 0, "frames": 0,
+                   "positioned": 0, "reinsert": 0, "site_rules": "flat", "idle": False},
+    "idle": {"player": False, "decoys": 3000, "ads": 300, "overlays": 0,
+             "rounds": 0, "batch": 0, "live": 0, "shadow_hosts": 0, "frames": 0,
+             "positioned": 0, "reinsert": 0, "site_rules": None, "idle": True},
+}
+
+MUTATION_INTERVAL = 100  # ms between scripted mutation rounds
+SETTLE_TIME = 1000       # ms to wait after the last round
+STORAGE_DELAY = 5        # ms the chrome.storage stand-in takes to answer
+RUN_TIMEOUT = 60         # s to wait for one page's results
+
+# How long the idle scenario counts wake-ups in each phase (ms): while the
+# sweep backs off after load, once it has backed off, and while hidden
+IDLE_PHASES = {"backoff": 8000, "visible": 24000, "hidden": 24000}
+
+# Slower than baseline by less than this is treated as noise (ms)
+MIN_REGRESSION_MS = 0.05
+
+# Rounds in which the YouTube scenario starts an ad break, and its length in rounds
+AD_ROUNDS = [5, 20, 35]
+AD_LENGTH = 3
+
+# Feed items inside each shadow host and each frame
+ITEMS_PER_HOST = 4
+ITEMS_PER_FRAME = 20
+
+# Share of positioned layers that are overlays, and of layers whose
+# z-index only comes from the page stylesheet
+POSITIONED_OVERLAY_RATIO = 0.02
+POSITIONED_CLASS_RATIO = 0.3
+
+# Site-specific rules of the "sites" scenarios, the hostnames they are spread
+# over, and the hostname the pages are served from (which gets its share)
+SITE_RULES = 100000
+SITE_RULE_HOSTS = 20000
+BENCH_HOST = "127.0.0.1"
+# Ruleset the generated site rules are compiled into
+SITE_RULESET = "bench"
+
+# Page stylesheet for the layers without an inline z-index
+POSITIONED_CSS = """.bench-layer { z-index: 2 }
+.bench-popup { z-index: 5000 }"""
+
+PLAYER_HTML = """<div id="movie_player" class="html5-video-player playing-mode">
+<video class="html5-main-video" muted></video>
+<div class="video-ads ytp-ad-module"></div>
+<div class="ytp-chrome-bottom"><div class="ytp-progress-bar" style="width: 0%"></div>
+<span class="ytp-time-current">0:00</span></div>
+</div>"""
+
+
+class BenchError(RuntimeError):
+    """Raised when a benchmark run cannot be completed."""
+
+
+# ----------------------------------------------------------------------
+# Page generation
+# ----------------------------------------------------------------------
+
+def ad_classes():
+    """Plain class selectors of the generic and YouTube rules, as {"generic", "youtube"}."""
+    rulesets, site_index = rule_compiler.compile_rules()
+    youtube = site_index.get(rule_compiler.SITE_KEY_PREFIX + "youtube.com", {}).get("youtube", {})
+    def classes(ruleset):
+        return [selector[1:] for selector in ruleset.get("selectors", []) if rule_compiler.CLASS_RE.match(selector)]
+    return {"generic": classes(rulesets["universal"]), "youtube": classes(youtube)}
+
+
+def decoy_html(rng, index):
+    """A feed item that no rule matches."""
+    words = ["card", "story", "tile", "teaser", "entry", "media", "thumb", "meta"]
+    return (f'<div class="{rng.choice(words)} item-{index}">'
+            f'<a href="#item-{index}" class="{rng.choice(words)}-link">Item {index}</a>'
+            f'<span class="{rng.choice(words)}-meta">{rng.randrange(10000)} views</span></div>')
+
+
+def ad_html(rng, classes, index):
+    """A feed item that the compiled rules hide."""
+    return (f'<div class="{rng.choice(classes)}" data-bench="ad">'
+            f'<a href="#ad-{index}">Sponsored {index}</a></div>')
+
+
+def overlay_html(rng, index):
+    z_index = rng.choice([1001, 5000, 99999])
+    return (f'<div style="position: fixed; top: 0; left: 0; z-index: {z_index}" '
+            f'data-bench="overlay">Overlay {index}</div>')
+
+
+def positioned_html(rng, count, start):
+    """
+    count absolutely positioned layers. Overlays are marked data-bench="overlay";
+    layers without an inline z-index make content.js read the computed style.
+    """
+    layers = []
+    for index in range(start, start + count):
+        overlay = rng.random() < POSITIONED_OVERLAY_RATIO
+        style = f"position: absolute; top: {rng.randrange(4000)}px; left: {rng.randrange(1200)}px"
+        if rng.random() < POSITIONED_CLASS_RATIO:
+            layer_class = "bench-popup" if overlay else "bench-layer"
+        else:
+            layer_class = "bench-layer"
+            style += f"; z-index: {rng.choice([1001, 5000, 99999]) if overlay else rng.randrange(1, 100)}"
+        marker = ' data-bench="overlay"' if overlay else ""
+        layers.append(f'<div class="{layer_class}" style="{style}"{marker}>Layer {index}</div>')
+    return "".join(layers)
+
+
+def feed_html(rng, count, ad_ratio, classes, start):
+    """count feed items, roughly ad_ratio of them ads."""
+    items = []
+    for index in range(start, start + count):
+        if rng.random() < ad_ratio:
+            items.append(ad_html(rng, classes, index))
+        else:
+            items.append(decoy_html(rng, index))
+    return "".join(items)
+
+
+def shadow_host_html(rng, ad_ratio, classes, start, declarative):
+    """
+    A shadow host holding ITEMS_PER_HOST feed items. Declarative hosts get
+    their root from the parser; the others keep the items in a plain
+    template that the harness attaches with attachShadow().
+    """
+    mode = ' shadowrootmode="open"' if declarative else ""
+    return (f'<div class="bench-host"><template{mode}>'
+            f'{feed_html(rng, ITEMS_PER_HOST, ad_ratio, classes, start)}</template></div>')
+
+
+def frame_html(rng, ad_ratio, classes, start):
+    """A same-origin frame holding ITEMS_PER_FRAME feed items."""
+    items = html.escape(feed_html(rng, ITEMS_PER_FRAME, ad_ratio, classes, start))
+    return f'<iframe class="bench-frame" srcdoc="{items}"></iframe>'
+
+
+def site_rule_list(seed, count=SITE_RULES, hosts=SITE_RULE_HOSTS):
+    """
+    count deterministic ("hostname", selector) site rules over hosts
+    hostnames, the first of them BENCH_HOST.
+    """
+    rng = random.Random(f"{seed}:site-rules")
+    words = ["ad", "promo", "sponsor", "banner", "native", "slot", "teaser", "partner"]
+    forms = [".{w}-{n}", "#{w}-{n}", "div.{w}-{n} > a", '[data-{w}="{n}"]', "aside .{w}-box-{n}"]
+    rules = []
+    for index in range(count):
+        host = BENCH_HOST if index % hosts == 0 else f"site{index % hosts}.example"
+        rules.append((host, rng.choice(forms).format(w=rng.choice(words), n=index)))
+    return rules
+
+
+def site_rule_sets(seed):
+    """
+    The generated site rules as (indexed entry for BENCH_HOST, flat ruleset
+    holding every rule), compiled the way rule_compiler.py compiles lists.
+    """
+    rules = site_rule_list(seed)
+    _, adds, _ = rule_compiler.split_site_rules(rules)
+    entry = rule_compiler.compile_ruleset(adds.get(BENCH_HOST, []))
+    entry = {key: value for key, value in entry.items() if value}
+    return {SITE_RULESET: entry}, rule_compiler.compile_ruleset([selector for _, selector in rules])
+
+
+def site_css(entry):
+    """The CSS the background script inserts for one site entry."""
+    return "\n".join(rule for name, ruleset in sorted(entry.items())
+                     for rule in rule_compiler.hide_rules(ruleset.get("groups", []),
+                                                          guarded=name not in rule_compiler.UNGUARDED_RULESETS))
+
+
+def generate_page(name, scenario, classes, site_index, run_id, seed, registered_css=True, site_rules=None,
+                  bundle="source"):
+    """
+    Return the HTML of one benchmark page. site_rules is site_rule_sets(seed),
+    needed by the scenarios with "site_rules"; bundle picks the extension
+    scripts the page loads, as in GENERIC_SCRIPTS.
+    """
+    rng = random.Random(f"{seed}:{name}")
+    ad_classes_used = classes["generic"] + (classes["youtube"] if scenario["player"] else [])
+    total = scenario["decoys"] + scenario["ads"]
+    ad_ratio = scenario["ads"] / total if total else 0
+
+    storage = {"enabled": True, "statsEnabled": True}
+    styles = []
+    if registered_css:
+        styles.append('<link rel="stylesheet" href="ext/hide.css">')
+    if scenario["positioned"]:
+        styles.append(f"<style>{POSITIONED_CSS}</style>")
+    if scenario["player"]:
+        # The page is served from 127.0.0.1, so hand it YouTube's site rules
+        entry = site_index.get(rule_compiler.SITE_KEY_PREFIX + "youtube.com", {})
+        storage[rule_compiler.SITE_KEY_PREFIX + "127.0.0.1"] = entry
+        if registered_css:
+            styles.append(f"<style>{site_css(entry)}</style>")
+    flat_rules = None
+    if scenario["site_rules"] == "indexed":
+        storage[rule_compiler.SITE_KEY_PREFIX + BENCH_HOST] = site_rules[0]
+        if registered_css:
+            styles.append(f"<style>{site_css(site_rules[0])}</style>")
+    elif scenario["site_rules"] == "flat":
+        # rules.js's CHOMPER_RULES is extended before content.js reads it
+        flat_rules = site_rules[1]
+        if registered_css:
+            styles.append("<style>" + "\n".join(rule_compiler.hide_rules(flat_rules["groups"], guarded=True))
+                          + "</style>")
+
+    # Shadow hosts come first in the feed, so the harness removes them as it turns over
+    feed = []
+    for index in range(scenario["shadow_hosts"]):
+        feed.append(shadow_host_html(rng, ad_ratio, ad_classes_used, total + index * ITEMS_PER_HOST, True))
+    start = total + scenario["shadow_hosts"] * ITEMS_PER_HOST
+    feed.append(feed_html(rng, total, ad_ratio, ad_classes_used, 0))
+    feed.append(positioned_html(rng, scenario["positioned"], start))
+    start += scenario["positioned"]
+    frames = []
+    for _ in range(scenario["frames"]):
+        frames.append(frame_html(rng, ad_ratio, ad_classes_used, start))
+        start += ITEMS_PER_FRAME
+
+    batches = []
+    for _ in range(scenario["rounds"]):
+        if scenario["shadow_hosts"]:
+            batches.append("".join(shadow_host_html(rng, ad_ratio, ad_classes_used, start + i * ITEMS_PER_HOST, False)
+                                   for i in range(scenario["batch"])))
+            start += scenario["batch"] * ITEMS_PER_HOST
+        elif scenario["positioned"]:
+            # Half of each batch is positioned layers, so new overlays keep arriving
+            half = scenario["batch"] // 2
+            batches.append(feed_html(rng, half, ad_ratio, ad_classes_used, start)
+                           + positioned_html(rng, scenario["batch"] - half, start + half))
+            start += scenario["batch"]
+        else:
+            batches.append(feed_html(rng, scenario["batch"], ad_ratio, ad_classes_used, start))
+            start += scenario["batch"]
+
+    scripts = SHADOW_HOOK_SCRIPTS + (VIDEO_SCRIPTS if scenario["player"] else GENERIC_SCRIPTS)[bundle]
+    config = {
+        "runId": run_id,
+        "storage": storage,
+        "storageDelay": STORAGE_DELAY,
+        "settle": SETTLE_TIME,
+        "mutations": {"rounds": scenario["rounds"], "interval": MUTATION_INTERVAL,
+                      "batchSize": scenario["batch"], "batches": batches},
+        "player": {"adRounds": AD_ROUNDS, "adLength": AD_LENGTH} if scenario["player"] else None,
+        "reinsert": scenario["reinsert"],
+        "idle": IDLE_PHASES if scenario["idle"] else None,
+        "scripts": scripts,
+    }
+    live = "".join(f'<span data-bench="live">Live {i}</span>' for i in range(scenario["live"]))
+    overlays = "".join(overlay_html(rng, i) for i in range(scenario["overlays"]))
+
+    # "</" would end the inline script early
+    config_js = json.dumps(config).replace("</", "<\\/")
+    # Marks around every script let the harness time its evaluation
+    head_scripts = [f'<script>performance.mark("chomper:before:{script}")</script>'
+                    f'<script src="ext/{script}"></script>'
+                    f'<script>performance.mark("chomper:after:{script}")</script>' for script in scripts]
+    if flat_rules:
+        if "rules.js" not in scripts:
+            raise BenchError(f"{name}: the built bundle has no rules.js to extend")
+        flat_js = json.dumps(flat_rules).replace("</", "<\\/")
+        head_scripts.insert(scripts.index("rules.js") + 1,
+                            f"<script>CHOMPER_RULES.{SITE_RULESET} = {flat_js};</script>")
+    head_scripts = "\n".join(head_scripts)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Chomper benchmark: {name}</title>
+{"".join(styles)}
+<script>window.CHOMPER_BENCH = {config_js};</script>
+<script src="harness.js"></script>
+{head_scripts}
+</head>
+<body>
+{PLAYER_HTML if scenario["player"] else ""}
+<div id="bench-live">{live}</div>
+<div id="bench-feed">{"".join(feed)}</div>
+{"".join(frames)}
+{overlays}
+</body>
+</html>
+"""
+
+
+def write_corpus(directory, scenarios, seed, run_id, registered_css=True, bundle="source",
+                 extension_dir=EXTENSION_DIR):
+    """
+    Write the pages for one run plus the harness and the extension scripts,
+    taken from extension_dir: the sources, or a build of them with bundle
+    "built".
+    """
+    classes = ad_classes()
+    with open(rule_compiler.SITE_OUTPUT_PATH, encoding="utf-8") as f:
+        site_index = json.load(f)
+
+    os.makedirs(os.path.join(directory, "ext"), exist_ok=True)
+    shutil.copy2(os.path.join(BENCH_DIR, "harness.js"), directory)
+    for filename in SHADOW_HOOK_SCRIPTS + VIDEO_SCRIPTS[bundle] + ["hide.css"]:
+        shutil.copy2(os.path.join(extension_dir, filename), os.path.join(directory, "ext"))
+
+    site_rules = site_rule_sets(seed) if any(SCENARIOS[name]["site_rules"] for name in scenarios) else None
+    for name in scenarios:
+        html = generate_page(name, SCENARIOS[name], classes, site_index, f"{run_id}-{name}", seed,
+                             registered_css, site_rules, bundle)
+        with open(os.path.join(directory, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+
+
+# ----------------------------------------------------------------------
+# Local server
+# ----------------------------------------------------------------------
+
+class BenchHandler(SimpleHTTPRequestHandler):
+    """Serves the corpus and accepts result posts at /results/<run id>."""
+
+    def do_POST(self):
+        if not self.path.startswith("/results/"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        result = json.loads(self.rfile.read(length))
+        self.server.store_result(self.path[len("/results/"):], result)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchServer(ThreadingHTTPServer):
+    """HTTP server on a free localhost port that collects posted results."""
+
+    def __init__(self, directory):
+        super().__init__(("127.0.0.1", 0), partial(BenchHandler, directory=directory))
+        self.results = {}
+        self.condition = threading.Condition()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def store_result(self, run_id, result):
+        with self.condition:
+            self.results[run_id] = result
+            self.condition.notify_all()
+
+    def wait_result(self, run_id, timeout, process):
+        """Wait for a page's results; gives up early if its runner process exits."""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while run_id not in self.results:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or process.poll() is not None:
+                    raise BenchError(f"no results from {run_id}")
+                self.condition.wait(min(remaining, 0.5))
+            return self.results.pop(run_id)
+
+
+# ----------------------------------------------------------------------
+# Runners
+# ----------------------------------------------------------------------
+
+def find_chromium(path=None):
+    """Return a Chromium-based browser to benchmark with, or None."""
+    if path:
+        return path
+    for command in ("chromium", "chromium-browser", "headless_shell"):
+        found = shutil.which(command)
+        if found:
+            return found
+    detected = [default_discovery.resolve(name) for name in default_discovery.detected()]
+    return detected[0] if detected else None
+
+
+def chromium_command(browser, url, profile_dir):
+    command = [
+        browser, "--headless=new", "--disable-gpu", "--no-first-run",
+        "--disable-extensions", "--enable-precise-memory-info",
+        f"--user-data-dir={profile_dir}",
+        # Only the benchmark server is reachable
+        "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1",
+        url,
+    ]
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        command.insert(1, "--no-sandbox")
+    return command
+
+
+def run_page(server, runner, browser, name, run_id):
+    """Load one page with the given runner and return its posted results."""
+    url = f"{server.base_url}{name}.html"
+    with tempfile.TemporaryDirectory() as profile_dir:
+        if runner == "chromium":
+            command = chromium_command(browser, url, profile_dir)
+        else:
+            command = ["node", os.path.join(BENCH_DIR, "jsdom_runner.js"), url]
+
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        timeout = RUN_TIMEOUT + (sum(IDLE_PHASES.values()) / 1000 if SCENARIOS[name]["idle"] else 0)
+        try:
+            return server.wait_result(f"{run_id}-{name}", timeout, process)
+        except BenchError:
+            process.kill()
+            _, stderr = process.communicate()
+            message = stderr.decode(errors="replace").strip().splitlines()
+            raise BenchError(f"{name}: no results" + (f" ({message[0]})" if message else ""))
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+def median_or_none(values):
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+def summarize(runs):
+    """Median of every metric over the runs of one scenario."""
+    names = sorted({name for run in runs for name in run["passes"]})
+    return {
+        "passes": {
+            name: {key: median_or_none([run["passes"].get(name, {}).get(key) for run in runs])
+                   for key in ("count", "per_minute", "total_ms", "mean_ms", "max_ms")}
+            for name in names
+        },
+        "mutation_latency_ms": {
+            key: median_or_none([run["mutation_latency_ms"][key] for run in runs])
+            for key in ("count", "p50", "p95", "max")
+        },
+        "first_hidden_ms": median_or_none([run["first_hidden_ms"] for run in runs]),
+        "ad_visible_frames": median_or_none([run["ad_visible_frames"] for run in runs]),
+        "heap_mb": median_or_none([run["heap_bytes"] / (1024 * 1024) if run["heap_bytes"] else None
+                                   for run in runs]),
+        "ads": runs[0]["ads"],
+        "hidden_ads": min(run["hidden_ads"] for run in runs),
+        "removed": median_or_none([run["removed"] for run in runs]),
+        "reinserted": median_or_none([run["reinserted"] for run in runs]),
+        "mutation_records": median_or_none([run["mutation_records"] for run in runs]),
+        "scripting_ms": median_or_none([sum(pass_["total_ms"] for pass_ in run["passes"].values())
+                                        for run in runs]),
+        "skipped": median_or_none([run["skipped"] for run in runs]),
+        "dom_nodes": runs[0]["dom_nodes"],
+        "roots": runs[0]["roots"],
+        "tracked_roots": median_or_none([run["tracked_roots"] for run in runs]),
+        "wakeups": summarize_wakeups(runs) if runs[0].get("wakeups") else None,
+        "script_bytes": runs[0]["script_bytes"],
+        "script_eval_ms": median_or_none([run["script_eval_ms"] for run in runs]),
+    }
+
+
+def summarize_wakeups(runs):
+    """Median wake-ups per minute of every idle phase, plus the time to resume once shown."""
+    summary = {
+        phase: {key: median_or_none([run["wakeups"][phase][key] for run in runs])
+                for key in ("timers_per_minute", "sweeps_per_minute")}
+        for phase in IDLE_PHASES
+    }
+    summary["resume_ms"] = median_or_none([run["wakeups"]["resume_ms"] for run in runs])
+    return summary
+
+
+def gated_metrics(summary):
+    """The metrics a baseline comparison checks, as {label: value}; lower is better."""
+    metrics = {f"{name} mean": pass_["mean_ms"] for name, pass_ in summary["passes"].items()}
+    metrics.update({f"{name} per minute": pass_["per_minute"] for name, pass_ in summary["passes"].items()})
+    metrics["mutation latency p95"] = summary["mutation_latency_ms"]["p95"]
+    metrics["first hidden ad"] = summary["first_hidden_ms"]
+    if summary.get("wakeups"):
+        for phase in IDLE_PHASES:
+            metrics[f"{phase} wake-ups per minute"] = summary["wakeups"][phase]["timers_per_minute"]
+    return {label: value for label, value in metrics.items() if value is not None}
+
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions of results against a baseline."""
+    regressions = []
+    for name, summary in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        old = gated_metrics(before)
+        for label, value in gated_metrics(summary).items():
+            if label in old and value > old[label] * (1 + tolerance) and value - old[label] > MIN_REGRESSION_MS:
+                regressions.append(f"{name}: {label} {old[label]:.3f} -> {value:.3f}")
+        if summary["hidden_ads"] < before["hidden_ads"]:
+            regressions.append(f"{name}: hidden ads {before['hidden_ads']} -> {summary['hidden_ads']}")
+    return regressions
+
+
+def print_summary(results):
+    for name, summary in results["scenarios"].items():
+        latency = summary["mutation_latency_ms"]
+        heap = "n/a" if summary["heap_mb"] is None else f"{summary['heap_mb']:.1f} MB"
+        p95 = "n/a" if latency["p95"] is None else f"{latency['p95']:.2f} ms"
+        first = "n/a" if summary["first_hidden_ms"] is None else f"{summary['first_hidden_ms']:.1f} ms"
+        print(f"{name}: {summary['hidden_ads']}/{summary['ads']} ads hidden, first hidden after {first} "
+              f"({summary['ad_visible_frames']:.0f} frames visible), "
+              f"mutation latency p95 {p95}, heap {heap}")
+        print(f"  {summary['mutation_records']:.0f} mutation records, {summary['removed']:.0f} nodes removed, "
+              f"{summary['reinserted']:.0f} put back, {summary['scripting_ms']:.1f} ms in content script passes")
+        if summary["script_eval_ms"] is not None:
+            print(f"  {summary['script_bytes'] / 1024:.1f} KB of extension scripts evaluated in "
+                  f"{summary['script_eval_ms']:.2f} ms")
+        if summary["roots"]:
+            tracked = "n/a" if summary["tracked_roots"] is None else f"{summary['tracked_roots']:.0f}"
+            print(f"  {tracked}/{summary['roots']} shadow roots and frames tracked at the end")
+        wakeups = summary.get("wakeups")
+        if wakeups:
+            phases = ", ".join(f"{phase} {wakeups[phase]['timers_per_minute']:.1f} "
+                               f"({wakeups[phase]['sweeps_per_minute']:.1f} sweeps)" for phase in IDLE_PHASES)
+            resume = "n/a" if wakeups["resume_ms"] is None else f"{wakeups['resume_ms']:.1f} ms"
+            print(f"  wake-ups per minute: {phases}; first sweep {resume} after shown")
+        for pass_name, pass_ in summary["passes"].items():
+            print(f"  {pass_name}: {pass_['count']:.0f} passes ({pass_['per_minute']:.0f}/min), "
+                  f"mean {pass_['mean_ms']:.3f} ms, max {pass_['max_ms']:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Chomper content scripts on synthetic pages.")
+    parser.add_argument("--runner", choices=["auto", "chromium", "jsdom"], default="auto",
+                        help="page runner (default: Chromium if installed, else jsdom)")
+    parser.add_argument("--browser", help="Chromium-based browser executable to use")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="runs per scenario (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="page generator seed (default: %(default)s)")
+    parser.add_argument("--no-registered-css", dest="registered_css", action="store_false",
+                        help="leave out hide.css and the site CSS the background would insert")
+    parser.add_argument("--bundle", choices=sorted(GENERIC_SCRIPTS), default="source",
+                        help="load the extension sources or build_extension.py's output (default: %(default)s)")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    browser = None
+    runner = args.runner
+    if runner in ("auto", "chromium"):
+        browser = find_chromium(args.browser)
+        if browser is None and runner == "chromium":
+            print("benchmark: no Chromium-based browser found", file=sys.stderr)
+            return 2
+        runner = "chromium" if browser else "jsdom"
+    if runner == "jsdom" and shutil.which("node") is None:
+        print("benchmark: neither Chromium nor Node.js is installed", file=sys.stderr)
+        return 2
+
+    # The flat site rules extend rules.js, which the build inlines into content.js
+    flat = [name for name in SCENARIOS if SCENARIOS[name]["site_rules"] == "flat"]
+    if args.bundle == "built" and args.scenario and set(args.scenario) & set(flat):
+        print(f"benchmark: {', '.join(flat)} can only run with --bundle source", file=sys.stderr)
+        return 2
+    scenarios = args.scenario or [name for name in SCENARIOS if args.bundle == "source" or name not in flat]
+    runs = {name: [] for name in scenarios}
+    with tempfile.TemporaryDirectory() as corpus:
+        server = BenchServer(corpus)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            extension_dir = EXTENSION_DIR
+            if args.bundle == "built":
+                extension_dir, _ = build_extension.build_extension(out_dir=os.path.join(corpus, "build"))
+            for run in range(args.runs):
+                write_corpus(corpus, scenarios, args.seed, f"run{run}", args.registered_css, args.bundle,
+                             extension_dir)
+                for name in scenarios:
+                    runs[name].append(run_page(server, runner, browser, name, f"run{run}"))
+        except (BenchError, build_extension.BuildError) as e:
+            print(f"benchmark: {e}", file=sys.stderr)
+            return 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    results = {
+        "runner": runner,
+        "browser": browser,
+        "runs": args.runs,
+        "seed": args.seed,
+        "registered_css": args.registered_css,
+        "bundle": args.bundle,
+        "scenarios": {name: summarize(scenario_runs) for name, scenario_runs in runs.items()},
+    }
+    print_summary(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Chomper Ad Blocker Installer - Browser Discovery
+Finds installed Chromium-based browsers.
+
+Every candidate location for every browser (system and per-user installs,
+Windows "App Paths" registry entries, PATH commands, Linux /usr/bin and
+/opt locations and .desktop launchers) is probed concurrently in a single
+pass, and the resolved executables are cached for the life of the process.
+"""
+
+import os
+import sys
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Candidate locations and per-user folders for each browser:
+#   paths            system-wide Windows installs
+#   user_paths       Windows per-user installs, relative to %LOCALAPPDATA%
+#   registry         executable names under the Windows "App Paths" key
+#   commands         names looked up on PATH
+#   linux_paths      fixed Linux install locations
+#   desktop_files    Linux .desktop launcher ids
+#   user_data        Windows user data folder, relative to the home folder
+#   linux_user_data  Linux user data folder, relative to the home folder
+#   linux_policies   Linux managed policy folder, if the browser reads one
+#   windows_policies Windows policy key under HKEY_LOCAL_MACHINE, likewise
+BROWSERS = {
+    "Google Chrome": {
+        "paths": [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        ],
+        "user_paths": [r"Google\Chrome\Application\chrome.exe"],
+        "registry": ["chrome.exe"],
+        "commands": ["google-chrome", "google-chrome-stable", "chrome"],
+        "linux_paths": ["/usr/bin/google-chrome", "/opt/google/chrome/chrome"],
+        "desktop_files": ["google-chrome.desktop"],
+        "user_data": r"AppData\Local\Google\Chrome\User Data",
+        "linux_user_data": ".config/google-chrome",
+        "linux_policies": "/etc/opt/chrome/policies/managed",
+        "windows_policies": r"SOFTWARE\Policies\Google\Chrome",
+        "color": "#4285F4",
+        "icon": "chrome"
+    },
+    "Microsoft Edge": {
+        "paths": [
+            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+        ],
+        "user_paths": [r"Microsoft\Edge\Application\msedge.exe"],
+        "registry": ["msedge.exe"],
+        "commands": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+        "linux_paths": ["/usr/bin/microsoft-edge", "/opt/microsoft/msedge/msedge"],
+        "desktop_files": ["microsoft-edge.desktop"],
+        "user_data": r"AppData\Local\Microsoft\Edge\User Data",
+        "linux_user_data": ".config/microsoft-edge",
+        "linux_policies": "/etc/opt/edge/policies/managed",
+        "windows_policies": r"SOFTWARE\Policies\Microsoft\Edge",
+        "color": "#0078D4",
+        "icon": "edge"
+    },
+    "Brave Browser": {
+        "paths": [
+            r"C:\Program Files\BraveSoftware\Brave-Browser\Application\brave.exe",
+        ],
+        "user_paths": [r"BraveSoftware\Brave-Browser\Application\brave.exe"],
+        "registry": ["brave.exe"],
+        "commands": ["brave-browser", "brave"],
+        "linux_paths": ["/usr/bin/brave-browser", "/opt/brave.com/brave/brave"],
+        "desktop_files": ["brave-browser.desktop"],
+        "user_data": r"AppData\Local\BraveSoftware\Brave-Browser\User Data",
+        "linux_user_data": ".config/BraveSoftware/Brave-Browser",
+        "linux_policies": "/etc/brave/policies/managed",
+        "windows_policies": r"SOFTWARE\Policies\BraveSoftware\Brave",
+        "color": "#FB542B",
+        "icon": "brave"
+    },
+    "Opera": {
+        "paths": [
+            r"C:\Program Files\Opera\launcher.exe",
+            r"C:\Program Files\Opera\opera.exe",
+        ],
+        "user_paths": [r"Programs\Opera\launcher.exe", r"Programs\Opera\opera.exe"],
+        "registry": ["opera.exe"],
+        "commands": ["opera"],
+        "linux_paths": ["/usr/bin/opera", "/usr/lib/x86_64-linux-gnu/opera/opera"],
+        "desktop_files": ["opera.desktop"],
+        "user_data": r"AppData\Roaming\Opera Software\Opera Stable",
+        "linux_user_data": ".config/opera",
+        "color": "#FF1B2D",
+        "icon": "opera"
+    },
+    "Vivaldi": {
+        "paths": [
+            r"C:\Program Files\Vivaldi\Application\vivaldi.exe",
+        ],
+        "user_paths": [r"Vivaldi\Application\vivaldi.exe"],
+        "registry": ["vivaldi.exe"],
+        "commands": ["vivaldi", "vivaldi-stable"],
+        "linux_paths": ["/usr/bin/vivaldi", "/opt/vivaldi/vivaldi"],
+        "desktop_files": ["vivaldi-stable.desktop"],
+        "user_data": r"AppData\Local\Vivaldi\User Data",
+        "linux_user_data": ".config/vivaldi",
+        "color": "#EF3939",
+        "icon": "vivaldi"
+    }
+}
+
+# Where Linux desktop environments look for .desktop launchers
+DESKTOP_DIRS = [
+    "~/.local/share/applications",
+    "/usr/local/share/applications",
+    "/usr/share/applications",
+]
+
+APP_PATHS_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"
+
+
+def read_app_path(exe_name):
+    """Return the registered "App Paths" executable for exe_name, or None."""
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, f"{APP_PATHS_KEY}\\{exe_name}") as key:
+                value, _ = winreg.QueryValueEx(key, "")
+                if value:
+                    return value.strip('"')
+        except OSError:
+            continue
+    return None
+
+
+class BrowserDiscovery:
+    """
+    Resolves browser executables from BROWSERS-style candidate lists.
+
+    root re-bases every absolute path onto a fake filesystem, and
+    environ/platform stand in for os.environ and sys.platform, so
+    detection can be exercised for any OS from a temporary folder.
+    """
+
+    def __init__(self, browsers=None, root=None, environ=None, platform=None, max_workers=16):
+        self.browsers = BROWSERS if browsers is None else browsers
+        self.root = root
+        self.environ = os.environ if environ is None else environ
+        self.platform = sys.platform if platform is None else platform
+        self.max_workers = max_workers
+        self.cache = None
+        self.lock = threading.Lock()
+
+    def rooted(self, path):
+        """Map a real absolute path onto the fake root, if one is set."""
+        if self.root is None:
+            return path
+        drive, rest = os.path.splitdrive(path)
+        if not drive and len(path) > 1 and path[1] == ":":
+            drive, rest = path[:2], path[2:]
+        parts = [part for part in rest.replace("\\", "/").split("/") if part]
+        if drive:
+            parts.insert(0, drive.rstrip(":"))
+        return os.path.join(self.root, *parts)
+
+    def home(self):
+        home = self.environ.get("HOME") or self.environ.get("USERPROFILE")
+        return home or os.path.expanduser("~")
+
+    def desktop_exec(self, desktop_id):
+        """Return the executable named by a .desktop launcher's Exec line."""
+        for directory in DESKTOP_DIRS:
+            directory = directory.replace("~", self.home(), 1)
+            path = self.rooted(os.path.join(directory, desktop_id))
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        if line.startswith("Exec="):
+                            command = line[len("Exec="):].split()
+                            # Sandboxed launchers cannot take our flags directly
+                            if command and os.path.basename(command[0]) not in ("env", "flatpak", "snap"):
+                                return command[0]
+                            break
+            except OSError:
+                continue
+        return None
+
+    def which(self, command):
+        """Look a command up on the (possibly re-rooted) PATH."""
+        search = self.environ.get("PATH", "")
+        if self.root is not None:
+            search = os.pathsep.join(self.rooted(entry) for entry in search.split(os.pathsep) if entry)
+        return shutil.which(command, path=search)
+
+    def candidates(self, info):
+        """Return one browser's candidate probes as (kind, value) pairs, in priority order."""
+        probes = []
+        if self.platform.startswith("win"):
+            probes += [("file", self.rooted(path)) for path in info.get("paths", [])]
+            local_app_data = self.environ.get("LOCALAPPDATA")
+            if local_app_data:
+                probes += [("file", self.rooted(os.path.join(local_app_data, path)))
+                           for path in info.get("user_paths", [])]
+            if self.root is None:
+                probes += [("registry", exe_name) for exe_name in info.get("registry", [])]
+        else:
+            probes += [("file", self.rooted(path)) for path in info.get("linux_paths", [])]
+        probes += [("command", command) for command in info.get("commands", [])]
+        if not self.platform.startswith("win"):
+            probes += [("desktop", desktop_id) for desktop_id in info.get("desktop_files", [])]
+        return probes
+
+    def probe(self, candidate):
+        """Check a single candidate; returns an executable path or None."""
+        kind, value = candidate
+        if kind == "file":
+            return value if os.path.isfile(value) else None
+        if kind == "command":
+            return self.which(value)
+        if kind == "registry":
+            path = read_app_path(value)
+            return path if path and os.path.isfile(path) else None
+        if kind == "desktop":
+            command = self.desktop_exec(value)
+            if not command:
+                return None
+            path = self.rooted(command) if os.path.isabs(command) else self.which(command)
+            return path if path and os.path.isfile(path) else None
+        raise ValueError(f"Unknown probe kind: {kind}")
+
+    def resolve_all(self):
+        """Resolve every browser in one concurrent pass; returns {name: executable or None}."""
+        with self.lock:
+            if self.cache is None:
+                probes = [(name, candidate)
+                          for name, info in self.browsers.items()
+                          for candidate in self.candidates(info)]
+                workers = max(1, min(self.max_workers, len(probes)))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(self.probe, [candidate for _, candidate in probes]))
+
+                # Keep the first hit per browser so priority order is preserved
+                self.cache = {name: None for name in self.browsers}
+                for (name, _), path in zip(probes, results):
+                    if path and self.cache[name] is None:
+                        self.cache[name] = path
+            return dict(self.cache)
+
+    def resolve(self, name):
+        """Return the cached executable for one browser, or None."""
+        return self.resolve_all().get(name)
+
+    def detected(self):
+        """Names of installed browsers, in BROWSERS order."""
+        return [name for name, path in self.resolve_all().items() if path]
+
+    def clear_cache(self):
+        """Forget resolved paths, e.g. after the user installs a browser."""
+        with self.lock:
+            self.cache = None
+
+
+# Shared instance used by the installer
+default_discovery = BrowserDiscovery()
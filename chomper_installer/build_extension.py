@@ -0,0 +1,466 @@
+"""
+Chomper Ad Blocker - Extension Build
+Turns the chomper-ad-blocker/ source folder into the bundle that gets
+installed and packaged.
+
+The build strips comments, indentation and blank lines from every script,
+inlines the compiled rules (rules.js) into the content script and the
+background script so each frame loads one file less, stamps a build number
+and a content hash into the manifest and writes a reproducible zip: the same
+sources always give a byte-identical archive.
+
+The fourth version component is the build number: the git commit count of
+the sources, which only grows, so browsers always see a newer build as an
+upgrade. Outside a git checkout the previous build's number is reused for
+the same content and raised by one otherwise. The content hash goes into
+version_name.
+
+The installer calls ensure_built() before copying, so installs always use
+the built output. It builds into the user's cache folder, never into the
+installer's own tree, which may be read-only. Running this script directly
+also writes the zip and a size/parse-time report.
+
+Usage:
+    python build_extension.py [--out build] [--report report.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import zipfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXTENSION_NAME = "chomper-ad-blocker"
+SOURCE_DIR = os.path.join(BASE_DIR, EXTENSION_NAME)
+BUILD_DIR = os.path.join(BASE_DIR, "build")
+MAX_VERSION_PART = 65535  # Chrome's limit for each version component
+
+
+def default_cache_dir():
+    """Return the per-user folder ensure_built() builds into."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "chomper", "build")
+
+
+# Sources are inlined into these outputs, in order
+BUNDLES = {
+    "content.js": ["rules.js", "content.js"],
+    "video.js": ["video.js"],
+    "background.js": ["background.js"],
+    "popup.js": ["popup.js"],
+    "shadow_hook.js": ["shadow_hook.js"],
+}
+# Inlined into other bundles, so not shipped on their own
+INLINED = {"rules.js"}
+
+# Source references rewritten once rules.js is inlined
+BACKGROUND_REWRITES = [
+    ('importScripts("rules.js");', ""),
+    ('const GENERIC_SCRIPTS = ["rules.js", "content.js"];', 'const GENERIC_SCRIPTS = ["content.js"];'),
+]
+
+# Fixed metadata for reproducible archives
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+ZIP_FILE_MODE = 0o644
+
+# Scripts injected into a frame, for the report
+FRAMES = {
+    "generic page": ["content.js"],
+    "video-ad page": ["content.js", "video.js"],
+}
+SOURCE_FRAMES = {
+    "generic page": ["rules.js", "content.js"],
+    "video-ad page": ["rules.js", "content.js", "video.js"],
+}
+
+PUNCTUATION = set("{}()[];,:=<>?&|!+-*/%^~.\"'`")
+REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new",
+                  "delete", "void", "throw", "instanceof", "yield", "await"}
+
+
+class BuildError(RuntimeError):
+    """Raised when the sources cannot be built."""
+
+
+# ----------------------------------------------------------------------
+# Script minification
+# ----------------------------------------------------------------------
+
+def strip_js(source):
+    """
+    Remove comments, indentation and blank lines from JavaScript.
+
+    Line breaks between statements are kept, so automatic semicolon
+    insertion works exactly as in the source. String, template and
+    regular expression literals are copied unchanged.
+    """
+    out = []
+    i, n = 0, len(source)
+    last_word = ""
+    pending_space = pending_newline = False
+    template_depth = []  # Brace depth at each open "${"
+
+    def last_char():
+        return out[-1][-1] if out else ""
+
+    def emit(text):
+        nonlocal pending_space, pending_newline
+        prev = last_char()
+        if pending_newline and prev and prev not in ";{,([":
+            out.append("\n")
+        elif pending_space and prev and not (prev in PUNCTUATION or text[0] in PUNCTUATION):
+            out.append(" ")
+        elif pending_space and prev in "+-" and text[0] in "+-":
+            out.append(" ")
+        pending_space = pending_newline = False
+        out.append(text)
+
+    def read_quoted(start, quote):
+        j = start + 1
+        while j < n and source[j] != quote:
+            if source[j] == "\\":
+                j += 1
+            elif source[j] == "\n":
+                raise BuildError(f"unterminated string at offset {start}")
+            j += 1
+        return j + 1
+
+    def read_template(start):
+        """Read template text from start up to its closing ` or the next ${."""
+        j = start
+        while j < n:
+            if source[j] == "\\":
+                j += 2
+                continue
+            if source[j] == "`":
+                return j + 1, False
+            if source.startswith("${", j):
+                return j + 2, True
+            j += 1
+        raise BuildError(f"unterminated template at offset {start}")
+
+    def read_regex(start):
+        j, in_class = start + 1, False
+        while j < n:
+            ch = source[j]
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == "\n":
+                raise BuildError(f"unterminated regular expression at offset {start}")
+            if ch == "[":
+                in_class = True
+            elif ch == "]":
+                in_class = False
+            elif ch == "/" and not in_class:
+                j += 1
+                while j < n and (source[j].isalnum() or source[j] == "_"):
+                    j += 1
+                return j
+            j += 1
+        raise BuildError(f"unterminated regular expression at offset {start}")
+
+    while i < n:
+        ch = source[i]
+
+        if ch in " \t\r\n":
+            if ch == "\n":
+                pending_newline = True
+            else:
+                pending_space = True
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end < 0:
+                raise BuildError(f"unterminated comment at offset {i}")
+            if "\n" in source[i:end]:
+                pending_newline = True
+            else:
+                pending_space = True
+            i = end + 2
+        elif ch in "\"'":
+            end = read_quoted(i, ch)
+            emit(source[i:end])
+            last_word, i = "", end
+        elif ch == "`":
+            end, opened = read_template(i + 1)
+            emit(source[i:end])
+            if opened:
+                template_depth.append(0)
+            last_word, i = "", end
+        elif ch == "}" and template_depth and template_depth[-1] == 0:
+            template_depth.pop()
+            end, opened = read_template(i + 1)
+            emit(source[i:end])
+            if opened:
+                template_depth.append(0)
+            last_word, i = "", end
+        elif ch == "/" and (last_char() in REGEX_AFTER or not out or last_word in REGEX_KEYWORDS):
+            end = read_regex(i)
+            emit(source[i:end])
+            last_word, i = "", end
+        elif ch.isalnum() or ch in "_$":
+            j = i
+            while j < n and (source[j].isalnum() or source[j] in "_$"):
+                j += 1
+            emit(source[i:j])
+            last_word, i = source[i:j], j
+        else:
+            if template_depth:
+                if ch == "{":
+                    template_depth[-1] += 1
+                elif ch == "}":
+                    template_depth[-1] -= 1
+            emit(ch)
+            last_word, i = "", i + 1
+
+    return "".join(out) + "\n"
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def read_text(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def source_fingerprint(src=SOURCE_DIR):
+    """Hash of every source file's path and content, to tell when a rebuild is due."""
+    digest = hashlib.sha256()
+    for rel_path in sorted(iter_files(src)):
+        digest.update(rel_path.encode("utf-8") + b"\0")
+        with open(os.path.join(src, rel_path), "rb") as f:
+            digest.update(f.read())
+    digest.update(read_text(os.path.abspath(__file__)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def iter_files(root):
+    """Yield paths of all non-hidden files under root, relative and with "/" separators."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if not filename.startswith("."):
+                yield os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, "/")
+
+
+def bundle(src, name, parts):
+    """Concatenate and strip the sources of one output script."""
+    texts = []
+    for part in parts:
+        text = read_text(os.path.join(src, part))
+        if name == "background.js":
+            for old, new in BACKGROUND_REWRITES:
+                if old not in text:
+                    raise BuildError(f"background.js no longer contains {old!r}")
+                text = text.replace(old, new)
+            # The background is a classic service worker, so rules.js goes in front
+            texts.append(read_text(os.path.join(src, "rules.js")))
+        texts.append(text)
+    return strip_js("\n".join(texts))
+
+
+def read_stamp(target):
+    """The .build.json written next to a built folder, or {}."""
+    try:
+        with open(target + ".build.json", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stamp if isinstance(stamp, dict) else {}
+
+
+def build_number(src, content_hash, previous):
+    """
+    The fourth version component: the git commit count of src, or without
+    git the previous build's number, raised by one if the content changed.
+    """
+    try:
+        output = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=src,
+                                capture_output=True, text=True, check=True).stdout
+        number = int(output)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        number = previous.get("build", 0)
+        if previous.get("content") != content_hash:
+            number += 1
+    if number > MAX_VERSION_PART:
+        raise BuildError(f"build number {number} does not fit in a version component")
+    return number
+
+
+def stamp_version(manifest, content_hash, number):
+    """Append the build number to the manifest version and the hash to version_name."""
+    base = ".".join(manifest["version"].split(".")[:3])
+    manifest["version"] = f"{base}.{number}"
+    manifest["version_name"] = f"{base} ({content_hash[:8]})"
+    return manifest
+
+
+def build_extension(src=SOURCE_DIR, out_dir=BUILD_DIR):
+    """
+    Build the extension into out_dir/chomper-ad-blocker.
+
+    Returns (target_dir, version).
+    """
+    target = os.path.join(out_dir, EXTENSION_NAME)
+    previous = read_stamp(target)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.makedirs(target)
+
+    outputs = {name: bundle(src, name, parts).encode("utf-8") for name, parts in BUNDLES.items()}
+    bundled = {part for parts in BUNDLES.values() for part in parts} | INLINED
+    for rel_path in iter_files(src):
+        if rel_path not in bundled and rel_path != "manifest.json":
+            with open(os.path.join(src, rel_path), "rb") as f:
+                outputs[rel_path] = f.read()
+
+    content_hash = hashlib.sha256()
+    for rel_path in sorted(outputs):
+        content_hash.update(rel_path.encode("utf-8") + b"\0" + outputs[rel_path])
+    content_hash = content_hash.hexdigest()
+    number = build_number(src, content_hash, previous)
+
+    with open(os.path.join(src, "manifest.json"), encoding="utf-8") as f:
+        manifest = stamp_version(json.load(f), content_hash, number)
+    outputs["manifest.json"] = json.dumps(manifest, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+    for rel_path, data in outputs.items():
+        path = os.path.join(target, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    with open(target + ".build.json", "w", encoding="utf-8") as f:
+        json.dump({"source": source_fingerprint(src), "content": content_hash,
+                   "build": number, "version": manifest["version"]}, f)
+    return target, manifest["version"]
+
+
+def ensure_built(src=SOURCE_DIR, out_dir=None):
+    """
+    Return the built extension folder, rebuilding it only if the sources
+    changed. out_dir defaults to default_cache_dir().
+    """
+    target = os.path.join(out_dir or default_cache_dir(), EXTENSION_NAME)
+    if read_stamp(target).get("source") == source_fingerprint(src) and os.path.isdir(target):
+        return target
+    return build_extension(src, os.path.dirname(target))[0]
+
+
+def write_zip(target, zip_path):
+    """Zip a built folder with fixed order, timestamps and permissions."""
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for rel_path in sorted(iter_files(target)):
+            info = zipfile.ZipInfo(rel_path, date_time=ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3
+            info.external_attr = ZIP_FILE_MODE << 16
+            with open(os.path.join(target, rel_path), "rb") as f:
+                archive.writestr(info, f.read(), compresslevel=9)
+    return os.path.getsize(zip_path)
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+
+PARSE_TIMER_JS = """
+const fs = require("fs"), vm = require("vm");
+const result = {};
+for (const [frame, files] of Object.entries(JSON.parse(process.argv[1]))) {
+  const source = files.map(file => fs.readFileSync(file, "utf8")).join("\\n");
+  const times = [];
+  for (let i = 0; i < 200; i++) {
+    const start = process.hrtime.bigint();
+    new vm.Script(source + "\\n//" + i);
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  times.sort((a, b) => a - b);
+  result[frame] = times[100];
+}
+console.log(JSON.stringify(result));
+"""
+
+
+def parse_times(frames):
+    """Median compile time (ms) per frame's scripts under Node, or None without Node."""
+    if shutil.which("node") is None:
+        return None
+    output = subprocess.run(["node", "-e", PARSE_TIMER_JS, json.dumps(frames)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def build_report(src, target):
+    """Bytes per file and bytes/parse time per frame, before and after the build."""
+    def size(root, rel_path):
+        path = os.path.join(root, rel_path)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    files = sorted(set(iter_files(src)) | set(iter_files(target)))
+    report = {"files": {rel_path: {"source": size(src, rel_path), "built": size(target, rel_path)}
+                        for rel_path in files}}
+
+    before = {frame: [os.path.join(src, f) for f in names] for frame, names in SOURCE_FRAMES.items()}
+    after = {frame: [os.path.join(target, f) for f in names] for frame, names in FRAMES.items()}
+    parse_before, parse_after = parse_times(before), parse_times(after)
+    report["frames"] = {
+        frame: {
+            "source_bytes": sum(os.path.getsize(path) for path in before[frame]),
+            "built_bytes": sum(os.path.getsize(path) for path in after[frame]),
+            "source_parse_ms": parse_before and parse_before[frame],
+            "built_parse_ms": parse_after and parse_after[frame],
+        }
+        for frame in FRAMES
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and package the Chomper extension.")
+    parser.add_argument("--src", default=SOURCE_DIR, help="extension source folder")
+    parser.add_argument("--out", default=BUILD_DIR, help="output folder (default: %(default)s)")
+    parser.add_argument("--report", help="also write the size/parse-time report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        target, version = build_extension(args.src, args.out)
+    except BuildError as e:
+        print(f"build_extension: {e}", file=sys.stderr)
+        return 1
+
+    zip_path = os.path.join(args.out, f"{EXTENSION_NAME}-{version}.zip")
+    zip_size = write_zip(target, zip_path)
+    report = build_report(args.src, target)
+    report.update({"version": version, "zip": zip_path, "zip_bytes": zip_size})
+
+    for frame, info in report["frames"].items():
+        parse = ""
+        if info["source_parse_ms"] is not None:
+            parse = f", parse {info['source_parse_ms']:.3f} -> {info['built_parse_ms']:.3f} ms"
+        print(f"{frame}: {info['source_bytes']} -> {info['built_bytes']} bytes{parse}")
+    print(f"Built {target} (version {version})")
+    print(f"Wrote {zip_path} ({zip_size} bytes)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,33 +4,675 @@
  *
  * This file handles startup and installation behavior.
  * It ensures the blocker is enabled by default and
- * refreshes open tabs when the extension starts,
- * allowing rules to take effect immediately.
+ * registers the content scripts only while blocking
+ * is on: the generic module everywhere, the video-ad
+ * module only on hosts that serve video ads, the
+ * main-world hook that announces new shadow roots, plus
+ * the generic hide.css so ads are hidden before the first
+ * paint. Site rules are inserted as CSS when a page
+ * commits, for the same reason. Open tabs
+ * that are missing the content script get it injected,
+ * a few at a time, without a reload. It also
+ * keeps the network-level rulesets in step with the
+ * enabled flag, publishes the per-site cosmetic
+ * rule index to storage, applies rule updates from
+ * the configured feed and combines the perf
+ * counters reported by every tab. In trace mode it
+ * keeps the trace of each tab's previous page, so one
+ * reload does not lose it.
  */
 
+importScripts("rules.js"); // CHOMPER_CSS: hide rule scope and protected containers
+
+// Content script bundles, injected in this order
+const GENERIC_SCRIPTS = ["rules.js", "content.js"];
+const VIDEO_SCRIPTS = [...GENERIC_SCRIPTS, "video.js"];
+// Runs in the page's world, in every frame, to see attachShadow() calls
+const SHADOW_HOOK_SCRIPTS = ["shadow_hook.js"];
+
+// Sites (and their subdomains) that need the video-ad module
+const VIDEO_AD_HOSTS = ["youtube.com", "youtube-nocookie.com"];
+const VIDEO_AD_MATCHES = VIDEO_AD_HOSTS.map(host => `*://*.${host}/*`);
+
+// Storage keys listing the stored "site:" and "net:" keys, and the
+// hostnames whose site entries switch generic rules off, so nothing
+// has to read the whole of storage to find them
+const SITE_KEYS = "siteKeys";
+const NET_KEYS = "netKeys";
+const EXCLUSION_HOSTS = "exclusionHosts";
+
+let scriptSync = Promise.resolve();
+
+/**
+ * Returns the ids of the static rulesets listed in the
+ * manifest.
+ */
+function staticRulesetIds() {
+  const resources = chrome.runtime.getManifest().declarative_net_request;
+  return resources ? resources.rule_resources.map(ruleset => ruleset.id) : [];
+}
+
+/**
+ * Enables or disables every static declarativeNetRequest
+ * ruleset, and the dynamic rules from rule updates, to
+ * match the enabled flag.
+ */
+function syncNetworkRules(enabled) {
+  queueRuleTask(() => syncDynamicRules(enabled));
+
+  const ids = staticRulesetIds();
+  if (!ids.length) return;
+
+  chrome.declarativeNetRequest.updateEnabledRulesets(
+    enabled ? { enableRulesetIds: ids } : { disableRulesetIds: ids }
+  );
+}
+
+/**
+ * Returns the keys an index key lists. Storage written
+ * before the indexes existed is scanned once for keys
+ * with the prefix instead; the caller then writes the
+ * index.
+ */
+async function indexedKeys(indexKey, prefix) {
+  const { [indexKey]: keys } = await chrome.storage.local.get(indexKey);
+  if (keys) return keys;
+  return Object.keys(await chrome.storage.local.get(null)).filter(key => key.startsWith(prefix));
+}
+
+/**
+ * Returns the hostnames whose entries, keyed like the
+ * site index, switch generic rules off.
+ */
+function exclusionHosts(siteRules) {
+  return Object.entries(siteRules)
+    .filter(([, entry]) => hasExclusions(entry))
+    .map(([key]) => key.slice("site:".length));
+}
+
+/**
+ * Copies the bundled per-site cosmetic index into
+ * storage, one key per hostname, so each page can
+ * fetch only the entries for its own domain. Keys
+ * from a previous version that no longer exist are
+ * removed, and the key and exclusion lists rewritten.
+ */
+async function loadSiteRules() {
+  const response = await fetch(chrome.runtime.getURL("site_rules.json"));
+  const siteRules = await response.json();
+
+  const stale = (await indexedKeys(SITE_KEYS, "site:")).filter(key => !(key in siteRules));
+  if (stale.length) await chrome.storage.local.remove(stale);
+
+  await chrome.storage.local.set({
+    ...siteRules,
+    [SITE_KEYS]: Object.keys(siteRules),
+    [EXCLUSION_HOSTS]: exclusionHosts(siteRules)
+  });
+}
+
+/**
+ * Registers the content scripts while blocking is on and
+ * removes them while it is off, so pages load no Chomper
+ * code at all when disabled. Video-ad hosts get the
+ * generic and video modules as one registration so they
+ * always run in order. Calls are chained so quick
+ * toggles cannot interleave.
+ */
+function syncContentScripts(enabled) {
+  scriptSync = scriptSync.then(async () => {
+    const registered = await chrome.scripting.getRegisteredContentScripts();
+    if (registered.length) {
+      await chrome.scripting.unregisterContentScripts({ ids: registered.map(script => script.id) });
+    }
+    if (!enabled) return;
+
+    const excluded = (await hostsWithExclusions()).map(host => `*://*.${host}/*`);
+    await chrome.scripting.registerContentScripts([
+      {
+        // Sites that switch generic rules off get them from content.js instead
+        id: "chomper-hide-css",
+        matches: ["*://*/*"],
+        excludeMatches: excluded,
+        css: ["hide.css"],
+        runAt: "document_start"
+      },
+      {
+        id: "chomper-shadow-hook",
+        matches: ["*://*/*"],
+        js: SHADOW_HOOK_SCRIPTS,
+        world: "MAIN",
+        allFrames: true,
+        runAt: "document_start"
+      },
+      {
+        id: "chomper-generic",
+        matches: ["*://*/*"],
+        excludeMatches: VIDEO_AD_MATCHES,
+        js: GENERIC_SCRIPTS,
+        runAt: "document_start"
+      },
+      {
+        id: "chomper-video",
+        matches: VIDEO_AD_MATCHES,
+        js: VIDEO_SCRIPTS,
+        runAt: "document_start"
+      }
+    ]);
+  }).catch(error => console.error("Chomper: content script registration failed", error));
+  return scriptSync;
+}
+
+/**
+ * Returns the hostnames whose site entries switch
+ * generic rules off, which hide.css cannot do. The
+ * stored list is kept in step with rule updates.
+ */
+async function hostsWithExclusions() {
+  const { [EXCLUSION_HOSTS]: hosts = [] } = await chrome.storage.local.get(EXCLUSION_HOSTS);
+  return hosts;
+}
+
+/**
+ * Reports whether a site entry switches any generic
+ * selector off.
+ */
+function hasExclusions(entry) {
+  return Object.values(entry).some(ruleset => ruleset.exclude);
+}
+
+/**
+ * Returns the site index keys for a hostname and each
+ * parent domain, most specific first.
+ */
+function siteRuleKeys(hostname) {
+  const labels = hostname.split(".");
+  return labels.map((_, i) => "site:" + labels.slice(i).join("."));
+}
+
+/**
+ * Builds the CSS for a page's site entries, scoped like
+ * hide.css so content.js can switch it off in place.
+ */
+function buildSiteCss(entries) {
+  const scope = `:root:not([${CHOMPER_CSS.offAttribute}])`;
+  const guard = CHOMPER_CSS.protected.flatMap(sel => [sel, sel + " *"]).join(", ");
+
+  return entries.flatMap(entry => Object.entries(entry).flatMap(([name, ruleset]) =>
+    (ruleset.groups || []).map(group =>
+      `${scope} :is(${group})${CHOMPER_CSS.unguarded.includes(name) ? "" : `:not(${guard})`} { display: none !important; }`)
+  )).join("\n");
+}
+
+/**
+ * Returns the scripts a page needs, by its hostname.
+ */
+function scriptsForUrl(url) {
+  const hostname = new URL(url).hostname;
+  const isVideoHost = VIDEO_AD_HOSTS.some(host => hostname === host || hostname.endsWith("." + host));
+  return isVideoHost ? VIDEO_SCRIPTS : GENERIC_SCRIPTS;
+}
+
+// Tabs injected at the same time when the blocker is missing
+const INJECT_CONCURRENCY = 3;
+
+/**
+ * Reports whether a tab shows a page the content
+ * script can run in and is currently loaded.
+ */
+function isBlockableTab(tab) {
+  return Boolean(tab.url) && /^https?:/.test(tab.url) && !tab.discarded;
+}
+
+/**
+ * Resolves true if the tab's content script answers.
+ */
+function hasContentScript(tabId) {
+  return chrome.tabs.sendMessage(tabId, { type: "chomper:ping" }).then(() => true, () => false);
+}
+
+/**
+ * Injects the content scripts into the given tabs that
+ * are loaded but lack them, INJECT_CONCURRENCY at a time.
+ */
+async function injectMissingBlocker(tabs) {
+  const queue = tabs.filter(isBlockableTab);
+
+  const worker = async () => {
+    while (queue.length) {
+      const tab = queue.shift();
+      if (await hasContentScript(tab.id)) continue;
+      await chrome.scripting.executeScript({
+        target: { tabId: tab.id, allFrames: true },
+        files: SHADOW_HOOK_SCRIPTS,
+        world: "MAIN"
+      }).catch(() => {});
+      await chrome.scripting.executeScript({
+        target: { tabId: tab.id },
+        files: scriptsForUrl(tab.url)
+      }).catch(() => {}); // Tab closed or navigated away meanwhile
+    }
+  };
+
+  await Promise.all(Array.from({ length: INJECT_CONCURRENCY }, worker));
+}
+
+/* -----------------------------
+   Rule updates
+------------------------------*/
+
+// Feed polling interval unless storage or policy sets one (minutes)
+const UPDATE_INTERVAL = 360;
+const UPDATE_ALARM = "chomper-rule-update";
+
+let ruleUpdate = Promise.resolve();
+
+/**
+ * Runs a task after every rule task queued before it,
+ * so updates, resets and toggles never interleave.
+ */
+function queueRuleTask(task) {
+  ruleUpdate = ruleUpdate.then(task).catch(error => console.warn("Chomper: rule update failed", error));
+  return ruleUpdate;
+}
+
+/**
+ * Returns the feed settings: updateUrl and
+ * updateIntervalMinutes from local storage, falling
+ * back to enterprise policy. No URL turns updates off.
+ */
+async function updateSettings() {
+  const keys = ["updateUrl", "updateIntervalMinutes"];
+  const managed = await chrome.storage.managed.get(keys).catch(() => ({}));
+  return { ...managed, ...await chrome.storage.local.get(keys) };
+}
+
+/**
+ * (Re)creates the alarm that polls the feed.
+ */
+async function scheduleRuleUpdates() {
+  const { updateIntervalMinutes } = await updateSettings();
+  chrome.alarms.create(UPDATE_ALARM, { periodInMinutes: updateIntervalMinutes || UPDATE_INTERVAL });
+}
+
+/**
+ * Hashes the bundled rule files like rule_updates.py
+ * does, so feeds built for another bundle are ignored.
+ */
+async function bundledRulesBase() {
+  const resources = chrome.runtime.getManifest().declarative_net_request;
+  const paths = ["site_rules.json", ...(resources ? resources.rule_resources.map(ruleset => ruleset.path) : [])];
+  const parts = await Promise.all(paths.map(path =>
+    fetch(chrome.runtime.getURL(path)).then(response => response.arrayBuffer())));
+
+  const bytes = new Uint8Array(parts.reduce((size, part) => size + part.byteLength, 0));
+  parts.reduce((offset, part) => (bytes.set(new Uint8Array(part), offset), offset + part.byteLength), 0);
+  const digest = await crypto.subtle.digest("SHA-256", bytes);
+  return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, "0")).join("");
+}
+
+/**
+ * Returns the network rules delivered by updates, stored
+ * one "net:<id>" key per dynamic rule.
+ */
+async function updatedNetworkRules() {
+  const stored = await chrome.storage.local.get(await indexedKeys(NET_KEYS, "net:"));
+  return Object.entries(stored)
+    .map(([key, rule]) => ({ ...rule, id: Number(key.slice("net:".length)) }));
+}
+
+/**
+ * Installs the updated network rules as dynamic rules
+ * while blocking is on and removes them while it is off.
+ */
+async function syncDynamicRules(enabled) {
+  const current = await chrome.declarativeNetRequest.getDynamicRules();
+  await chrome.declarativeNetRequest.updateDynamicRules({
+    removeRuleIds: current.map(rule => rule.id),
+    addRules: enabled ? await updatedNetworkRules() : []
+  });
+}
+
+/**
+ * Drops every applied update: removes the dynamic rules,
+ * switches disabled static rules back on and restores
+ * the bundled site index (version 0).
+ */
+async function resetToBundledRules() {
+  const updated = await indexedKeys(NET_KEYS, "net:");
+  if (updated.length) await chrome.storage.local.remove(updated);
+  await chrome.storage.local.set({ [NET_KEYS]: [] });
+  await syncDynamicRules(false);
+
+  for (const rulesetId of staticRulesetIds()) {
+    const disabled = await chrome.declarativeNetRequest.getDisabledRuleIds({ rulesetId });
+    if (disabled.length) {
+      await chrome.declarativeNetRequest.updateStaticRules({ rulesetId, enableRuleIds: disabled });
+    }
+  }
+
+  await loadSiteRules();
+  await chrome.storage.local.set({ rulesVersion: 0, rulesBase: await bundledRulesBase() });
+}
+
+/**
+ * Applies one diff from rule_updates.py. Site entries
+ * are set or removed per key; network rules with a
+ * "<ruleset>/<id>" key are bundled static rules switched
+ * on or off, the others are dynamic rules. The key and
+ * exclusion lists are written with the new entries.
+ * Every step is idempotent, so a diff interrupted
+ * halfway is simply applied again on the next check.
+ */
+async function applyRuleDiff(diff) {
+  const { enabled, rulesVersion = 0 } = await chrome.storage.local.get(["enabled", "rulesVersion"]);
+  if (diff.from !== rulesVersion) throw new Error(`diff ${diff.from}-${diff.to} does not apply to ${rulesVersion}`);
+
+  const staticChanges = {};
+  const staticChange = key => {
+    const [rulesetId, id] = key.split("/");
+    staticChanges[rulesetId] = staticChanges[rulesetId] || { rulesetId, enableRuleIds: [], disableRuleIds: [] };
+    return [staticChanges[rulesetId], Number(id)];
+  };
+
+  const removeRuleIds = [], addRules = [], removedKeys = [...diff.site.remove], setItems = { ...diff.site.set };
+  for (const key of diff.network.remove) {
+    if (key.includes("/")) {
+      const [change, id] = staticChange(key);
+      change.disableRuleIds.push(id);
+    } else {
+      removedKeys.push("net:" + key);
+      removeRuleIds.push(Number(key));
+    }
+  }
+  for (const [key, rule] of Object.entries(diff.network.add)) {
+    if (key.includes("/")) {
+      const [change, id] = staticChange(key);
+      change.enableRuleIds.push(id);
+    } else {
+      setItems["net:" + key] = rule;
+      removeRuleIds.push(Number(key)); // Replaced if it changed
+      addRules.push({ ...rule, id: Number(key) });
+    }
+  }
+
+  const changedSiteKeys = [...diff.site.remove, ...Object.keys(diff.site.set)];
+  const previous = await chrome.storage.local.get(changedSiteKeys);
+
+  const siteKeys = new Set(await indexedKeys(SITE_KEYS, "site:"));
+  const netKeys = new Set(await indexedKeys(NET_KEYS, "net:"));
+  const excludedHosts = new Set(await hostsWithExclusions());
+  for (const key of changedSiteKeys) {
+    const set = key in diff.site.set;
+    siteKeys[set ? "add" : "delete"](key);
+    excludedHosts[set && hasExclusions(diff.site.set[key]) ? "add" : "delete"](key.slice("site:".length));
+  }
+  removedKeys.filter(key => key.startsWith("net:")).forEach(key => netKeys.delete(key));
+  Object.keys(setItems).filter(key => key.startsWith("net:")).forEach(key => netKeys.add(key));
+  setItems[SITE_KEYS] = [...siteKeys];
+  setItems[NET_KEYS] = [...netKeys];
+  setItems[EXCLUSION_HOSTS] = [...excludedHosts];
+
+  if (removedKeys.length) await chrome.storage.local.remove(removedKeys);
+  await chrome.storage.local.set(setItems);
+  if (enabled !== false) await chrome.declarativeNetRequest.updateDynamicRules({ removeRuleIds, addRules });
+  for (const change of Object.values(staticChanges)) {
+    await chrome.declarativeNetRequest.updateStaticRules(change);
+  }
+  await chrome.storage.local.set({ rulesVersion: diff.to });
+
+  // hide.css is registered without the sites that switch generic rules off
+  const exclusionsChanged = changedSiteKeys.some(key =>
+    (previous[key] && hasExclusions(previous[key])) || (diff.site.set[key] && hasExclusions(diff.site.set[key])));
+  if (exclusionsChanged && enabled !== false) syncContentScripts(true);
+}
+
+/**
+ * Fetches and applies the diff from the installed rules
+ * version to the feed's latest one. Without a direct
+ * diff the rules are reset to the bundle and the full
+ * diff from version 0 is applied instead. The size and
+ * timing of the last update are kept in lastRuleUpdate.
+ */
+function checkForUpdates() {
+  return queueRuleTask(async () => {
+    const { updateUrl } = await updateSettings();
+    if (!updateUrl) return;
+
+    const feed = new URL(updateUrl.endsWith("/") ? updateUrl : updateUrl + "/");
+    const { rulesVersion = 0, rulesBase } = await chrome.storage.local.get(["rulesVersion", "rulesBase"]);
+    const latest = await (await fetch(new URL("latest.json", feed), { cache: "no-store" })).json();
+    if (latest.base !== rulesBase || latest.version <= rulesVersion) return;
+
+    const from = latest.diffs.includes(rulesVersion) ? rulesVersion : 0;
+    const started = performance.now();
+    const response = await fetch(new URL(`diffs/${from}-${latest.version}.json`, feed), { cache: "no-store" });
+    if (!response.ok) throw new Error(`diff ${from}-${latest.version}: HTTP ${response.status}`);
+    const body = await response.arrayBuffer();
+    const fetched = performance.now();
+
+    if (from !== rulesVersion) await resetToBundledRules();
+    await applyRuleDiff(JSON.parse(new TextDecoder().decode(body)));
+
+    await chrome.storage.local.set({
+      lastRuleUpdate: {
+        from: rulesVersion,
+        to: latest.version,
+        full: from !== rulesVersion,
+        bytes: body.byteLength,
+        fetchMs: fetched - started,
+        applyMs: performance.now() - fetched,
+        at: Date.now()
+      }
+    });
+  });
+}
+
+/**
+ * Polls the feed when the update alarm fires.
+ */
+chrome.alarms.onAlarm.addListener(alarm => {
+  if (alarm.name === UPDATE_ALARM) checkForUpdates();
+});
+
+/* -----------------------------
+   Perf counters
+------------------------------*/
+
+// Counter reports are combined in memory and written at most this often (ms)
+const STATS_WRITE_DELAY = 10000;
+
+let pendingStats = null;
+let statsWriteTimer = null;
+
+/**
+ * Returns an empty set of counter totals.
+ */
+function emptyStats() {
+  return { passes: {}, removed: {}, rules: {}, skipped: 0, recoveries: {} };
+}
+
+/**
+ * Adds one counter report to a running total and
+ * returns the total.
+ */
+function mergeStats(total, report) {
+  for (const [name, pass] of Object.entries(report.passes || {})) {
+    const sum = total.passes[name] || (total.passes[name] = { count: 0, total: 0, max: 0 });
+    sum.count += pass.count;
+    sum.total += pass.total;
+    sum.max = Math.max(sum.max, pass.max);
+  }
+  for (const [rule, count] of Object.entries(report.removed || {})) {
+    total.removed[rule] = (total.removed[rule] || 0) + count;
+  }
+  total.rules = total.rules || {}; // Totals stored before rule groups were counted
+  for (const [name, rule] of Object.entries(report.rules || {})) {
+    const sum = total.rules[name] || (total.rules[name] = { first: rule.first, total: 0, matches: 0 });
+    sum.first = rule.first;
+    sum.total += rule.total;
+    sum.matches += rule.matches;
+  }
+  total.recoveries = total.recoveries || {}; // Totals stored before recoveries were counted
+  for (const [method, recovery] of Object.entries(report.recoveries || {})) {
+    const sum = total.recoveries[method] || (total.recoveries[method] = { count: 0, total: 0, max: 0 });
+    sum.count += recovery.count;
+    sum.total += recovery.total;
+    sum.max = Math.max(sum.max, recovery.max);
+  }
+  total.skipped += report.skipped || 0;
+  return total;
+}
+
+/**
+ * Queues a tab's report and schedules one storage
+ * write for everything that arrives meanwhile.
+ */
+function queueStats(report) {
+  pendingStats = mergeStats(pendingStats || emptyStats(), report);
+  if (!statsWriteTimer) statsWriteTimer = setTimeout(writeStats, STATS_WRITE_DELAY);
+}
+
+/**
+ * Adds the queued reports to the stored totals.
+ */
+async function writeStats() {
+  statsWriteTimer = null;
+  const report = pendingStats;
+  pendingStats = null;
+  if (!report) return;
+
+  const { stats } = await chrome.storage.local.get("stats");
+  await chrome.storage.local.set({ stats: mergeStats(stats || emptyStats(), report) });
+}
+
+/**
+ * Receives counter reports from content scripts.
+ */
+chrome.runtime.onMessage.addListener((message, sender) => {
+  if (message && message.type === "chomper:stats" && sender.tab) queueStats(message.stats);
+});
+
+/* -----------------------------
+   Trace mode
+------------------------------*/
+
+/**
+ * Returns the session storage key holding the trace a
+ * tab's previous page left behind (read by popup.js).
+ */
+function traceKey(tabId) {
+  return "trace:" + tabId;
+}
+
+/**
+ * Keeps the trace a content script sends as its page
+ * goes away, one per tab, until the popup exports it
+ * together with the trace of the page that replaced it.
+ */
+chrome.runtime.onMessage.addListener((message, sender) => {
+  if (message && message.type === "chomper:trace" && sender.tab) {
+    chrome.storage.session.set({ [traceKey(sender.tab.id)]: message.trace }).catch(() => {});
+  }
+});
+
+chrome.tabs.onRemoved.addListener(tabId => {
+  chrome.storage.session.remove(traceKey(tabId)).catch(() => {});
+});
+
+/* -----------------------------
+   Lifecycle
+------------------------------*/
+
 /**
  * Runs once when the extension is first installed or updated.
  * Sets the enabled flag to true so the blocker is active by default.
+ * Rule updates applied to the previous version are dropped, since
+ * they were built on its bundle, and the feed is checked again.
  */
 chrome.runtime.onInstalled.addListener(() => {
   // Always set enabled to true by default
   chrome.storage.local.set({ enabled: true });
+  syncNetworkRules(true);
+  queueRuleTask(resetToBundledRules).then(() => {
+    syncContentScripts(true);
+    checkForUpdates();
+  });
+  scheduleRuleUpdates();
 });
 
 /**
  * Runs whenever the browser starts and the extension is loaded.
- * If the blocker is enabled, all open tabs are reloaded
- * so blocking rules are applied consistently.
+ * If the blocker is enabled, the visible tab of each window gets
+ * the content script if it is missing. Background tabs are
+ * handled when they are activated, and discarded tabs get the
+ * script from the registration when they load again.
  */
 chrome.runtime.onStartup.addListener(() => {
+  scheduleRuleUpdates();
   chrome.storage.local.get(["enabled"], (res) => {
+    syncNetworkRules(res.enabled !== false);
+    syncContentScripts(res.enabled !== false);
+
     if (res.enabled) {
-      // Reload all tabs when extension starts
-      chrome.tabs.query({}, (tabs) => {
-        tabs.forEach(tab => chrome.tabs.reload(tab.id));
-      });
+      chrome.tabs.query({ active: true }, injectMissingBlocker);
     }
   });
 });
 
+/**
+ * Gives a tab the content script when the user switches
+ * to it, if it does not have one yet.
+ */
+chrome.tabs.onActivated.addListener(({ tabId }) => {
+  chrome.storage.local.get(["enabled"], (res) => {
+    if (!res.enabled) return;
+    chrome.tabs.get(tabId, tab => {
+      if (!chrome.runtime.lastError) injectMissingBlocker([tab]);
+    });
+  });
+});
+
+/**
+ * Inserts a page's site rules as soon as it commits, so
+ * they apply before the first paint instead of after the
+ * content script's storage lookup. Pages whose site
+ * entries switch generic rules off are left to content.js.
+ */
+chrome.webNavigation.onCommitted.addListener(({ tabId, frameId, url }) => {
+  if (frameId !== 0 || !/^https?:/.test(url)) return;
+
+  const keys = siteRuleKeys(new URL(url).hostname);
+  chrome.storage.local.get(["enabled", ...keys], (res) => {
+    if (res.enabled === false) return;
+
+    const entries = keys.map(key => res[key]).filter(Boolean);
+    if (!entries.length || entries.some(hasExclusions)) return;
+
+    const css = buildSiteCss(entries);
+    if (css) {
+      chrome.scripting.insertCSS({ target: { tabId, frameIds: [frameId] }, css }).catch(() => {});
+    }
+  });
+});
+
+/**
+ * Applies toggles from the popup to network blocking and
+ * the content script registrations. Tabs opened while
+ * blocking was off get the content script once it is on.
+ * A new feed URL or interval takes effect right away.
+ */
+chrome.storage.onChanged.addListener((changes, area) => {
+  if (changes.updateUrl || changes.updateIntervalMinutes) {
+    scheduleRuleUpdates();
+    checkForUpdates();
+  }
+  if (area !== "local" || !changes.enabled) return;
+
+  const enabled = changes.enabled.newValue !== false;
+  syncNetworkRules(enabled);
+  syncContentScripts(enabled);
+  if (enabled) chrome.tabs.query({ active: true }, injectMissingBlocker);
+});
+
 //xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
\ No newline at end of file
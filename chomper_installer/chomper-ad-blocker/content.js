@@ -3,89 +3,787 @@
 /**
  * Chomper Ad Blocker – Content Logic
  *
- * This file contains the core runtime logic responsible for
- * detecting, skipping, and removing intrusive advertising
- * elements, as well as recovering from playback stalls.
+ * This file contains the generic runtime logic responsible
+ * for hiding intrusive advertising elements on every site.
+ * Selector rules are applied as stylesheets so the
+ * browser's style engine does the matching; script only
+ * handles what CSS cannot (overlays).
+ *
+ * The generic rules normally arrive as hide.css with the
+ * script registration, and site rules are inserted by the
+ * background script as the page commits, so ads are hidden
+ * before first paint. Both are switched off in place via
+ * an attribute on <html>. Only when that CSS is missing
+ * does this script build its own adopted stylesheet.
+ * Shadow roots (closed ones too, announced by
+ * shadow_hook.js) and same-origin frames, which page CSS
+ * cannot reach, are tracked as they are attached or
+ * inserted and each get the rules plus an observer of
+ * their own.
+ *
+ * The background script registers it only while blocking
+ * is on. Hosts with video ads also get video.js, which
+ * plugs into the lifecycle below through registerModule().
  * 
  * All logic is event-driven and guarded by a global
- * enable/disable flag for safe shutdown.
+ * enable/disable flag for safe shutdown. Opt-in perf
+ * counters (pass timings, removals, skips, stall
+ * recoveries) are reported to the background script in
+ * batches. An opt-in trace mode records every pass,
+ * observer callback, sweep tick, rule match, skip and
+ * reload into a fixed-size ring buffer that the popup
+ * exports as Chrome Trace Event JSON.
  */
 
 let observer = null;
-let intervalId = null;
-let reloaded = false;
-let lastTime = 0;
-let stallCount = 0;
+let sweepTimer = null;
+let sweepDelay = 0;
 let isBlockingEnabled = true; // Global flag to control blocking
+let pendingNodes = []; // Added subtrees awaiting the next frame
+let pendingRemoved = []; // Removed subtrees that may hold tracked roots
+let flushScheduled = false;
+const checkedOverlays = new WeakSet(); // Positioned elements already checked
+let overlaysScanned = false;
+let hideSheet = null; // Constructable stylesheet holding the compiled rules
+const modules = []; // Feature modules loaded after this script (see video.js)
+const trackedRoots = new Map(); // Shadow host or frame element -> { root, observer, style, shadowEvent }
+const shadowChannels = new WeakMap(); // Document -> event name its shadow_hook.js announces roots with
+let rootSiteRulesLoaded = false;
+
+// Whether hide.css came with the script registration (see background.js)
+const hasRegisteredCss = document.documentElement !== null &&
+  getComputedStyle(document.documentElement).getPropertyValue(CHOMPER_CSS.sentinel).trim() === "1";
+let perf = null; // Perf counters since the last report; null while switched off
+let perfTimer = null;
+let rulesSampled = false; // Rule groups were matched since the last perf report
+let ruleCursor = 0; // Rule group the next budgeted sample starts at
+let trace = null; // Trace ring buffer; null while trace mode is off
+
+const PROTECTED_CONTAINERS = CHOMPER_CSS.protected;
+// Rulesets allowed inside protected containers; all others are guarded
+const UNGUARDED_RULESETS = CHOMPER_CSS.unguarded;
+const OVERLAY_SELECTOR = "div[style*='position: fixed'], div[style*='position: absolute']";
+const OVERLAY_PROTECTED = "#movie_player, .ytp-ad-module";
+const OVERLAY_MIN_Z_INDEX = 1000;
+// Root element attribute that hands shadow_hook.js's event name over
+const SHADOW_CHANNEL_ATTRIBUTE = "data-chomper-channel";
+const HTML_NAMESPACE = "http://www.w3.org/1999/xhtml";
+
+// Scheduler timings (ms)
+const SWEEP_MIN_DELAY = 500;   // Sweep interval right after something was found
+const SWEEP_MAX_DELAY = 8000;  // Back-off ceiling while nothing is found
+const PERF_REPORT_INTERVAL = 5000;
+const RULE_SAMPLE_BUDGET = 4; // Rule matching per report period, outside trace mode
+
+// Trace events kept per page; older ones are overwritten
+const TRACE_CAPACITY = 4096;
 
 /* -----------------------------
-   Core ad handling
+   Compiled rules
 ------------------------------*/
 
 /**
- * Attempts to fast-forward short promotional video segments
- * and activates any visible skip controls when available.
+ * Prepares a ruleset compiled by rule_compiler.py
+ * (see rules.js) for use at runtime, merged with any
+ * entries from the per-site index for this page.
  */
-function skipAds() {
-  if (!isBlockingEnabled) return;
-  
-  const video = document.querySelector("video");
-  if (!video) return;
+function indexRuleset(ruleset, siteEntries = []) {
+  const parts = [ruleset, ...siteEntries];
+  const excluded = new Set(siteEntries.flatMap(entry => entry.exclude || []));
+  if (excluded.size === 0) return { groups: parts.flatMap(part => part.groups || []) };
+
+  // Site exclusions switch off generic selectors, so regroup what is left
+  const selectors = parts.flatMap(part => part.selectors || []).filter(selector => !excluded.has(selector));
+  return { groups: [selectors.join(",")].filter(Boolean) };
+}
 
-  // Skip short promotional video segments
-  if (video.duration && video.duration < 70 && !video.ended) {
-    video.currentTime = video.duration;
+/**
+ * Indexes every compiled ruleset (youtube, universal and
+ * any list imported with filter_parser.py) together
+ * with the site entries for this page, by name.
+ */
+function indexRulesets(entries = []) {
+  const names = new Set([...Object.keys(CHOMPER_RULES), ...entries.flatMap(entry => Object.keys(entry))]);
+  const rulesets = {};
+  for (const name of names) {
+    const siteEntries = entries.map(entry => entry[name]).filter(Boolean);
+    rulesets[name] = indexRuleset(CHOMPER_RULES[name] || {}, siteEntries);
   }
+  return rulesets;
+}
 
-  // Click skip control if present
-  const skipBtn = document.querySelector(
-    ".ytp-ad-skip-button, .ytp-ad-skip-button-modern"
-  );
-  if (skipBtn) skipBtn.click();
+let runtimeRules = indexRulesets();
+
+/**
+ * Returns the storage keys of the per-site index for
+ * this hostname and each parent domain, most specific
+ * first (www.youtube.com, youtube.com, com).
+ */
+function siteRuleKeys(hostname) {
+  const labels = hostname.split(".");
+  return labels.map((_, i) => "site:" + labels.slice(i).join("."));
 }
 
 /**
- * Removes known promotional containers from the document
- * tree using predefined selectors.
+ * Rebuilds the runtime rulesets with the site entries
+ * returned by one storage lookup.
  */
-function removeAds() {
-  if (!isBlockingEnabled) return;
-  
-  [
-    ".video-ads",
-    ".ytp-ad-module",
-    "#player-ads",
-    "ytd-display-ad-renderer",
-    "ytd-promoted-video-renderer",
-    "ytd-companion-slot-renderer",
-    "ytd-action-companion-ad-renderer"
-  ].forEach(sel => {
-    document.querySelectorAll(sel).forEach(el => el.remove());
+function applySiteRules(stored) {
+  const start = performance.now();
+  const entries = siteRuleKeys(location.hostname)
+    .map(key => stored[key])
+    .filter(Boolean);
+  if (!entries.length) return;
+
+  runtimeRules = indexRulesets(entries);
+  updateHideCss();
+  traceEvent("siteRules", "reload", start, performance.now() - start, { entries: entries.length });
+}
+
+/* -----------------------------
+   Element hiding stylesheet
+------------------------------*/
+
+/**
+ * Builds the hiding stylesheet from the runtime
+ * rulesets. Groups are wrapped in :is(), whose
+ * forgiving parsing drops an unsupported selector
+ * instead of the whole rule. Only the YouTube rules
+ * may hide protected playback containers or their
+ * content.
+ */
+function buildHideCss() {
+  const guard = `:not(${PROTECTED_CONTAINERS.flatMap(sel => [sel, sel + " *"]).join(", ")})`;
+  const hide = "{ display: none !important; }";
+
+  return Object.entries(runtimeRules).flatMap(([name, rules]) =>
+    rules.groups.map(group => `:is(${group})${UNGUARDED_RULESETS.includes(name) ? "" : guard} ${hide}`)
+  ).join("\n");
+}
+
+/**
+ * Returns the hiding stylesheet, building it on first
+ * use. Shadow roots adopt it even when the registered
+ * CSS covers the document.
+ */
+function getHideSheet() {
+  if (!hideSheet) {
+    hideSheet = new CSSStyleSheet();
+    hideSheet.replaceSync(buildHideCss());
+  }
+  return hideSheet;
+}
+
+/**
+ * Rebuilds every copy of the hiding rules after the
+ * runtime rulesets changed.
+ */
+function updateHideCss() {
+  if (hideSheet) hideSheet.replaceSync(buildHideCss());
+  for (const tracked of trackedRoots.values()) {
+    if (tracked.style) tracked.style.textContent = buildHideCss();
+  }
+}
+
+/**
+ * Adopts the hiding stylesheet into the document,
+ * unless the registered CSS already covers the page.
+ */
+function installHideSheet() {
+  if (hasRegisteredCss) return;
+  const sheet = getHideSheet();
+  if (!document.adoptedStyleSheets.includes(sheet)) {
+    document.adoptedStyleSheets = [...document.adoptedStyleSheets, sheet];
+  }
+}
+
+/**
+ * Removes the hiding stylesheet so hidden elements
+ * reappear.
+ */
+function removeHideSheet() {
+  if (!hideSheet) return;
+  document.adoptedStyleSheets = document.adoptedStyleSheets.filter(sheet => sheet !== hideSheet);
+}
+
+/* -----------------------------
+   Shadow roots and frames
+------------------------------*/
+
+/**
+ * Returns the shadow root or same-origin document
+ * hosted by an element, or null. Closed shadow roots
+ * are included where chrome.dom can reach them, so a
+ * host that got its root before it was inserted is
+ * covered once it is.
+ */
+function hostedRoot(el) {
+  if (el.tagName === "IFRAME" || el.tagName === "FRAME") return el.contentDocument;
+  return shadowRootOf(el);
+}
+
+/**
+ * Returns an element's open or closed shadow root, or
+ * null.
+ */
+function shadowRootOf(el) {
+  if (!chrome.dom || !chrome.dom.openOrClosedShadowRoot || el.namespaceURI !== HTML_NAMESPACE) {
+    return el.shadowRoot;
+  }
+  return chrome.dom.openOrClosedShadowRoot(el);
+}
+
+/**
+ * Returns the event name shadow_hook.js announces new
+ * shadow roots with in doc, or null. The two scripts
+ * meet on the root element before page scripts run:
+ * whichever comes first leaves a random name in
+ * SHADOW_CHANNEL_ATTRIBUTE and the other takes it away.
+ * Frame documents, where the hook runs without a
+ * content script of its own, only give a name up.
+ */
+function shadowChannel(doc, create = false) {
+  if (shadowChannels.has(doc)) return shadowChannels.get(doc);
+
+  const root = doc.documentElement;
+  let name = root && root.getAttribute(SHADOW_CHANNEL_ATTRIBUTE);
+  if (name) {
+    root.removeAttribute(SHADOW_CHANNEL_ATTRIBUTE);
+  } else if (create && root) {
+    name = Array.from(crypto.getRandomValues(new Uint32Array(4)), n => n.toString(36)).join("");
+    root.setAttribute(SHADOW_CHANNEL_ATTRIBUTE, name);
+  }
+  if (!name) return null;
+  shadowChannels.set(doc, name);
+  return name;
+}
+
+/**
+ * Calls fn for node, if it is an element, and for every
+ * element below it, without entering shadow roots or
+ * frames.
+ */
+function forEachElement(node, fn) {
+  if (node.nodeType === Node.ELEMENT_NODE) fn(node);
+  const walker = (node.ownerDocument || node).createTreeWalker(node, NodeFilter.SHOW_ELEMENT);
+  while (walker.nextNode()) fn(walker.currentNode);
+}
+
+/**
+ * Tracks every root hosted in a subtree.
+ */
+function discoverRoots(node) {
+  forEachElement(node, el => {
+    const root = hostedRoot(el);
+    if (root) trackRoot(el, root);
   });
 }
 
 /**
- * Detects stalled playback states and performs a single
- * recovery reload if a hard stall persists.
+ * Untracks every tracked root hosted in a subtree that
+ * left the page.
  */
-function detectAndRecover() {
-  if (!isBlockingEnabled) return;
-  
-  const video = document.querySelector("video");
-  if (!video) return;
+function forgetRoots(node) {
+  forEachElement(node, el => {
+    if (trackedRoots.has(el)) untrackRoot(el);
+  });
+}
 
-  if (video.currentTime === lastTime && !video.paused) {
-    stallCount++;
+/**
+ * Applies the hiding rules to a tracked root. Roots of
+ * this document adopt the shared stylesheet; frame
+ * documents, which cannot adopt another document's
+ * constructed sheets, get a <style> copy.
+ */
+function attachRootSheet(tracked) {
+  const { root } = tracked;
+  if ((root.ownerDocument || root) === document) {
+    root.adoptedStyleSheets = [...root.adoptedStyleSheets, getHideSheet()];
+    return;
+  }
+
+  tracked.style = (root.ownerDocument || root).createElement("style");
+  tracked.style.textContent = buildHideCss();
+  const parent = root.nodeType === Node.DOCUMENT_NODE ? root.head || root.documentElement : root;
+  if (parent) parent.append(tracked.style);
+}
+
+/**
+ * Removes the hiding rules from a tracked root.
+ */
+function detachRootSheet(tracked) {
+  if (tracked.style) {
+    tracked.style.remove();
   } else {
-    stallCount = 0;
+    tracked.root.adoptedStyleSheets = tracked.root.adoptedStyleSheets.filter(sheet => sheet !== hideSheet);
+  }
+}
+
+/**
+ * Starts covering the root hosted by host: applies the
+ * hiding rules, observes it like the document and
+ * queues its current content for the next flush. A
+ * frame that navigated has its old document replaced.
+ */
+function trackRoot(host, root = hostedRoot(host)) {
+  const existing = trackedRoots.get(host);
+  if (existing && existing.root === root) return;
+  if (existing) untrackRoot(host);
+  if (!root) return;
+
+  // The registered CSS covered the document, so the site rules were never fetched
+  if (hasRegisteredCss && !rootSiteRulesLoaded) {
+    rootSiteRulesLoaded = true;
+    chrome.storage.local.get(siteRuleKeys(location.hostname), applySiteRules);
   }
 
-  lastTime = video.currentTime;
+  const tracked = {
+    root,
+    observer: new MutationObserver(queueAddedNodes),
+    style: null,
+    shadowEvent: shadowChannel(root.ownerDocument || root)
+  };
+  attachRootSheet(tracked);
+  tracked.observer.observe(root, { childList: true, subtree: true });
+  trackedRoots.set(host, tracked);
+
+  if (root.nodeType === Node.DOCUMENT_NODE) host.addEventListener("load", handleFrameLoad);
+  // Announcements from inside a closed root only show their real host to a listener in it
+  if (tracked.shadowEvent) root.addEventListener(tracked.shadowEvent, handleShadowAttached, true);
+
+  for (const child of root.children) pendingNodes.push(child);
+  scheduleFlush();
+}
+
+/**
+ * Stops covering the root hosted by host, and every
+ * root tracked inside it.
+ */
+function untrackRoot(host) {
+  const tracked = trackedRoots.get(host);
+  if (!tracked) return;
+
+  trackedRoots.delete(host);
+  tracked.observer.disconnect();
+  detachRootSheet(tracked);
+  if (tracked.root.nodeType === Node.DOCUMENT_NODE) host.removeEventListener("load", handleFrameLoad);
+  if (tracked.shadowEvent) tracked.root.removeEventListener(tracked.shadowEvent, handleShadowAttached, true);
+  if (trackedRoots.size) forgetRoots(tracked.root);
+}
+
+/**
+ * Follows a tracked frame to its new document, or drops
+ * it once it shows a cross-origin page.
+ */
+function handleFrameLoad(event) {
+  if (isBlockingEnabled) trackRoot(event.target);
+}
+
+/**
+ * Tracks a shadow root as soon as shadow_hook.js reports
+ * it, including closed ones, which element.shadowRoot
+ * does not expose.
+ */
+function handleShadowAttached(event) {
+  const host = event.composedPath()[0];
+  const root = shadowRootOf(host);
+  if (root) trackRoot(host, root);
+}
+
+/* -----------------------------
+   Perf counters
+------------------------------*/
+
+/**
+ * Runs fn(...args) and, while counters are on, adds
+ * its duration to the pass counters kept under name.
+ */
+function timed(name, fn, ...args) {
+  if (!perf && !trace) return fn(...args);
+
+  const start = performance.now();
+  const result = fn(...args);
+  const elapsed = performance.now() - start;
+
+  traceEvent(name, "pass", start, elapsed);
+  if (!perf) return result;
+  const pass = perf.passes[name] || (perf.passes[name] = { count: 0, total: 0, max: 0 });
+  pass.count++;
+  pass.total += elapsed;
+  if (elapsed > pass.max) pass.max = elapsed;
+  return result;
+}
+
+/**
+ * Counts elements removed by one rule.
+ */
+function countRemoved(rule, count) {
+  if (!count) return;
+  if (perf) perf.removed[rule] = (perf.removed[rule] || 0) + count;
+  traceEvent(rule, "match", performance.now(), undefined, { matches: count });
+}
+
+/**
+ * Counts one skipped video ad, and how it was skipped.
+ */
+function countSkipped(method) {
+  if (perf) perf.skipped++;
+  traceEvent(method, "skip", performance.now());
+}
+
+/**
+ * Records how long a playback stall lasted and which
+ * recovery method ended it.
+ */
+function countRecovery(method, latency) {
+  traceEvent(method, "recovery", performance.now() - latency, latency);
+  if (!perf) return;
+
+  const recovery = perf.recoveries[method] || (perf.recoveries[method] = { count: 0, total: 0, max: 0 });
+  recovery.count++;
+  recovery.total += latency;
+  if (latency > recovery.max) recovery.max = latency;
+}
+
+/**
+ * Sends the counters gathered since the last report to
+ * the background script, which merges all tabs, and
+ * starts a fresh set. Nothing is sent for idle periods.
+ */
+function reportPerf() {
+  if (!perf) return;
+
+  const report = perf;
+  perf = { passes: {}, removed: {}, rules: {}, skipped: 0, recoveries: {} };
+  rulesSampled = false;
+  const idle = Object.keys(report.passes).length === 0 && Object.keys(report.recoveries).length === 0;
+  if (idle && !report.skipped) return;
 
-  // Reload once if a hard stall is detected
-  if (stallCount > 6 && !reloaded) {
-    reloaded = true;
-    location.reload();
+  chrome.runtime.sendMessage({ type: "chomper:stats", stats: report }).catch(() => {});
+}
+
+/**
+ * Switches the perf counters on or off. While off, no
+ * counter, timer or listener exists.
+ */
+function setPerfEnabled(enabled) {
+  if (enabled && !perf) {
+    perf = { passes: {}, removed: {}, rules: {}, skipped: 0, recoveries: {} };
+    if (!document.hidden) perfTimer = setInterval(reportPerf, PERF_REPORT_INTERVAL);
+    window.addEventListener("pagehide", reportPerf);
+  } else if (!enabled && perf) {
+    reportPerf();
+    clearInterval(perfTimer);
+    perfTimer = null;
+    window.removeEventListener("pagehide", reportPerf);
+    perf = null;
+  }
+}
+
+/* -----------------------------
+   Trace mode
+------------------------------*/
+
+/**
+ * Appends one event to the trace ring buffer, over-
+ * writing the oldest once it is full. Times are
+ * performance.now() milliseconds; an event without a
+ * duration is an instant.
+ */
+function traceEvent(name, category, start, duration, args) {
+  if (!trace) return;
+
+  trace.events[trace.recorded % TRACE_CAPACITY] = { name, category, start, duration, args };
+  trace.recorded++;
+}
+
+/**
+ * Records how many nodes each hiding rule group matches
+ * in the flushed subtrees, and how long matching them
+ * takes, so the costliest rules can be found. Groups are
+ * named <ruleset>[<index>] in the trace and the perf
+ * counters alike. Only runs while either is on; the
+ * stylesheets do the real hiding.
+ *
+ * Trace mode matches every group. Otherwise matching
+ * stops once RULE_SAMPLE_BUDGET is spent and the next
+ * sample carries on with the following group, so large
+ * rulesets are covered over several report periods.
+ */
+function countRuleMatches(nodes) {
+  const groups = Object.entries(runtimeRules).flatMap(([ruleset, rules]) =>
+    rules.groups.map((group, index) => [`${ruleset}[${index}]`, group]));
+  const begin = performance.now();
+
+  for (let done = 0; done < groups.length; done++) {
+    if (!trace && performance.now() - begin >= RULE_SAMPLE_BUDGET) break;
+    ruleCursor = ruleCursor % groups.length;
+    const [name, group] = groups[ruleCursor++];
+
+    // Names the group in reports; commas inside :is() may cut it short
+    const comma = group.indexOf(",");
+    const first = comma === -1 ? group : group.slice(0, comma);
+    const start = performance.now();
+    let matches = 0;
+    try {
+      for (const node of nodes) {
+        if (node.matches(group)) matches++;
+        matches += node.querySelectorAll(group).length;
+      }
+    } catch (error) {
+      continue; // A selector this browser does not support; :is() skips it in the sheet
+    }
+    const elapsed = performance.now() - start;
+    traceEvent(name, "match", start, elapsed, { matches, first });
+    if (!perf) continue;
+    const rule = perf.rules[name] || (perf.rules[name] = { first, total: 0, matches: 0 });
+    rule.total += elapsed;
+    rule.matches += matches;
+  }
+}
+
+/**
+ * Returns the ring buffer as Chrome Trace Event JSON,
+ * oldest event first, ready for chrome://tracing,
+ * Perfetto or trace_analyzer.py.
+ */
+function exportTrace() {
+  const recorded = trace ? trace.recorded : 0;
+  const kept = Math.min(recorded, TRACE_CAPACITY);
+  // Page loads of one tab show up as separate processes
+  const pid = Math.floor(performance.timeOrigin) % 1000000;
+  const toMicros = ms => (performance.timeOrigin + ms) * 1000;
+
+  const traceEvents = [
+    { name: "process_name", ph: "M", pid, tid: 1, args: { name: location.href } }
+  ];
+  for (let i = recorded - kept; i < recorded; i++) {
+    const event = trace.events[i % TRACE_CAPACITY];
+    const entry = { name: event.name || event.category, cat: event.category, ph: "X", ts: toMicros(event.start), pid, tid: 1 };
+    if (event.duration === undefined) {
+      entry.ph = "i";
+      entry.s = "t";
+    } else {
+      entry.dur = event.duration * 1000;
+    }
+    if (event.args) entry.args = event.args;
+    traceEvents.push(entry);
+  }
+
+  return {
+    traceEvents,
+    displayTimeUnit: "ms",
+    otherData: { url: location.href, capacity: TRACE_CAPACITY, dropped: recorded - kept }
+  };
+}
+
+/**
+ * Hands the trace to the background script before the
+ * page goes away, so a reload (including the video
+ * module's reload recovery) does not lose it.
+ */
+function saveTrace() {
+  if (trace && trace.recorded) {
+    chrome.runtime.sendMessage({ type: "chomper:trace", trace: exportTrace() }).catch(() => {});
+  }
+}
+
+/**
+ * Switches trace mode on or off. While off, no buffer
+ * or listener exists.
+ */
+function setTraceEnabled(enabled) {
+  if (enabled && !trace) {
+    trace = { events: new Array(TRACE_CAPACITY), recorded: 0 };
+    window.addEventListener("pagehide", saveTrace);
+  } else if (!enabled && trace) {
+    window.removeEventListener("pagehide", saveTrace);
+    trace = null;
+  }
+}
+
+/* -----------------------------
+   Feature modules
+------------------------------*/
+
+/**
+ * Registers a feature module. A module is an object
+ * with any of start(), stop(), sweep(), nodesAdded(nodes),
+ * hidden() and visible(), called at the matching points
+ * of the blocking lifecycle. Sweep hooks return the
+ * number of ads they handled.
+ */
+function registerModule(module) {
+  modules.push(module);
+  if (observer && module.start) module.start();
+}
+
+/**
+ * Calls one hook on every registered module and
+ * returns the sum of their results.
+ */
+function notifyModules(hook, arg) {
+  let handled = 0;
+  for (const module of modules) {
+    if (module[hook]) handled += module[hook](arg) || 0;
+  }
+  return handled;
+}
+
+/* -----------------------------
+   Incremental mutation handling
+------------------------------*/
+
+/**
+ * Collects the element subtrees added by a batch of
+ * mutation records, from the document or any tracked
+ * root, and schedules a single pass for them, so bursts
+ * of mutations cost one pass per frame. Removed
+ * subtrees are only kept while roots are tracked.
+ */
+function queueAddedNodes(mutations) {
+  const start = trace ? performance.now() : 0;
+  for (const mutation of mutations) {
+    for (const node of mutation.addedNodes) {
+      if (node.nodeType === Node.ELEMENT_NODE) pendingNodes.push(node);
+    }
+    if (trackedRoots.size) {
+      for (const node of mutation.removedNodes) {
+        if (node.nodeType === Node.ELEMENT_NODE) pendingRemoved.push(node);
+      }
+    }
+  }
+  scheduleFlush();
+  if (trace) traceEvent("mutations", "observer", start, performance.now() - start, { records: mutations.length });
+}
+
+/**
+ * Schedules the next flush, unless one is pending or
+ * nothing is queued.
+ */
+function scheduleFlush() {
+  if ((pendingNodes.length === 0 && pendingRemoved.length === 0) || flushScheduled) return;
+  flushScheduled = true;
+
+  // Animation frames are paused in hidden tabs; fall back to idle time
+  if (document.hidden) {
+    requestIdleCallback(runFlush, { timeout: 1000 });
+  } else {
+    requestAnimationFrame(runFlush);
+  }
+}
+
+/**
+ * Runs the queued flush as one timed pass. Rule groups
+ * are matched against its subtrees afterwards, outside
+ * the pass, so counting them does not inflate its time:
+ * on every flush in trace mode, and on the first flush
+ * of each report period for the perf counters, as
+ * matching large rulesets on every flush stalls pages.
+ */
+function runFlush() {
+  const nodes = timed("flushAddedNodes", flushAddedNodes);
+  if (nodes.length === 0 || !(trace || (perf && !rulesSampled))) return;
+  rulesSampled = true;
+  countRuleMatches(nodes.filter(node => node.isConnected));
+}
+
+/**
+ * Checks every subtree queued since the last frame for
+ * overlays and new shadow roots or frames, and hands
+ * them to the feature modules. Rule matching itself is
+ * left to the hiding stylesheets. Roots whose host was
+ * removed are untracked. Each subtree is walked once,
+ * so the cost follows what was added or removed.
+ * Returns the subtrees that were checked.
+ */
+function flushAddedNodes() {
+  flushScheduled = false;
+  const nodes = pendingNodes;
+  const removedNodes = pendingRemoved;
+  pendingNodes = [];
+  pendingRemoved = [];
+  if (!isBlockingEnabled) return [];
+
+  // Moved subtrees are connected again and keep their roots
+  removedNodes.forEach(node => {
+    if (!node.isConnected && trackedRoots.size) forgetRoots(node);
+  });
+
+  // Skip subtrees that were removed again before this frame
+  const connected = nodes.filter(node => node.isConnected);
+  if (connected.length === 0) return connected;
+  connected.forEach(discoverRoots);
+
+  let removed = 0;
+  const overlays = [];
+  connected.forEach(node => collectOverlays(node, overlays));
+
+  if (overlays.length) removed += removeOverlays(overlays);
+  removed += notifyModules("nodesAdded", connected);
+
+  // New ads appeared: sweep again soon instead of waiting out the back-off
+  if (removed > 0) wakeSweep();
+  return connected;
+}
+
+/* -----------------------------
+   Adaptive scheduling
+------------------------------*/
+
+/**
+ * Runs one full cleanup pass and schedules the next.
+ * The delay doubles while passes find nothing, up to
+ * SWEEP_MAX_DELAY, and nothing runs while the tab is
+ * hidden.
+ */
+function runSweep() {
+  sweepTimer = null;
+  if (!isBlockingEnabled || document.hidden) return;
+
+  let removed = notifyModules("sweep");
+  removed += timed("chomperAdBlock", chomperAdBlock); // Run Chomper universal cleanup pass
+
+  sweepDelay = removed > 0 ? SWEEP_MIN_DELAY : Math.min(sweepDelay * 2, SWEEP_MAX_DELAY);
+  sweepTimer = setTimeout(runSweep, sweepDelay);
+  traceEvent("sweep", "tick", performance.now(), undefined, { removed, nextDelay: sweepDelay });
+}
+
+/**
+ * Resets the sweep back-off after ads were found
+ * outside the sweep itself.
+ */
+function wakeSweep() {
+  if (sweepDelay === SWEEP_MIN_DELAY || !sweepTimer) return;
+
+  clearTimeout(sweepTimer);
+  sweepDelay = SWEEP_MIN_DELAY;
+  sweepTimer = setTimeout(runSweep, sweepDelay);
+}
+
+/**
+ * Pauses all timers while the tab is hidden, perf
+ * reports included after a last one, and resumes with
+ * an immediate pass when it is shown.
+ */
+function handleVisibilityChange() {
+  if (document.hidden) {
+    clearTimeout(sweepTimer);
+    sweepTimer = null;
+    if (perfTimer) {
+      reportPerf();
+      clearInterval(perfTimer);
+      perfTimer = null;
+    }
+    notifyModules("hidden");
+    return;
+  }
+
+  notifyModules("visible");
+  if (perf && !perfTimer) perfTimer = setInterval(reportPerf, PERF_REPORT_INTERVAL);
+  if (!sweepTimer) {
+    sweepDelay = SWEEP_MIN_DELAY;
+    runSweep();
   }
 }
 
@@ -94,33 +792,31 @@ function detectAndRecover() {
 ------------------------------*/
 
 /**
- * Initializes observers and timers required for
- * continuous ad detection and removal.
+ * Initializes the hiding stylesheet, observers and
+ * timers required for continuous ad blocking.
  */
 function startBlocking() {
-  if (observer || intervalId) return;
+  if (observer) return;
   
   isBlockingEnabled = true;
-  reloaded = false;
-  stallCount = 0;
-  lastTime = 0;
+  document.documentElement.removeAttribute(CHOMPER_CSS.offAttribute);
+  installHideSheet();
+  overlaysScanned = false;
 
-  observer = new MutationObserver(() => {
-    skipAds();
-    removeAds();
-  });
+  observer = new MutationObserver(queueAddedNodes);
 
   observer.observe(document.documentElement, {
     childList: true,
     subtree: true
   });
+  const shadowEvent = shadowChannel(document, true);
+  if (shadowEvent) document.addEventListener(shadowEvent, handleShadowAttached, true);
+  discoverRoots(document.documentElement);
 
-  intervalId = setInterval(() => {
-    skipAds();
-    removeAds();
-    detectAndRecover();
-    chomperAdBlock(); // Run Chomper universal cleanup pass
-  }, 500);
+  document.addEventListener("visibilitychange", handleVisibilityChange);
+  notifyModules("start");
+  sweepDelay = SWEEP_MIN_DELAY;
+  runSweep();
 }
 
 /* -----------------------------
@@ -133,16 +829,23 @@ function startBlocking() {
  */
 function stopBlocking() {
   isBlockingEnabled = false;
+  pendingNodes = [];
+  pendingRemoved = [];
+  document.documentElement.setAttribute(CHOMPER_CSS.offAttribute, "");
+  removeHideSheet();
   
   if (observer) {
     observer.disconnect();
     observer = null;
   }
+  const shadowEvent = shadowChannels.get(document);
+  if (shadowEvent) document.removeEventListener(shadowEvent, handleShadowAttached, true);
+  for (const host of Array.from(trackedRoots.keys())) untrackRoot(host);
 
-  if (intervalId) {
-    clearInterval(intervalId);
-    intervalId = null;
-  }
+  document.removeEventListener("visibilitychange", handleVisibilityChange);
+  clearTimeout(sweepTimer);
+  sweepTimer = null;
+  notifyModules("stop");
 }
 
 /* -----------------------------
@@ -150,265 +853,70 @@ function stopBlocking() {
 ------------------------------*/
 
 /**
- * Performs a broad cleanup pass against common
- * advertising, banner, overlay, and promotional
- * element patterns across the page.
+ * Performs the cleanup that needs script logic: high
+ * z-index overlay and pop-up layers. Banner and
+ * promotional patterns are hidden by the stylesheet.
  */
 function chomperAdBlock() {
-  if (!isBlockingEnabled) return;
+  if (!isBlockingEnabled) return 0;
   
-  const universalSelectors = [
-  ".ad-banner",
-  ".ad-container",
-  ".popup-ad",
-  ".overlay-ad",
-  ".sponsored-content",
-  ".ad-frame",
-  ".ad-slot",
-  ".ad-box",
-  ".ad-label",
-  ".sponsored-ad",
-  ".ad-marketing",
-  ".ad-wrapper",
-  ".promotional-ad",
-  ".ad-section",
-  ".ad-feature",
-  ".ad-display",
-  ".ad-unit",
-  ".ad-placeholder",
-  ".promoted-content",
-  ".sponsored-link",
-  ".ad-strip",
-  ".ad-panel",
-  ".popup-banner",
-  ".ad-modal",
-  ".ad-top",
-  ".ad-bottom",
-  ".ad-left",
-  ".ad-right",
-  ".ad-inline",
-  ".ad-sidebar",
-  ".ad-footer",
-  ".ad-header",
-  ".ad-middle",
-  ".ad-background",
-  ".ad-target",
-  ".ad-click",
-  ".ad-img",
-  ".ad-text",
-  ".ad-video",
-  ".ad-iframe",
-  ".ad-popout",
-  ".ad-expand",
-  ".ad-collapse",
-  ".ad-hover",
-  ".ad-hover-effect",
-  ".ad-banner-top",
-  ".ad-banner-bottom",
-  ".ad-banner-left",
-  ".ad-banner-right",
-  ".ad-banner-inline",
-  ".ad-banner-sidebar",
-  ".ad-banner-footer",
-  ".ad-banner-header",
-  ".ad-overlay-top",
-  ".ad-overlay-bottom",
-  ".ad-overlay-left",
-  ".ad-overlay-right",
-  ".ad-overlay-inline",
-  ".ad-overlay-sidebar",
-  ".ad-overlay-footer",
-  ".ad-overlay-header",
-  ".sponsored-top",
-  ".sponsored-bottom",
-  ".sponsored-left",
-  ".sponsored-right",
-  ".sponsored-inline",
-  ".sponsored-sidebar",
-  ".sponsored-footer",
-  ".sponsored-header",
-  ".promotional-top",
-  ".promotional-bottom",
-  ".promotional-left",
-  ".promotional-right",
-  ".promotional-inline",
-  ".promotional-sidebar",
-  ".promotional-footer",
-  ".promotional-header",
-  ".ad-feature-top",
-  ".ad-feature-bottom",
-  ".ad-feature-left",
-  ".ad-feature-right",
-  ".ad-feature-inline",
-  ".ad-feature-sidebar",
-  ".ad-feature-footer",
-  ".ad-feature-header",
-  ".ad-section-top",
-  ".ad-section-bottom",
-  ".ad-section-left",
-  ".ad-section-right",
-  ".ad-section-inline",
-  ".ad-section-sidebar",
-  ".ad-section-footer",
-  ".ad-section-header",
-  ".ad-box-top",
-  ".ad-box-bottom",
-  ".ad-box-left",
-  ".ad-box-right",
-  ".ad-box-inline",
-  ".ad-box-sidebar",
-  ".ad-box-footer",
-  ".ad-box-header",
-  ".ad-wrapper-top",
-  ".ad-wrapper-bottom",
-  ".ad-wrapper-left",
-  ".ad-wrapper-right",
-  ".ad-wrapper-inline",
-  ".ad-wrapper-sidebar",
-  ".ad-wrapper-footer",
-  ".ad-wrapper-header",
-  ".ad-unit-top",
-  ".ad-unit-bottom",
-  ".ad-unit-left",
-  ".ad-unit-right",
-  ".ad-unit-inline",
-  ".ad-unit-sidebar",
-  ".ad-unit-footer",
-  ".ad-unit-header",
-  ".ad-placeholder-top",
-  ".ad-placeholder-bottom",
-  ".ad-placeholder-left",
-  ".ad-placeholder-right",
-  ".ad-placeholder-inline",
-  ".ad-placeholder-sidebar",
-  ".ad-placeholder-footer",
-  ".ad-placeholder-header",
-  ".ad-marketing-top",
-  ".ad-marketing-bottom",
-  ".ad-marketing-left",
-  ".ad-marketing-right",
-  ".ad-marketing-inline",
-  ".ad-marketing-sidebar",
-  ".ad-marketing-footer",
-  ".ad-marketing-header",
-  ".ad-strip-top",
-  ".ad-strip-bottom",
-  ".ad-strip-left",
-  ".ad-strip-right",
-  ".ad-strip-inline",
-  ".ad-strip-sidebar",
-  ".ad-strip-footer",
-  ".ad-strip-header",
-  ".popup-ad-top",
-  ".popup-ad-bottom",
-  ".popup-ad-left",
-  ".popup-ad-right",
-  ".popup-ad-inline",
-  ".popup-ad-sidebar",
-  ".popup-ad-footer",
-  ".popup-ad-header",
-  ".popup-banner-top",
-  ".popup-banner-bottom",
-  ".popup-banner-left",
-  ".popup-banner-right",
-  ".popup-banner-inline",
-  ".popup-banner-sidebar",
-  ".popup-banner-footer",
-  ".popup-banner-header",
-  ".ad-modal-top",
-  ".ad-modal-bottom",
-  ".ad-modal-left",
-  ".ad-modal-right",
-  ".ad-modal-inline",
-  ".ad-modal-sidebar",
-  ".ad-modal-footer",
-  ".ad-modal-header",
-  ".sponsored-modal",
-  ".promoted-modal",
-  ".ad-floating",
-  ".ad-sticky",
-  ".ad-fixed",
-  ".ad-slide",
-  ".ad-carousel",
-  ".ad-scroll",
-  ".ad-animate",
-  ".ad-rotate",
-  ".ad-expandable",
-  ".ad-interstitial",
-  ".ad-infeed",
-  ".ad-native",
-  ".ad-sponsored",
-  ".ad-promoted",
-  ".ad-clickable",
-  ".ad-popular",
-  ".ad-recommended",
-  ".ad-related",
-  ".ad-featured",
-  ".ad-highlight",
-  ".ad-trending",
-  ".ad-topbanner",
-  ".ad-bottombanner",
-  ".ad-leftbanner",
-  ".ad-rightbanner",
-  ".ad-inlinebanner",
-  ".ad-sidebarbanner",
-  ".ad-footerbanner",
-  ".ad-headerbanner",
-  ".ad-popupbanner",
-  ".ad-overlaybanner",
-  ".ad-topslot",
-  ".ad-bottomslot",
-  ".ad-leftslot",
-  ".ad-rightslot",
-  ".ad-inlineslot",
-  ".ad-sidebarslot",
-  ".ad-headerslot",
-  ".ad-footerslot",
-  ".ad-main",
-  ".ad-secondary",
-  ".ad-tertiary",
-  ".ad-mini",
-  ".ad-small",
-  ".ad-medium",
-  ".ad-large",
-  ".ad-extra",
-  ".ad-huge",
-  ".ad-super",
-  ".ad-ultimate",
-  ".ad-ultra",
-  ".ad-premium",
-  ".ad-elite",
-  ".ad-gold",
-  ".ad-silver",
-  ".ad-bronze",
-  ".ad-sponsored-top",
-  ".ad-sponsored-bottom",
-  ".ad-sponsored-left",
-  ".ad-sponsored-right"
-  ];
+  let removed = 0;
 
-  universalSelectors.forEach(sel => {
-    document.querySelectorAll(sel).forEach(el => {
-      // Prevent removal of protected playback containers
-      if (!el.closest("#movie_player, .video-ads, ytd-display-ad-renderer")) {
-        el.remove();
-      }
-    });
-  });
+  // Positioned overlays are swept once; afterwards only
+  // newly added ones are checked (see flushAddedNodes)
+  if (!overlaysScanned) {
+    overlaysScanned = true;
+    removed += removeOverlays(Array.from(document.querySelectorAll(OVERLAY_SELECTOR)));
+  }
 
-  
+  return removed;
+}
 
-  // Remove high z-index overlays and pop-up layers
-  document.querySelectorAll(
-    "div[style*='position: fixed'], div[style*='position: absolute']"
-  ).forEach(el => {
-    if (!el.closest("#movie_player, .ytp-ad-module")) {
-      const zIndex = window.getComputedStyle(el).zIndex;
-      if (zIndex && parseInt(zIndex) > 1000) {
-        el.remove();
-      }
+/**
+ * Adds root and its descendants that carry an inline
+ * fixed/absolute position to candidates.
+ */
+function collectOverlays(root, candidates) {
+  if (root.matches(OVERLAY_SELECTOR)) candidates.push(root);
+  root.querySelectorAll(OVERLAY_SELECTOR).forEach(el => candidates.push(el));
+}
+
+/**
+ * Removes high z-index overlays and pop-up layers.
+ *
+ * Inline z-index values are read first, which needs no
+ * style recalculation. The remaining candidates get one
+ * batch of computed-style reads, and every removal
+ * happens after all reads so reads and writes never
+ * interleave. Checked elements are remembered and never
+ * checked again.
+ */
+function removeOverlays(candidates) {
+  const overlays = [];
+  const needComputed = [];
+
+  candidates.forEach(el => {
+    if (checkedOverlays.has(el) || !el.isConnected) return;
+    checkedOverlays.add(el);
+    if (el.closest(OVERLAY_PROTECTED)) return;
+
+    const inlineZIndex = el.style.zIndex;
+    if (inlineZIndex) {
+      if (parseInt(inlineZIndex) > OVERLAY_MIN_Z_INDEX) overlays.push(el);
+    } else {
+      needComputed.push(el);
+    }
+  });
+
+  needComputed.forEach(el => {
+    if (parseInt(window.getComputedStyle(el).zIndex) > OVERLAY_MIN_Z_INDEX) {
+      overlays.push(el);
     }
   });
+
+  overlays.forEach(el => el.remove());
+  countRemoved("overlay", overlays.length);
+  return overlays.length;
 }
 
 /* -----------------------------
@@ -416,31 +924,56 @@ function chomperAdBlock() {
 ------------------------------*/
 
 /**
- * Initializes blocking state based on stored
- * enable/disable preference.
+ * Starts blocking at once: this script is only
+ * registered or injected while blocking is on, so no
+ * storage round trip is needed before hiding anything.
  */
-chrome.storage.local.get(["enabled"], res => {
-  const enabled = res.enabled !== undefined ? res.enabled : true;
-  
-  if (enabled) {
-    startBlocking();
-  } else {
-    stopBlocking();
-  }
+startBlocking();
+
+/**
+ * Confirms the stored enable/disable preference, in
+ * case it changed while the page was loading, and
+ * fetches the perf counter and trace switches and, if
+ * the registered CSS is missing, the site rules for
+ * this page in the same lookup.
+ */
+const siteKeys = hasRegisteredCss ? [] : siteRuleKeys(location.hostname);
+chrome.storage.local.get(["enabled", "statsEnabled", "traceEnabled", ...siteKeys], res => {
+  setTraceEnabled(res.traceEnabled === true);
+  if (!hasRegisteredCss) applySiteRules(res);
+  setPerfEnabled(res.statsEnabled === true);
+
+  if (res.enabled === false) stopBlocking();
 });
 
 /**
  * Reacts to runtime enable/disable changes
- * and performs a clean transition.
+ * and switches blocking in place, without
+ * reloading the page.
  */
 chrome.storage.onChanged.addListener(changes => {
+  if (changes.statsEnabled) setPerfEnabled(changes.statsEnabled.newValue === true);
+  if (changes.traceEnabled) setTraceEnabled(changes.traceEnabled.newValue === true);
   if (!changes.enabled) return;
 
   if (changes.enabled.newValue === true) {
-    location.reload();
+    startBlocking();
   } else {
     stopBlocking();
   }
 });
 
+/**
+ * Answers the background script's presence check,
+ * so it only injects into tabs that lack this script,
+ * and the popup's request for the trace.
+ */
+chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
+  if (message && message.type === "chomper:ping") {
+    sendResponse({ enabled: isBlockingEnabled });
+  } else if (message && message.type === "chomper:trace") {
+    sendResponse(trace ? exportTrace() : null);
+  }
+});
+
 //xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
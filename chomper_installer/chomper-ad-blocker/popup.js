@@ -1,10 +1,19 @@
 /**
  * Chomper Popup Controller
- * Controls the toggle button and synchronizes visual state
+ * Controls the toggle button and synchronizes visual state,
+ * shows the perf counters combined by the background,
+ * and switches trace mode and exports the active tab's trace
  */
 
 const btn = document.getElementById("toggleBtn");
 const statusText = document.getElementById("status");
+const statsPanel = document.getElementById("stats");
+const statsToggle = document.getElementById("statsToggle");
+const traceToggle = document.getElementById("traceToggle");
+const traceStatus = document.getElementById("traceStatus");
+
+// Rule groups listed as the costliest
+const COSTLIEST_SHOWN = 3;
 
 function updateButton(enabled) {
   if (enabled) {
@@ -30,22 +39,116 @@ btn.addEventListener("click", () => {
     const currentState = res.enabled !== undefined ? res.enabled : true;
     const newState = !currentState;
 
+    // Open tabs pick the change up from storage; no reload needed
     chrome.storage.local.set({ enabled: newState }, () => {
       updateButton(newState);
-
-      if (newState) {
-        chrome.tabs.query({}, (tabs) => {
-          tabs.forEach(tab => {
-            if (
-              tab.url &&
-              !tab.url.startsWith("chrome://") &&
-              !tab.url.startsWith("chrome-extension://")
-            ) {
-              chrome.tabs.reload(tab.id);
-            }
-          });
-        });
-      }
     });
   });
+});
+
+function renderStats(stats) {
+  stats = stats || { passes: {}, removed: {}, rules: {}, skipped: 0 };
+  const passes = Object.entries(stats.passes);
+  const removed = Object.values(stats.removed).reduce((sum, count) => sum + count, 0);
+  const totalTime = passes.reduce((sum, [, pass]) => sum + pass.total, 0);
+
+  document.getElementById("statSkipped").textContent = stats.skipped;
+  document.getElementById("statRemoved").textContent = removed;
+  document.getElementById("statPasses").textContent =
+    passes.reduce((sum, [, pass]) => sum + pass.count, 0);
+  document.getElementById("statTime").textContent = totalTime.toFixed(1) + " ms";
+
+  // Stall recoveries, whichever method ended them
+  const recoveries = Object.values(stats.recoveries || {});
+  const stalls = recoveries.reduce((sum, recovery) => sum + recovery.count, 0);
+  const latency = recoveries.reduce((sum, recovery) => sum + recovery.total, 0);
+  document.getElementById("statStalls").textContent = stalls;
+  document.getElementById("statRecovery").textContent =
+    (stalls ? latency / stalls : 0).toFixed(0) + " ms";
+
+  // Rule groups by matching time, named as in traces: <ruleset>[<group>]
+  const list = document.getElementById("statCostliest");
+  list.replaceChildren(...Object.entries(stats.rules || {})
+    .sort((a, b) => b[1].total - a[1].total)
+    .slice(0, COSTLIEST_SHOWN)
+    .map(([name, rule]) => {
+      const item = document.createElement("li");
+      item.textContent =
+        `${name} ${rule.first}: ${rule.total.toFixed(1)} ms, ` +
+        `${rule.matches} hidden`;
+      return item;
+    }));
+}
+
+function updateStatsToggle(enabled) {
+  statsToggle.checked = enabled;
+  statsPanel.classList.toggle("stats-off", !enabled);
+}
+
+chrome.storage.local.get(["stats", "statsEnabled"], (res) => {
+  renderStats(res.stats);
+  updateStatsToggle(res.statsEnabled === true);
+});
+
+// Totals are written in batches; refresh while the popup is open
+chrome.storage.onChanged.addListener((changes) => {
+  if (changes.stats) renderStats(changes.stats.newValue);
+});
+
+statsToggle.addEventListener("change", () => {
+  chrome.storage.local.set({ statsEnabled: statsToggle.checked });
+  updateStatsToggle(statsToggle.checked);
+});
+
+document.getElementById("statsReset").addEventListener("click", () => {
+  chrome.storage.local.remove("stats");
+});
+
+chrome.storage.local.get(["traceEnabled"], (res) => {
+  traceToggle.checked = res.traceEnabled === true;
+});
+
+traceToggle.addEventListener("change", () => {
+  chrome.storage.local.set({ traceEnabled: traceToggle.checked });
+  traceStatus.textContent = traceToggle.checked ? "Tracing open tabs" : "";
+});
+
+// The current page's trace, after the one its tab's previous page left behind
+async function collectTrace(tab) {
+  const key = "trace:" + tab.id; // See traceKey() in background.js
+  const [current, saved] = await Promise.all([
+    chrome.tabs.sendMessage(tab.id, { type: "chomper:trace" }).catch(() => null),
+    chrome.storage.session.get(key)
+  ]);
+  return [saved[key], current].filter(Boolean);
+}
+
+async function exportTrace() {
+  const [tab] = await chrome.tabs.query({ active: true, currentWindow: true });
+  const traces = tab ? await collectTrace(tab) : [];
+  if (!traces.length) {
+    traceStatus.textContent = "No trace for this tab";
+    return;
+  }
+
+  const trace = {
+    traceEvents: traces.flatMap(page => page.traceEvents),
+    displayTimeUnit: "ms",
+    otherData: { pages: traces.map(page => page.otherData) }
+  };
+  const hostname = new URL(tab.url).hostname || "page";
+  const url = URL.createObjectURL(new Blob([JSON.stringify(trace)], { type: "application/json" }));
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = `chomper-trace-${hostname}-${Date.now()}.json`;
+  link.click();
+  setTimeout(() => URL.revokeObjectURL(url), 1000);
+
+  traceStatus.textContent = `Exported ${trace.traceEvents.length} events`;
+}
+
+document.getElementById("traceExport").addEventListener("click", () => {
+  exportTrace().catch(() => {
+    traceStatus.textContent = "Export failed";
+  });
 });
\ No newline at end of file
@@ -0,0 +1,253 @@
+// Generated by rule_compiler.py from chomper_installer/rules - do not edit.
+const CHOMPER_RULES = {
+  "universal": {
+    "groups": [
+      ".ad-banner,.ad-container,.popup-ad,.overlay-ad,.sponsored-content,.ad-frame,.ad-slot,.ad-box,.ad-label,.sponsored-ad,.ad-marketing,.ad-wrapper,.promotional-ad,.ad-section,.ad-feature,.ad-display,.ad-unit,.ad-placeholder,.promoted-content,.sponsored-link,.ad-strip,.ad-panel,.popup-banner,.ad-modal,.ad-top,.ad-bottom,.ad-left,.ad-right,.ad-inline,.ad-sidebar,.ad-footer,.ad-header,.ad-middle,.ad-background,.ad-target,.ad-click,.ad-img,.ad-text,.ad-video,.ad-iframe,.ad-popout,.ad-expand,.ad-collapse,.ad-hover,.ad-hover-effect,.ad-banner-top,.ad-banner-bottom,.ad-banner-left,.ad-banner-right,.ad-banner-inline,.ad-banner-sidebar,.ad-banner-footer,.ad-banner-header,.ad-overlay-top,.ad-overlay-bottom,.ad-overlay-left,.ad-overlay-right,.ad-overlay-inline,.ad-overlay-sidebar,.ad-overlay-footer,.ad-overlay-header,.sponsored-top,.sponsored-bottom,.sponsored-left,.sponsored-right,.sponsored-inline,.sponsored-sidebar,.sponsored-footer,.sponsored-header,.promotional-top,.promotional-bottom,.promotional-left,.promotional-right,.promotional-inline,.promotional-sidebar,.promotional-footer,.promotional-header,.ad-feature-top,.ad-feature-bottom,.ad-feature-left,.ad-feature-right,.ad-feature-inline,.ad-feature-sidebar,.ad-feature-footer,.ad-feature-header,.ad-section-top,.ad-section-bottom,.ad-section-left,.ad-section-right,.ad-section-inline,.ad-section-sidebar,.ad-section-footer,.ad-section-header,.ad-box-top,.ad-box-bottom,.ad-box-left,.ad-box-right,.ad-box-inline,.ad-box-sidebar,.ad-box-footer,.ad-box-header,.ad-wrapper-top,.ad-wrapper-bottom,.ad-wrapper-left,.ad-wrapper-right,.ad-wrapper-inline,.ad-wrapper-sidebar,.ad-wrapper-footer,.ad-wrapper-header,.ad-unit-top,.ad-unit-bottom,.ad-unit-left,.ad-unit-right,.ad-unit-inline,.ad-unit-sidebar,.ad-unit-footer,.ad-unit-header,.ad-placeholder-top,.ad-placeholder-bottom,.ad-placeholder-left,.ad-placeholder-right,.ad-placeholder-inline,.ad-placeholder-sidebar,.ad-placeholder-footer,.ad-placeholder-header,.ad-marketing-top,.ad-marketing-bottom,.ad-marketing-left,.ad-marketing-right,.ad-marketing-inline,.ad-marketing-sidebar,.ad-marketing-footer,.ad-marketing-header,.ad-strip-top,.ad-strip-bottom,.ad-strip-left,.ad-strip-right,.ad-strip-inline,.ad-strip-sidebar,.ad-strip-footer,.ad-strip-header,.popup-ad-top,.popup-ad-bottom,.popup-ad-left,.popup-ad-right,.popup-ad-inline,.popup-ad-sidebar,.popup-ad-footer,.popup-ad-header,.popup-banner-top,.popup-banner-bottom,.popup-banner-left,.popup-banner-right,.popup-banner-inline,.popup-banner-sidebar,.popup-banner-footer,.popup-banner-header,.ad-modal-top,.ad-modal-bottom,.ad-modal-left,.ad-modal-right,.ad-modal-inline,.ad-modal-sidebar,.ad-modal-footer,.ad-modal-header,.sponsored-modal,.promoted-modal,.ad-floating,.ad-sticky,.ad-fixed,.ad-slide,.ad-carousel,.ad-scroll,.ad-animate,.ad-rotate,.ad-expandable,.ad-interstitial,.ad-infeed,.ad-native,.ad-sponsored,.ad-promoted,.ad-clickable,.ad-popular,.ad-recommended,.ad-related,.ad-featured,.ad-highlight,.ad-trending,.ad-topbanner,.ad-bottombanner,.ad-leftbanner,.ad-rightbanner,.ad-inlinebanner,.ad-sidebarbanner,.ad-footerbanner,.ad-headerbanner,.ad-popupbanner,.ad-overlaybanner,.ad-topslot,.ad-bottomslot,.ad-leftslot,.ad-rightslot,.ad-inlineslot,.ad-sidebarslot,.ad-headerslot,.ad-footerslot,.ad-main,.ad-secondary,.ad-tertiary,.ad-mini,.ad-small,.ad-medium,.ad-large,.ad-extra,.ad-huge,.ad-super,.ad-ultimate,.ad-ultra,.ad-premium,.ad-elite,.ad-gold,.ad-silver,.ad-bronze,.ad-sponsored-top,.ad-sponsored-bottom,.ad-sponsored-left,.ad-sponsored-right"
+    ],
+    "selectors": [
+      ".ad-banner",
+      ".ad-container",
+      ".popup-ad",
+      ".overlay-ad",
+      ".sponsored-content",
+      ".ad-frame",
+      ".ad-slot",
+      ".ad-box",
+      ".ad-label",
+      ".sponsored-ad",
+      ".ad-marketing",
+      ".ad-wrapper",
+      ".promotional-ad",
+      ".ad-section",
+      ".ad-feature",
+      ".ad-display",
+      ".ad-unit",
+      ".ad-placeholder",
+      ".promoted-content",
+      ".sponsored-link",
+      ".ad-strip",
+      ".ad-panel",
+      ".popup-banner",
+      ".ad-modal",
+      ".ad-top",
+      ".ad-bottom",
+      ".ad-left",
+      ".ad-right",
+      ".ad-inline",
+      ".ad-sidebar",
+      ".ad-footer",
+      ".ad-header",
+      ".ad-middle",
+      ".ad-background",
+      ".ad-target",
+      ".ad-click",
+      ".ad-img",
+      ".ad-text",
+      ".ad-video",
+      ".ad-iframe",
+      ".ad-popout",
+      ".ad-expand",
+      ".ad-collapse",
+      ".ad-hover",
+      ".ad-hover-effect",
+      ".ad-banner-top",
+      ".ad-banner-bottom",
+      ".ad-banner-left",
+      ".ad-banner-right",
+      ".ad-banner-inline",
+      ".ad-banner-sidebar",
+      ".ad-banner-footer",
+      ".ad-banner-header",
+      ".ad-overlay-top",
+      ".ad-overlay-bottom",
+      ".ad-overlay-left",
+      ".ad-overlay-right",
+      ".ad-overlay-inline",
+      ".ad-overlay-sidebar",
+      ".ad-overlay-footer",
+      ".ad-overlay-header",
+      ".sponsored-top",
+      ".sponsored-bottom",
+      ".sponsored-left",
+      ".sponsored-right",
+      ".sponsored-inline",
+      ".sponsored-sidebar",
+      ".sponsored-footer",
+      ".sponsored-header",
+      ".promotional-top",
+      ".promotional-bottom",
+      ".promotional-left",
+      ".promotional-right",
+      ".promotional-inline",
+      ".promotional-sidebar",
+      ".promotional-footer",
+      ".promotional-header",
+      ".ad-feature-top",
+      ".ad-feature-bottom",
+      ".ad-feature-left",
+      ".ad-feature-right",
+      ".ad-feature-inline",
+      ".ad-feature-sidebar",
+      ".ad-feature-footer",
+      ".ad-feature-header",
+      ".ad-section-top",
+      ".ad-section-bottom",
+      ".ad-section-left",
+      ".ad-section-right",
+      ".ad-section-inline",
+      ".ad-section-sidebar",
+      ".ad-section-footer",
+      ".ad-section-header",
+      ".ad-box-top",
+      ".ad-box-bottom",
+      ".ad-box-left",
+      ".ad-box-right",
+      ".ad-box-inline",
+      ".ad-box-sidebar",
+      ".ad-box-footer",
+      ".ad-box-header",
+      ".ad-wrapper-top",
+      ".ad-wrapper-bottom",
+      ".ad-wrapper-left",
+      ".ad-wrapper-right",
+      ".ad-wrapper-inline",
+      ".ad-wrapper-sidebar",
+      ".ad-wrapper-footer",
+      ".ad-wrapper-header",
+      ".ad-unit-top",
+      ".ad-unit-bottom",
+      ".ad-unit-left",
+      ".ad-unit-right",
+      ".ad-unit-inline",
+      ".ad-unit-sidebar",
+      ".ad-unit-footer",
+      ".ad-unit-header",
+      ".ad-placeholder-top",
+      ".ad-placeholder-bottom",
+      ".ad-placeholder-left",
+      ".ad-placeholder-right",
+      ".ad-placeholder-inline",
+      ".ad-placeholder-sidebar",
+      ".ad-placeholder-footer",
+      ".ad-placeholder-header",
+      ".ad-marketing-top",
+      ".ad-marketing-bottom",
+      ".ad-marketing-left",
+      ".ad-marketing-right",
+      ".ad-marketing-inline",
+      ".ad-marketing-sidebar",
+      ".ad-marketing-footer",
+      ".ad-marketing-header",
+      ".ad-strip-top",
+      ".ad-strip-bottom",
+      ".ad-strip-left",
+      ".ad-strip-right",
+      ".ad-strip-inline",
+      ".ad-strip-sidebar",
+      ".ad-strip-footer",
+      ".ad-strip-header",
+      ".popup-ad-top",
+      ".popup-ad-bottom",
+      ".popup-ad-left",
+      ".popup-ad-right",
+      ".popup-ad-inline",
+      ".popup-ad-sidebar",
+      ".popup-ad-footer",
+      ".popup-ad-header",
+      ".popup-banner-top",
+      ".popup-banner-bottom",
+      ".popup-banner-left",
+      ".popup-banner-right",
+      ".popup-banner-inline",
+      ".popup-banner-sidebar",
+      ".popup-banner-footer",
+      ".popup-banner-header",
+      ".ad-modal-top",
+      ".ad-modal-bottom",
+      ".ad-modal-left",
+      ".ad-modal-right",
+      ".ad-modal-inline",
+      ".ad-modal-sidebar",
+      ".ad-modal-footer",
+      ".ad-modal-header",
+      ".sponsored-modal",
+      ".promoted-modal",
+      ".ad-floating",
+      ".ad-sticky",
+      ".ad-fixed",
+      ".ad-slide",
+      ".ad-carousel",
+      ".ad-scroll",
+      ".ad-animate",
+      ".ad-rotate",
+      ".ad-expandable",
+      ".ad-interstitial",
+      ".ad-infeed",
+      ".ad-native",
+      ".ad-sponsored",
+      ".ad-promoted",
+      ".ad-clickable",
+      ".ad-popular",
+      ".ad-recommended",
+      ".ad-related",
+      ".ad-featured",
+      ".ad-highlight",
+      ".ad-trending",
+      ".ad-topbanner",
+      ".ad-bottombanner",
+      ".ad-leftbanner",
+      ".ad-rightbanner",
+      ".ad-inlinebanner",
+      ".ad-sidebarbanner",
+      ".ad-footerbanner",
+      ".ad-headerbanner",
+      ".ad-popupbanner",
+      ".ad-overlaybanner",
+      ".ad-topslot",
+      ".ad-bottomslot",
+      ".ad-leftslot",
+      ".ad-rightslot",
+      ".ad-inlineslot",
+      ".ad-sidebarslot",
+      ".ad-headerslot",
+      ".ad-footerslot",
+      ".ad-main",
+      ".ad-secondary",
+      ".ad-tertiary",
+      ".ad-mini",
+      ".ad-small",
+      ".ad-medium",
+      ".ad-large",
+      ".ad-extra",
+      ".ad-huge",
+      ".ad-super",
+      ".ad-ultimate",
+      ".ad-ultra",
+      ".ad-premium",
+      ".ad-elite",
+      ".ad-gold",
+      ".ad-silver",
+      ".ad-bronze",
+      ".ad-sponsored-top",
+      ".ad-sponsored-bottom",
+      ".ad-sponsored-left",
+      ".ad-sponsored-right"
+    ]
+  },
+  "youtube": {
+    "groups": [],
+    "selectors": []
+  }
+};
+const CHOMPER_CSS = {
+  "offAttribute": "data-chomper-off",
+  "protected": [
+    "#movie_player",
+    ".video-ads",
+    "ytd-display-ad-renderer"
+  ],
+  "sentinel": "--chomper-hide-css",
+  "unguarded": [
+    "youtube"
+  ]
+};
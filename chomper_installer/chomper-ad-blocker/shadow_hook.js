@@ -0,0 +1,60 @@
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
+/**
+ * Chomper Ad Blocker – Shadow Root Hook
+ *
+ * Runs in the page's own world at document_start, in
+ * every frame. Element.prototype.attachShadow is wrapped
+ * so each new shadow root is announced to content.js:
+ * mutation observers never report a root being
+ * attached, and closed roots are invisible to
+ * element.shadowRoot. The page sees the same return
+ * value and exceptions as before.
+ *
+ * The announcement is a non-bubbling event on the host
+ * whose name is random for every document. content.js
+ * catches it in the capture phase. The two scripts
+ * exchange the name through an attribute on the root
+ * element before any page script runs (see
+ * shadowChannel() in content.js), so a page can neither
+ * listen for the event nor fake it. Hosts that are not
+ * in the document yet are not announced; content.js
+ * finds their roots when they are inserted.
+ */
+
+(() => {
+  const CHANNEL_ATTRIBUTE = "data-chomper-channel";
+  const attachShadow = Element.prototype.attachShadow;
+  // Kept from before any page script can replace them
+  const dispatchEvent = EventTarget.prototype.dispatchEvent;
+  const isConnected = Object.getOwnPropertyDescriptor(Node.prototype, "isConnected").get;
+  const PageEvent = Event;
+
+  const root = document.documentElement;
+  if (!attachShadow || !root) return;
+
+  // content.js may have run first and left its name; otherwise leave ours
+  let eventName = root.getAttribute(CHANNEL_ATTRIBUTE);
+  if (eventName) {
+    root.removeAttribute(CHANNEL_ATTRIBUTE);
+  } else {
+    eventName = Array.from(crypto.getRandomValues(new Uint32Array(4)), n => n.toString(36)).join("");
+    root.setAttribute(CHANNEL_ATTRIBUTE, eventName);
+  }
+
+  /**
+   * Attaches the shadow root as usual, then tells the
+   * content script which host now has one.
+   */
+  function chomperAttachShadow(init) {
+    const shadowRoot = attachShadow.call(this, init);
+    if (isConnected.call(this)) {
+      dispatchEvent.call(this, new PageEvent(eventName, { composed: true }));
+    }
+    return shadowRoot;
+  }
+
+  Object.defineProperty(chomperAttachShadow, "name", { value: "attachShadow" });
+  Element.prototype.attachShadow = chomperAttachShadow;
+})();
+
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
@@ -0,0 +1,360 @@
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
+
+/**
+ * Chomper Ad Blocker – Video Ad Module
+ *
+ * Skips video ads and recovers from playback stalls.
+ * The background script injects this file after
+ * content.js, and only on hosts that serve video ads,
+ * so other sites never load or run it.
+ *
+ * The player container is looked up once and only its
+ * class attribute (the ad-showing state) and its ad
+ * overlay subtree are observed, so normal playback and
+ * page updates cost no callbacks here. The player is
+ * looked up again after single-page navigations.
+ *
+ * Stalls are detected from the video's waiting event
+ * (or stalled, while it lacks data to play on) rather
+ * than by polling. Cheap recoveries (a seek nudge or
+ * gap jump, then play()) are tried before the page is
+ * reloaded. A step is only taken while the position
+ * has not moved and the video lacks the data to play
+ * on; the stall ends as soon as playback moves again.
+ */
+
+let reloaded = false;
+let stall = null; // { video, since, position, step, timer, nudging } while playback is stuck
+const watchedVideos = new WeakSet(); // Videos with ad-skip listeners attached
+let player = null; // Player container being observed
+let playerObserver = null;
+let observedAdModule = null;
+
+const SKIP_BUTTON_SELECTOR = ".ytp-ad-skip-button, .ytp-ad-skip-button-modern";
+const PLAYER_ID = "movie_player";
+const AD_SHOWING_CLASS = "ad-showing";
+const AD_MODULE_SELECTOR = ".ytp-ad-module";
+const NAVIGATE_EVENT = "yt-navigate-finish"; // Fired by YouTube after SPA navigations
+
+// Playback health timings (ms)
+const STALL_GRACE = 2000;          // A stall may resolve itself for this long
+const SEEK_STALL_GRACE = 4000;     // ...or this long while the user is seeking
+const RECOVERY_STEP_DELAY = 1500;  // Time each recovery gets to restart playback
+
+// Recoveries, cheapest first; "self" means playback resumed on its own
+const RECOVERY_STEPS = ["nudge", "play", "reload"];
+const NUDGE_SECONDS = 0.1;
+const MAX_GAP_JUMP = 1.5; // Buffered gaps up to this many seconds are jumped over
+
+/* -----------------------------
+   Core ad handling
+------------------------------*/
+
+/**
+ * Attempts to fast-forward short promotional video segments
+ * and activates any visible skip controls when available.
+ */
+function skipAds(video = playerScope().querySelector("video")) {
+  if (!isBlockingEnabled) return;
+  
+  if (!video) return;
+
+  // Skip short promotional video segments
+  if (video.duration && video.duration < 70 && !video.ended) {
+    video.currentTime = video.duration;
+    countSkipped("seek");
+  }
+
+  // Click skip control if present
+  const skipBtn = playerScope().querySelector(SKIP_BUTTON_SELECTOR);
+  if (skipBtn) {
+    skipBtn.click();
+    countSkipped("button");
+  }
+}
+
+/* -----------------------------
+   Playback health
+------------------------------*/
+
+/**
+ * Returns where playback could continue from: the
+ * seconds buffered ahead of the current position and
+ * the start of the next buffered range after a gap.
+ */
+function bufferState(video) {
+  const { buffered, currentTime } = video;
+  let ahead = 0;
+  let nextStart = null;
+
+  for (let i = 0; i < buffered.length; i++) {
+    const start = buffered.start(i);
+    const end = buffered.end(i);
+    if (start <= currentTime && currentTime < end) ahead = end - currentTime;
+    else if (start > currentTime && nextStart === null) nextStart = start;
+  }
+  return { ahead, nextStart };
+}
+
+/**
+ * Starts tracking a stall when a playing video runs
+ * out of data. Recovery begins only if it lasts past the
+ * grace period.
+ */
+function handleStall(video) {
+  if (!isBlockingEnabled || video.paused || stall) return;
+
+  stall = { video, since: performance.now(), position: video.currentTime, step: 0, timer: null, nudging: false };
+  scheduleRecovery(video.seeking ? SEEK_STALL_GRACE : STALL_GRACE);
+}
+
+/**
+ * Gives a user seek during a stall the longer grace
+ * period; seeks made by the nudge recovery are ignored.
+ */
+function handleSeeking(video) {
+  if (!stall || stall.video !== video) return;
+  if (stall.nudging) {
+    stall.nudging = false;
+    return;
+  }
+  scheduleRecovery(SEEK_STALL_GRACE);
+}
+
+/**
+ * Reports whether a stalled video is moving again: its
+ * position changed since the stall (or the last step)
+ * or it has buffered enough to play on.
+ */
+function playbackMoved(video) {
+  return video.currentTime !== stall.position || video.readyState >= HTMLMediaElement.HAVE_FUTURE_DATA;
+}
+
+/**
+ * Ends a stall as soon as the position advances, even
+ * if the browser never fires "playing".
+ */
+function handleTimeUpdate(video) {
+  if (!stall || stall.video !== video || video.currentTime === stall.position) return;
+  handlePlaying(video);
+}
+
+/**
+ * Ends a stall once playback resumes and records how
+ * long it took and which recovery (if any) worked.
+ */
+function handlePlaying(video) {
+  if (!stall || stall.video !== video) return;
+
+  const method = stall.step === 0 ? "self" : RECOVERY_STEPS[stall.step - 1];
+  countRecovery(method, performance.now() - stall.since);
+  clearStall();
+}
+
+/**
+ * (Re)arms the timer for the next recovery attempt.
+ * Nothing is scheduled while the tab is hidden.
+ */
+function scheduleRecovery(delay) {
+  clearTimeout(stall.timer);
+  stall.timer = document.hidden ? null : setTimeout(() => timed("recovery", attemptRecovery), delay);
+}
+
+/**
+ * Forgets the current stall.
+ */
+function clearStall() {
+  if (stall) clearTimeout(stall.timer);
+  stall = null;
+}
+
+/**
+ * Tries the next recovery step that applies and gives
+ * it RECOVERY_STEP_DELAY to restart playback, unless
+ * playback moved in the meantime. The page is reloaded
+ * at most once, as a last resort.
+ */
+function attemptRecovery() {
+  if (!stall || !isBlockingEnabled) return;
+
+  const { video } = stall;
+  if (!video.isConnected || video.paused) {
+    clearStall();
+    return;
+  }
+  if (playbackMoved(video)) {
+    handlePlaying(video);
+    return;
+  }
+
+  switch (RECOVERY_STEPS[stall.step++]) {
+    case "nudge": {
+      // Jump a small buffered gap, or step just past a stuck frame
+      const { ahead, nextStart } = bufferState(video);
+      stall.nudging = true;
+      if (ahead < NUDGE_SECONDS && nextStart !== null && nextStart - video.currentTime <= MAX_GAP_JUMP) {
+        video.currentTime = nextStart;
+      } else {
+        video.currentTime += NUDGE_SECONDS;
+      }
+      stall.position = video.currentTime;
+      break;
+    }
+    case "play":
+      video.play().catch(() => {});
+      break;
+    case "reload":
+      if (!reloaded) {
+        reloaded = true;
+        traceEvent("page", "reload", performance.now());
+        location.reload();
+      }
+      clearStall();
+      return;
+    default:
+      clearStall();
+      return;
+  }
+
+  scheduleRecovery(RECOVERY_STEP_DELAY);
+}
+
+/* -----------------------------
+   Player tracking
+------------------------------*/
+
+/**
+ * Returns the observed player, or the document when
+ * the page has no known player container.
+ */
+function playerScope() {
+  return player || document;
+}
+
+/**
+ * Finds the player container and starts observing it.
+ * Does nothing if the observed player is still current.
+ * Returns whether a player is attached.
+ */
+function attachPlayer() {
+  const found = document.getElementById(PLAYER_ID);
+  if (found && found === player) return true;
+
+  detachPlayer();
+  if (!found) return false;
+
+  player = found;
+  playerObserver = new MutationObserver(mutations =>
+    timed("playerMutation", handlePlayerMutations, mutations));
+  playerObserver.observe(player, { attributes: true, attributeFilter: ["class"] });
+  observeAdModule();
+
+  watchVideos();
+  if (player.classList.contains(AD_SHOWING_CLASS)) skipAds();
+  return true;
+}
+
+/**
+ * Stops observing the current player.
+ */
+function detachPlayer() {
+  if (playerObserver) playerObserver.disconnect();
+  playerObserver = null;
+  player = null;
+  observedAdModule = null;
+}
+
+/**
+ * Adds the player's ad overlay subtree, where skip
+ * controls appear, to the observed targets once it
+ * exists.
+ */
+function observeAdModule() {
+  const adModule = player.querySelector(AD_MODULE_SELECTOR);
+  if (!adModule || adModule === observedAdModule) return;
+
+  observedAdModule = adModule;
+  playerObserver.observe(adModule, { childList: true, subtree: true });
+}
+
+/**
+ * Reacts to the player's ad state or ad overlay
+ * changing.
+ */
+function handlePlayerMutations(mutations) {
+  observeAdModule();
+
+  const adOverlayChanged = mutations.some(mutation => mutation.type === "childList");
+  if (adOverlayChanged || player.classList.contains(AD_SHOWING_CLASS)) {
+    watchVideos();
+    skipAds();
+  }
+}
+
+/**
+ * Looks the player up again once a single-page
+ * navigation or a content update may have replaced it.
+ */
+function handleNavigation() {
+  if (!player || !player.isConnected) attachPlayer();
+}
+
+/**
+ * Attaches event-driven ad skipping and the playback
+ * health listeners to every video element in the
+ * player that does not have them yet.
+ */
+function watchVideos() {
+  for (const video of playerScope().getElementsByTagName("video")) {
+    if (watchedVideos.has(video)) continue;
+    watchedVideos.add(video);
+
+    const onPlaybackEvent = () => timed("skipAds", skipAds, video);
+    video.addEventListener("durationchange", onPlaybackEvent);
+    video.addEventListener("playing", onPlaybackEvent);
+
+    video.addEventListener("waiting", () => handleStall(video));
+    // "stalled" also fires while a healthy buffer is merely not growing
+    video.addEventListener("stalled", () => {
+      if (video.readyState < HTMLMediaElement.HAVE_FUTURE_DATA) handleStall(video);
+    });
+    video.addEventListener("seeking", () => handleSeeking(video));
+    video.addEventListener("playing", () => handlePlaying(video));
+    video.addEventListener("timeupdate", () => handleTimeUpdate(video));
+  }
+}
+
+/* -----------------------------
+   Lifecycle hooks
+------------------------------*/
+
+registerModule({
+  start() {
+    reloaded = false;
+    document.addEventListener(NAVIGATE_EVENT, handleNavigation);
+    attachPlayer();
+  },
+  stop() {
+    document.removeEventListener(NAVIGATE_EVENT, handleNavigation);
+    detachPlayer();
+    clearStall();
+  },
+  sweep() {
+    // With a player attached, its observer drives skipping
+    if (attachPlayer()) return;
+    watchVideos();
+    timed("skipAds", skipAds);
+  },
+  nodesAdded: handleNavigation,
+  hidden() {
+    if (stall) {
+      clearTimeout(stall.timer);
+      stall.timer = null;
+    }
+  },
+  visible() {
+    if (stall) scheduleRecovery(STALL_GRACE);
+  }
+});
+
+//xxxxxxxxxxxxChompxxxxxxxxxxxxChompxxxxxxxxxxxx//
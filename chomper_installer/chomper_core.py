@@ -0,0 +1,344 @@
+"""
+Chomper Ad Blocker Installer - Core
+File copying, verification and browser detection shared by the GUI and the
+command-line installer. This module must not import any GUI toolkit.
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+import json
+import hashlib
+
+from browser_discovery import BROWSERS, default_discovery
+
+# ----------------------
+# Configuration
+# ----------------------
+EXTENSION_NAME = "chomper-ad-blocker"
+
+def default_install_path():
+    """Return the per-user install folder (Documents/chomper-ad-blocker)."""
+    home = os.environ.get("USERPROFILE") or os.path.expanduser("~")
+    return os.path.join(home, "Documents", EXTENSION_NAME)
+
+INSTALL_PATH = default_install_path()
+INSTALL_MANIFEST = ".chomper-install.json"
+
+def detect_browsers():
+    """Detect installed Chromium-based browsers."""
+    return default_discovery.detected()
+
+def find_browser_path(name):
+    """Return the executable for a browser in BROWSERS, or None if not installed."""
+    return default_discovery.resolve(name)
+
+def resolve_browser_name(value):
+    """Match a browser given as its display name or short key (e.g. "edge")."""
+    wanted = value.strip().lower()
+    for name, info in BROWSERS.items():
+        if wanted in (name.lower(), info["icon"]):
+            return name
+    return None
+
+def launch_browser(name, url):
+    """Open url in a new tab of the named browser; returns False if it is not installed."""
+    path = find_browser_path(name)
+    if not path:
+        return False
+    subprocess.Popen([path, "--new-tab", url])
+    return True
+
+# ----------------------
+# Installation
+# ----------------------
+class InstallCancelled(Exception):
+    """Raised when an installation is cancelled before it finishes."""
+
+class DestinationNotEmpty(Exception):
+    """Raised when the install folder holds files no Chomper install put there."""
+
+class UnsafePath(OSError):
+    """Raised when a path to be written goes through a symlink."""
+
+def check_no_symlinks(base, path):
+    """
+    Raise UnsafePath if path, or any folder between base and path, is a
+    symlink. base itself is trusted.
+    """
+    rel_path = os.path.relpath(path, base)
+    if rel_path == os.curdir:
+        return
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+        raise UnsafePath(f"{path} is outside {base}")
+    current = base
+    for part in rel_path.split(os.sep):
+        current = os.path.join(current, part)
+        if os.path.islink(current):
+            raise UnsafePath(f"{current} is a symlink")
+
+def open_new_file(path, mode="w", **kwargs):
+    """
+    Open path for writing as a new file. A leftover file or symlink of that
+    name is removed first and never written through.
+    """
+    if os.path.lexists(path):
+        os.remove(path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    return open(os.open(path, flags, 0o644), mode, **kwargs)
+
+def copy_new_file(src, dest):
+    """Copy src's content and metadata to dest, opened with open_new_file."""
+    with open(src, "rb") as fsrc, open_new_file(dest, "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    shutil.copystat(src, dest, follow_symlinks=False)
+
+def find_extension_source():
+    """
+    Locate the extension folder to install.
+
+    From a source checkout this is the output of build_extension.py, rebuilt
+    when the sources changed; PyInstaller builds ship the built folder.
+    """
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    extension_src_dir = os.path.join(base_dir, EXTENSION_NAME)
+
+    if getattr(sys, 'frozen', False):
+        extension_src_dir = os.path.join(os.path.dirname(sys.executable), EXTENSION_NAME)
+        if not os.path.exists(extension_src_dir):
+            extension_src_dir = os.path.join(sys._MEIPASS, EXTENSION_NAME)
+    elif os.path.exists(extension_src_dir):
+        import build_extension
+        extension_src_dir = build_extension.ensure_built(extension_src_dir)
+
+    if not os.path.exists(extension_src_dir):
+        raise FileNotFoundError(f"Extension folder not found: {extension_src_dir}")
+    return extension_src_dir
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_install_manifest(dest):
+    """Read the install manifest from a previous run, or {} if there is none."""
+    try:
+        with open(os.path.join(dest, INSTALL_MANIFEST), encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+def save_install_manifest(dest, files):
+    """Atomically write the install manifest."""
+    path = os.path.join(dest, INSTALL_MANIFEST)
+    tmp_path = path + ".tmp"
+    with open_new_file(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def extension_name(folder):
+    """The "name" in an extension folder's manifest.json, or None."""
+    try:
+        with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f).get("name")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def check_install_dest(dest, src):
+    """
+    Raise DestinationNotEmpty unless dest is missing, empty, an earlier
+    install with a manifest, or a copy of the same extension made before
+    installs kept a manifest. Anything else is someone's folder.
+    """
+    if not os.path.isdir(dest) or not os.listdir(dest):
+        return
+    if os.path.isfile(os.path.join(dest, INSTALL_MANIFEST)):
+        return
+    name = extension_name(dest)
+    if name is not None and name == extension_name(src):
+        return
+    raise DestinationNotEmpty(f"{dest} is not empty and holds no Chomper installation")
+
+def atomic_copy(src, dest):
+    """Copy src over dest through a temporary file and os.replace."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = dest + ".chomper-tmp"
+    try:
+        copy_new_file(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def atomic_link(src, dest):
+    """
+    Hard-link src at dest through a temporary name and os.replace, copying
+    instead where the filesystem cannot link. Returns True if linked.
+    """
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = dest + ".chomper-tmp"
+    try:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(src, tmp_path)
+            linked = True
+        except OSError:
+            copy_new_file(src, tmp_path)
+            linked = False
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return linked
+
+def remove_installed_file(dest, rel_path):
+    """
+    Remove one file listed in dest's install manifest, then any folders it
+    leaves empty up to dest. Entries that would leave dest, or that now go
+    through a symlink, are left alone. Returns True if a file was removed.
+    """
+    parts = rel_path.split("/")
+    if os.path.isabs(rel_path) or any(part in ("", ".", "..") for part in parts):
+        return False
+    path = dest
+    for part in parts[:-1]:
+        path = os.path.join(path, part)
+        if os.path.islink(path) or not os.path.isdir(path):
+            return False
+    path = os.path.join(path, parts[-1])
+    if not os.path.isfile(path) or os.path.islink(path):
+        return False
+
+    os.remove(path)
+    parent = os.path.dirname(path)
+    while os.path.normcase(parent) != os.path.normcase(dest) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+    return True
+
+def copy_extension_tree(src, dest, progress=None, cancel_event=None, link=False):
+    """
+    Bring dest up to date with the extension folder at src.
+
+    Each installed file is recorded in INSTALL_MANIFEST with its source size,
+    mtime and SHA-256. Files whose size and mtime still match are skipped
+    without being read, files whose content changed are replaced atomically,
+    and files that an earlier run recorded but src no longer ships are
+    removed. Nothing else in dest is ever deleted, so a folder without a
+    manifest keeps all of its files. The extension stays loadable
+    throughout because dest is never deleted as a whole. A file is never
+    written through a symlinked folder inside dest (UnsafePath), and
+    temporary files are created fresh rather than written through
+    whatever already has their name.
+
+    progress is called as progress(done, total, relative_path) after each
+    file; setting cancel_event aborts the sync with InstallCancelled. With
+    link=True files are hard-linked to src where possible, so many installs
+    can share one source tree. Returns a dict of counters: copied, linked
+    (the copied files that are hard links), skipped, removed, bytes_copied,
+    bytes_hashed (source bytes read to compare content) and bytes_read (all
+    source bytes read, hashing and copying together). An unchanged install
+    reads nothing.
+    """
+    files = []
+    for dirpath, _, filenames in os.walk(src):
+        for filename in filenames:
+            files.append(os.path.relpath(os.path.join(dirpath, filename), src).replace(os.sep, "/"))
+    # src may itself be an install, e.g. a shared tree
+    files = sorted(rel_path for rel_path in files if rel_path != INSTALL_MANIFEST)
+
+    os.makedirs(dest, exist_ok=True)
+    previous = load_install_manifest(dest)
+    current = {}
+    stats = {"copied": 0, "linked": 0, "skipped": 0, "removed": 0,
+             "bytes_copied": 0, "bytes_hashed": 0, "bytes_read": 0}
+
+    try:
+        for done, rel_path in enumerate(files, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise InstallCancelled("Installation cancelled")
+
+            src_path = os.path.join(src, rel_path)
+            dest_path = os.path.join(dest, rel_path)
+            st = os.stat(src_path)
+            entry = previous.get(rel_path)
+            installed = os.path.exists(dest_path)
+
+            if (entry and installed and entry["size"] == st.st_size
+                    and entry["mtime"] == st.st_mtime_ns
+                    and os.path.getsize(dest_path) == st.st_size):
+                current[rel_path] = entry
+                stats["skipped"] += 1
+            else:
+                sha256 = file_digest(src_path)
+                stats["bytes_hashed"] += st.st_size
+                stats["bytes_read"] += st.st_size
+                if not (entry and installed and entry["sha256"] == sha256):
+                    check_no_symlinks(dest, os.path.dirname(dest_path))
+                    if link and atomic_link(src_path, dest_path):
+                        stats["linked"] += 1
+                    else:
+                        if not link:
+                            atomic_copy(src_path, dest_path)
+                        stats["bytes_copied"] += st.st_size
+                        stats["bytes_read"] += st.st_size
+                    stats["copied"] += 1
+                else:
+                    stats["skipped"] += 1
+                current[rel_path] = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": sha256}
+
+            if progress:
+                progress(done, len(files), rel_path)
+
+        # Remove the files an earlier run installed that the source no longer ships
+        for rel_path in sorted(set(previous) - set(files)):
+            if remove_installed_file(dest, rel_path):
+                stats["removed"] += 1
+    finally:
+        # Keep entries for files that were not reached so a cancelled run
+        # does not force them to be re-hashed next time, and for stale
+        # files still on disk so a later run can remove them.
+        for rel_path, entry in previous.items():
+            if rel_path in current:
+                continue
+            if rel_path in files or os.path.lexists(os.path.join(dest, *rel_path.split("/"))):
+                current[rel_path] = entry
+        save_install_manifest(dest, current)
+
+    verify_installation(dest)
+    return stats
+
+def run_install_worker(messages, cancel_event, dest=INSTALL_PATH, source=None):
+    """
+    Body of the GUI's install thread. Syncs the extension (source, or the
+    one find_extension_source() locates) into dest and reports only through
+    the messages queue, as ("progress", done, total, path), ("done", stats),
+    ("cancelled",) or ("error", text), so the UI thread can poll it from
+    its event loop.
+    """
+    try:
+        source = source or find_extension_source()
+        check_install_dest(dest, source)
+        stats = copy_extension_tree(
+            source,
+            dest,
+            progress=lambda done, total, path: messages.put(("progress", done, total, path)),
+            cancel_event=cancel_event
+        )
+        messages.put(("done", stats))
+    except InstallCancelled:
+        messages.put(("cancelled",))
+    except Exception as e:
+        messages.put(("error", str(e)))
+
+def verify_installation(dest):
+    """Raise if dest does not contain a loadable extension."""
+    if not os.path.exists(os.path.join(dest, 'manifest.json')):
+        raise Exception("Files not copied properly")
@@ -0,0 +1,307 @@
+"""
+Chomper Ad Blocker - Network Rule Compiler
+Compiles Adblock Plus-style network filters in network_rules/ into
+Manifest V3 declarativeNetRequest static rulesets, so ad requests are
+blocked before they are downloaded instead of being removed afterwards.
+
+Filters that differ only in their domain ("||example.com^") are merged
+into a single rule with a requestDomains list, exact duplicates are
+dropped, and the result is split into rulesets that stay within Chrome's
+static rule limits. The extension manifest's rule_resources are rewritten
+to match.
+
+Usage:
+    python dnr_compiler.py [--rules-dir network_rules] [--max-rules 5000] [--report report.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from rule_compiler import RuleError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NETWORK_RULES_DIR = os.path.join(BASE_DIR, "network_rules")
+EXTENSION_DIR = os.path.join(BASE_DIR, "chomper-ad-blocker")
+RULESETS_DIRNAME = "rulesets"
+
+# Chrome's declarativeNetRequest limits
+GUARANTEED_STATIC_RULES = 30000
+MAX_REGEX_RULES = 1000
+MAX_ENABLED_RULESETS = 50
+DEFAULT_RULES_PER_RULESET = 5000
+
+BLOCK_PRIORITY = 1
+ALLOW_PRIORITY = 2
+
+# ABP request type options and their declarativeNetRequest resource types
+RESOURCE_TYPES = {
+    "document": "main_frame",
+    "subdocument": "sub_frame",
+    "stylesheet": "stylesheet",
+    "script": "script",
+    "image": "image",
+    "font": "font",
+    "object": "object",
+    "xmlhttprequest": "xmlhttprequest",
+    "ping": "ping",
+    "media": "media",
+    "websocket": "websocket",
+    "other": "other",
+}
+
+DOMAIN_FILTER_RE = re.compile(r"^\|\|([a-z0-9.-]+)\^$")
+
+
+def is_cosmetic(line):
+    """Report whether a filter line is an element-hiding rule."""
+    return "##" in line or "#@#" in line or "#?#" in line or "#$#" in line
+
+
+def parse_options(text):
+    """Translate a filter's $options into condition fields, or None if unsupported."""
+    condition = {}
+    included, excluded = [], []
+
+    for option in text.split(","):
+        option = option.strip().lower()
+        negated = option.startswith("~")
+        name = option.lstrip("~")
+
+        if name in RESOURCE_TYPES:
+            (excluded if negated else included).append(RESOURCE_TYPES[name])
+        elif name in ("third-party", "3p"):
+            condition["domainType"] = "firstParty" if negated else "thirdParty"
+        elif name in ("first-party", "1p"):
+            condition["domainType"] = "thirdParty" if negated else "firstParty"
+        elif name == "match-case" and not negated:
+            condition["isUrlFilterCaseSensitive"] = True
+        elif name.startswith("domain="):
+            domains = name[len("domain="):].split("|")
+            initiators = [d for d in domains if d and not d.startswith("~")]
+            exclusions = [d[1:] for d in domains if d.startswith("~")]
+            if initiators:
+                condition["initiatorDomains"] = sorted(set(initiators))
+            if exclusions:
+                condition["excludedInitiatorDomains"] = sorted(set(exclusions))
+        else:
+            # popup, csp, redirect, ... have no static equivalent
+            return None
+
+    if included:
+        condition["resourceTypes"] = sorted(set(included))
+    elif excluded:
+        condition["excludedResourceTypes"] = sorted(set(excluded))
+    return condition
+
+
+def parse_network_filter(line):
+    """
+    Parse one network filter line into {"action", "pattern", "condition"}.
+
+    Returns None for comments, cosmetic rules and filters that cannot be
+    expressed as a static declarativeNetRequest rule.
+    """
+    line = line.strip()
+    if not line or line.startswith("!") or line.startswith("[") or is_cosmetic(line):
+        return None
+
+    action = "block"
+    if line.startswith("@@"):
+        action = "allow"
+        line = line[2:]
+
+    condition = {}
+    if line.startswith("/") and line.endswith("/") and len(line) > 2:
+        condition["regexFilter"] = line[1:-1]
+    else:
+        if "$" in line:
+            line, options = line.rsplit("$", 1)
+            parsed = parse_options(options)
+            if parsed is None:
+                return None
+            condition.update(parsed)
+        if not line or line in ("*", "|", "||"):
+            # A bare options filter would block whole request classes
+            return None
+        if not line.isascii():
+            return None
+        condition["urlFilter"] = line
+
+    return {"action": action, "condition": condition}
+
+
+def condition_key(condition, without=()):
+    """Hashable, order-independent key for a condition."""
+    return json.dumps({k: v for k, v in condition.items() if k not in without}, sort_keys=True)
+
+
+def merge_filters(filters):
+    """
+    Deduplicate filters and fold "||domain^" filters that share an action
+    and options into one requestDomains rule. Returns rule dicts without ids.
+    """
+    seen = set()
+    domain_groups = {}
+    rules = []
+
+    for parsed in filters:
+        action, condition = parsed["action"], dict(parsed["condition"])
+        key = (action, condition_key(condition))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        match = DOMAIN_FILTER_RE.match(condition.get("urlFilter", "").lower())
+        if match and not condition.get("isUrlFilterCaseSensitive"):
+            group_key = (action, condition_key(condition, without=("urlFilter",)))
+            domain_groups.setdefault(group_key, set()).add(match.group(1))
+            continue
+        rules.append({"action": action, "condition": condition})
+
+    for (action, options), domains in sorted(domain_groups.items()):
+        condition = json.loads(options)
+        condition["requestDomains"] = sorted(domains)
+        rules.append({"action": action, "condition": condition})
+
+    for rule in rules:
+        rule["priority"] = ALLOW_PRIORITY if rule["action"] == "allow" else BLOCK_PRIORITY
+        rule["action"] = {"type": rule["action"]}
+    return rules
+
+
+def split_ruleset(name, rules, max_rules=DEFAULT_RULES_PER_RULESET):
+    """Split rules into numbered rulesets of at most max_rules, with ids starting at 1."""
+    chunks = [rules[i:i + max_rules] for i in range(0, len(rules), max_rules)] or [[]]
+    rulesets = {}
+    for index, chunk in enumerate(chunks, start=1):
+        ruleset_id = name if len(chunks) == 1 else f"{name}_{index}"
+        rulesets[ruleset_id] = [
+            {"id": rule_id, "priority": rule["priority"], "action": rule["action"], "condition": rule["condition"]}
+            for rule_id, rule in enumerate(chunk, start=1)
+        ]
+    return rulesets
+
+
+def check_limits(rulesets):
+    """Raise RuleError if the rulesets exceed Chrome's static rule limits."""
+    total = sum(len(rules) for rules in rulesets.values())
+    regex = sum(1 for rules in rulesets.values() for rule in rules if "regexFilter" in rule["condition"])
+
+    if total > GUARANTEED_STATIC_RULES:
+        raise RuleError(f"{total} rules exceed the {GUARANTEED_STATIC_RULES} guaranteed static rules")
+    if regex > MAX_REGEX_RULES:
+        raise RuleError(f"{regex} regex rules exceed the limit of {MAX_REGEX_RULES}")
+    if len(rulesets) > MAX_ENABLED_RULESETS:
+        raise RuleError(f"{len(rulesets)} rulesets exceed the limit of {MAX_ENABLED_RULESETS} enabled rulesets")
+
+
+def read_filter_list(path):
+    """Yield the parsed network filters in one list file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parsed = parse_network_filter(line)
+            if parsed is not None:
+                yield parsed
+
+
+def compile_network_lists(rules_dir=NETWORK_RULES_DIR, max_rules=DEFAULT_RULES_PER_RULESET):
+    """Compile every *.txt list in rules_dir into {ruleset_id: rules}."""
+    rulesets = {}
+    for filename in sorted(os.listdir(rules_dir)):
+        if filename.endswith(".txt"):
+            name = os.path.splitext(filename)[0]
+            rules = merge_filters(read_filter_list(os.path.join(rules_dir, filename)))
+            rulesets.update(split_ruleset(name, rules, max_rules))
+    check_limits(rulesets)
+    return rulesets
+
+
+def write_rulesets(rulesets, extension_dir=EXTENSION_DIR):
+    """Write one JSON file per ruleset and drop files for rulesets that no longer exist."""
+    out_dir = os.path.join(extension_dir, RULESETS_DIRNAME)
+    os.makedirs(out_dir, exist_ok=True)
+
+    sizes = {}
+    for ruleset_id, rules in rulesets.items():
+        text = json.dumps(rules, separators=(",", ":"), sort_keys=True)
+        path = os.path.join(out_dir, f"{ruleset_id}.json")
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+        sizes[ruleset_id] = len(text.encode("utf-8"))
+
+    for filename in os.listdir(out_dir):
+        if filename.endswith(".json") and filename[:-len(".json")] not in rulesets:
+            os.remove(os.path.join(out_dir, filename))
+    return sizes
+
+
+def update_manifest(rulesets, extension_dir=EXTENSION_DIR):
+    """Point the manifest's declarative_net_request at the compiled rulesets."""
+    path = os.path.join(extension_dir, "manifest.json")
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if "declarativeNetRequest" not in manifest.setdefault("permissions", []):
+        manifest["permissions"].append("declarativeNetRequest")
+    manifest["declarative_net_request"] = {
+        "rule_resources": [
+            {"id": ruleset_id, "enabled": True, "path": f"{RULESETS_DIRNAME}/{ruleset_id}.json"}
+            for ruleset_id in rulesets
+        ]
+    }
+
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+        f.write(json.dumps(manifest, indent=2, ensure_ascii=False))
+
+
+def build_report(rulesets, sizes):
+    """Summarize rule counts and output sizes per ruleset."""
+    report = {"rulesets": {}, "total_rules": 0, "total_bytes": 0}
+    for ruleset_id, rules in rulesets.items():
+        domains = sum(len(rule["condition"].get("requestDomains", [])) for rule in rules)
+        report["rulesets"][ruleset_id] = {
+            "rules": len(rules),
+            "merged_domains": domains,
+            "regex_rules": sum(1 for rule in rules if "regexFilter" in rule["condition"]),
+            "bytes": sizes[ruleset_id],
+        }
+        report["total_rules"] += len(rules)
+        report["total_bytes"] += sizes[ruleset_id]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile Chomper network rules to declarativeNetRequest rulesets.")
+    parser.add_argument("--rules-dir", default=NETWORK_RULES_DIR, help="folder of *.txt network filter lists")
+    parser.add_argument("--extension-dir", default=EXTENSION_DIR, help="extension folder to update")
+    parser.add_argument("--max-rules", type=int, default=DEFAULT_RULES_PER_RULESET,
+                        help="rules per ruleset file (default: %(default)s)")
+    parser.add_argument("--report", help="also write the size/rule-count report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        rulesets = compile_network_lists(args.rules_dir, args.max_rules)
+    except RuleError as e:
+        print(f"dnr_compiler: {e}", file=sys.stderr)
+        return 1
+
+    sizes = write_rulesets(rulesets, args.extension_dir)
+    update_manifest(rulesets, args.extension_dir)
+    report = build_report(rulesets, sizes)
+
+    for ruleset_id, info in report["rulesets"].items():
+        print(f"{ruleset_id}: {info['rules']} rules ({info['merged_domains']} merged domains, "
+              f"{info['regex_rules']} regex), {info['bytes']} bytes")
+    print(f"total: {report['total_rules']} rules, {report['total_bytes']} bytes")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
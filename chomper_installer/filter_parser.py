@@ -0,0 +1,254 @@
+"""
+Chomper Ad Blocker - Filter List Parser
+Stream-parses Adblock Plus / EasyList filter lists and turns them into
+Chomper's own rule lists, which rule_compiler.py and dnr_compiler.py then
+compile into the extension.
+
+Lists are read one line at a time through a generator pipeline
+(read -> classify -> normalize), so only the rules that are kept are held
+in memory, never comments, unsupported lines or the raw text. Several
+lists can be parsed in parallel worker processes. Repeated rules, within
+one list or across lists, are dropped once, by their full text, when the
+results are merged.
+
+Usage:
+    python filter_parser.py compile easylist.txt [more.txt ...] --name easylist [--workers 4]
+    python filter_parser.py bench [--lines 300000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import dnr_compiler
+import rule_compiler
+
+# Extended syntaxes the content script cannot evaluate as plain CSS
+UNSUPPORTED_COSMETIC = ("#?#", "#$#", "#@$#", "#@?#")
+UNSUPPORTED_PSEUDOS = (
+    ":-abp-", ":has-text(", ":contains(", ":xpath(", ":upward(", ":remove(",
+    ":style(", ":matches-css", ":matches-path(", ":min-text-length(", ":watch-attr(",
+)
+SELECTOR_CHARS_RE = re.compile(r"^[\w\s#.\[\]=\"'~^$*|:()>+,@\\/%!-]+$")
+
+
+def iter_lines(path):
+    """Yield stripped, non-empty lines of a filter list."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def is_valid_selector(selector):
+    """Conservative check that a selector is plain CSS the browser will accept."""
+    if not selector or not SELECTOR_CHARS_RE.match(selector):
+        return False
+    if any(pseudo in selector for pseudo in UNSUPPORTED_PSEUDOS):
+        return False
+    if selector.count("[") != selector.count("]") or selector.count("(") != selector.count(")"):
+        return False
+    return selector.count('"') % 2 == 0 and selector.count("'") % 2 == 0
+
+
+def classify(lines, stats):
+    """
+    Turn raw lines into ("cosmetic", domains, selector) and ("network", text)
+    records. Comments, exceptions to cosmetic rules and unsupported
+    syntaxes are counted in stats and dropped.
+    """
+    for line in lines:
+        stats["lines"] += 1
+        if line.startswith("!") or line.startswith("["):
+            stats["comments"] += 1
+            continue
+
+        if any(marker in line for marker in UNSUPPORTED_COSMETIC) or "#@#" in line:
+            stats["unsupported"] += 1
+            continue
+
+        if "##" in line:
+            domains, selector = line.split("##", 1)
+            selector = " ".join(selector.split())
+            if not is_valid_selector(selector):
+                stats["unsupported"] += 1
+                continue
+            yield ("cosmetic", domains.strip().lower(), selector)
+            continue
+
+        if dnr_compiler.parse_network_filter(line) is None:
+            stats["unsupported"] += 1
+            continue
+        yield ("network", line)
+
+
+def new_stats():
+    return {"lines": 0, "comments": 0, "unsupported": 0, "duplicates": 0,
+            "generic_cosmetic": 0, "site_cosmetic": 0, "network": 0}
+
+
+def parse_list(path):
+    """
+    Parse one filter list file.
+
+    Returns {"selectors": [...], "network": [...], "stats": {...}} where
+    selectors are cosmetic rules in Chomper's list format (site-specific
+    ones keep their "domains##" prefix) and network holds normalized
+    network filter lines. Repeated rules are kept; parse_lists drops them.
+    """
+    stats = new_stats()
+    selectors, network = [], []
+
+    for record in classify(iter_lines(path), stats):
+        if record[0] == "network":
+            network.append(record[1])
+            stats["network"] += 1
+        elif record[1]:
+            selectors.append(f"{record[1]}##{record[2]}")
+            stats["site_cosmetic"] += 1
+        else:
+            selectors.append(record[2])
+            stats["generic_cosmetic"] += 1
+    return {"selectors": selectors, "network": network, "stats": stats}
+
+
+def parse_lists(paths, workers=1):
+    """
+    Parse several lists, in worker processes when workers > 1, and merge
+    them, dropping every repeated rule.
+    """
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            results = list(pool.map(parse_list, paths))
+    else:
+        results = [parse_list(path) for path in paths]
+
+    merged = {"selectors": [], "network": [], "stats": new_stats()}
+    for result in results:
+        merged["selectors"].extend(result["selectors"])
+        merged["network"].extend(result["network"])
+        for key, value in result["stats"].items():
+            merged["stats"][key] += value
+
+    # Rules repeated within or across lists
+    before = len(merged["selectors"]) + len(merged["network"])
+    merged["selectors"] = rule_compiler.unique(merged["selectors"])
+    merged["network"] = rule_compiler.unique(merged["network"])
+    merged["stats"]["duplicates"] += before - len(merged["selectors"]) - len(merged["network"])
+    return merged
+
+
+def write_rule_list(path, header, rules):
+    """Write a Chomper rule list (one rule per line, "!" comments)."""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(f"! {header}\n")
+        for rule in rules:
+            f.write(rule + "\n")
+
+
+def compile_lists(paths, name, workers=1, rules_dir=rule_compiler.RULES_DIR,
+                  network_rules_dir=dnr_compiler.NETWORK_RULES_DIR):
+    """Parse lists into rules/<name>.txt and network_rules/<name>.txt."""
+    merged = parse_lists(paths, workers)
+    sources = ", ".join(os.path.basename(path) for path in paths)
+
+    write_rule_list(os.path.join(rules_dir, f"{name}.txt"),
+                    f"Generated by filter_parser.py from {sources}", merged["selectors"])
+    write_rule_list(os.path.join(network_rules_dir, f"{name}.txt"),
+                    f"Generated by filter_parser.py from {sources}", merged["network"])
+    return merged["stats"]
+
+
+def write_synthetic_list(path, lines, seed=1):
+    """Write a deterministic EasyList-like list for benchmarking."""
+    rng = random.Random(seed)
+    words = ["ad", "ads", "banner", "sponsor", "promo", "popup", "track", "pixel", "native", "slot"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[Adblock Plus 2.0]\n")
+        for i in range(lines):
+            roll = rng.random()
+            word = rng.choice(words)
+            if roll < 0.05:
+                f.write(f"! comment {i}\n")
+            elif roll < 0.40:
+                f.write(f"##.{word}-{rng.randrange(lines // 4)}\n")
+            elif roll < 0.55:
+                f.write(f"site{rng.randrange(5000)}.example##.{word}-{i}\n")
+            elif roll < 0.60:
+                f.write(f"##div[id^=\"{word}-{i}\"]\n")
+            else:
+                f.write(f"||{word}{rng.randrange(lines // 4)}.example^$third-party\n")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process or its workers in MB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(lines, workers):
+    """Parse and compile a synthetic list of the given size; returns timings."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(max(1, workers)):
+            path = os.path.join(tmp, f"synthetic_{index}.txt")
+            write_synthetic_list(path, lines // max(1, workers), seed=index + 1)
+            paths.append(path)
+
+        started = time.perf_counter()
+        merged = parse_lists(paths, workers)
+        parsed = time.perf_counter()
+        rule_compiler.compile_ruleset(merged["selectors"])
+        dnr_compiler.merge_filters(dnr_compiler.parse_network_filter(line) for line in merged["network"])
+        finished = time.perf_counter()
+
+    return {
+        "lines": merged["stats"]["lines"],
+        "parse_seconds": round(parsed - started, 3),
+        "compile_seconds": round(finished - parsed, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "stats": merged["stats"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse Adblock Plus filter lists for Chomper.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="convert filter lists into Chomper rule lists")
+    compile_cmd.add_argument("lists", nargs="+", help="filter list files")
+    compile_cmd.add_argument("--name", required=True, help="name of the generated rule lists")
+    compile_cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                             help="parallel parser processes (default: %(default)s)")
+
+    bench_cmd = commands.add_parser("bench", help="time parsing of a synthetic list")
+    bench_cmd.add_argument("--lines", type=int, default=300000)
+    bench_cmd.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        result = run_benchmark(args.lines, args.workers)
+        rss = "n/a" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.1f} MB"
+        print(f"{result['lines']} lines: parse {result['parse_seconds']} s, "
+              f"compile {result['compile_seconds']} s, peak RSS {rss}")
+        return 0
+
+    stats = compile_lists(args.lists, args.name, args.workers)
+    print(", ".join(f"{key}: {value}" for key, value in stats.items()))
+    print("Run rule_compiler.py and dnr_compiler.py to rebuild the extension rules.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+Chomper Ad Blocker Installer - Fleet Deployment
+Installs the extension for every user of a shared machine or VDI image in
+one run.
+
+Each home folder is a target, together with the browsers that have a user
+data folder in it (or the browsers named explicitly). Homes are installed
+by a bounded pool of worker threads, each into its own
+Documents/chomper-ad-blocker, hard-linked from one shared source tree
+where the filesystem allows it. Every targeted browser also gets a
+per-user launcher that loads the extension (a .desktop file on Linux, a
+Start menu .cmd on Windows), and with an update URL the browsers that read
+managed policy get a policy (a policy file on Linux, HKEY_LOCAL_MACHINE
+registry values on Windows) pointing every installed copy at the rule
+update feed. The result is one summary row per home and browser.
+
+Home folders belong to their users, so when running as root nothing under
+a home is written, read for a launcher or handed over through a symlink:
+such a home gets a failed row instead.
+
+This module must not import any GUI toolkit.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import chomper_core
+from browser_discovery import BROWSERS, BrowserDiscovery
+
+DEFAULT_WORKERS = 8
+POLICY_FILENAME = "chomper.json"
+LOAD_EXTENSION_FLAG = "--load-extension="
+
+# Home folders that do not belong to a person
+SKIPPED_HOMES = {"All Users", "Default", "Default User", "Public", "lost+found"}
+SYSTEM_DESKTOP_DIRS = ["/usr/local/share/applications", "/usr/share/applications"]
+USER_DESKTOP_DIR = ".local/share/applications"
+USER_START_MENU_DIR = r"AppData\Roaming\Microsoft\Windows\Start Menu\Programs"
+
+
+def default_homes_root(platform=None):
+    """Folder holding every user's home folder."""
+    platform = sys.platform if platform is None else platform
+    if platform.startswith("win"):
+        return os.path.join(os.environ.get("SystemDrive", "C:") + os.sep, "Users")
+    return "/home"
+
+
+def unpacked_extension_id(path, platform=None):
+    """The id Chromium gives an unpacked extension loaded from path."""
+    platform = sys.platform if platform is None else platform
+    if platform.startswith("win"):
+        # Chromium hashes the UTF-16 path with an upper-case drive letter
+        if len(path) > 1 and path[1] == ":":
+            path = path[0].upper() + path[1:]
+        data = path.encode("utf-16-le")
+    else:
+        data = path.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    return "".join(chr(ord("a") + int(ch, 16)) for ch in digest)
+
+
+def add_load_extension(desktop_text, dest):
+    """Add dest to the --load-extension flag of every Exec line of a .desktop file."""
+    lines = []
+    for line in desktop_text.splitlines():
+        if line.startswith("Exec=") and dest not in line:
+            if LOAD_EXTENSION_FLAG in line:
+                line = line.replace(LOAD_EXTENSION_FLAG, f"{LOAD_EXTENSION_FLAG}{dest},", 1)
+            else:
+                command, _, rest = line[len("Exec="):].partition(" ")
+                flag = f'"{LOAD_EXTENSION_FLAG}{dest}"' if " " in dest else LOAD_EXTENSION_FLAG + dest
+                line = f"Exec={command} {flag}" + (f" {rest}" if rest else "")
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def read_policy(path):
+    """An existing policy file as a dict; empty when missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            policy = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return policy if isinstance(policy, dict) else {}
+
+
+def write_registry_policy(key, ext_ids, update_url):
+    """
+    Set the updateUrl policy of every extension id under key, a browser's
+    HKEY_LOCAL_MACHINE policy key; entries of other ids are left alone.
+    Returns the key written to.
+    """
+    import winreg
+
+    extensions = f"{key}\\3rdparty\\extensions"
+    for ext_id in ext_ids:
+        with winreg.CreateKeyEx(winreg.HKEY_LOCAL_MACHINE, f"{extensions}\\{ext_id}\\policy",
+                                0, winreg.KEY_WRITE) as policy:
+            winreg.SetValueEx(policy, "updateUrl", 0, winreg.REG_SZ, update_url)
+    return f"HKEY_LOCAL_MACHINE\\{extensions}"
+
+
+class FleetDeployment:
+    """
+    Deploys the extension to every home folder under homes_root.
+
+    root re-bases the system folders that are read or written (launchers
+    and policies) onto a fake filesystem and platform stands in for
+    sys.platform, as in BrowserDiscovery, so a deployment can be rehearsed
+    in a temporary folder.
+    """
+
+    def __init__(self, homes_root=None, users=None, browsers=None, workers=DEFAULT_WORKERS,
+                 update_url=None, root=None, platform=None):
+        self.platform = sys.platform if platform is None else platform
+        self.paths = BrowserDiscovery(root=root, platform=self.platform)
+        self.homes_root = homes_root or self.paths.rooted(default_homes_root(self.platform))
+        self.users = set(users) if users else None
+        self.browsers = browsers
+        self.workers = max(1, workers)
+        self.update_url = update_url
+
+    @property
+    def is_windows(self):
+        return self.platform.startswith("win")
+
+    def homes(self):
+        """Home folders to deploy to, sorted by user name."""
+        try:
+            names = sorted(os.listdir(self.homes_root))
+        except OSError:
+            return []
+        return [os.path.join(self.homes_root, name) for name in names
+                if not name.startswith(".") and name not in SKIPPED_HOMES
+                and (self.users is None or name in self.users)
+                and os.path.isdir(os.path.join(self.homes_root, name))]
+
+    def user_data_dir(self, home, info):
+        """A browser's user data folder inside a home folder."""
+        relative = info.get("user_data" if self.is_windows else "linux_user_data")
+        if not relative:
+            return None
+        return os.path.join(home, *relative.replace("\\", "/").split("/"))
+
+    @staticmethod
+    def profiles(user_data):
+        """Names of the browser profiles in a user data folder."""
+        if os.path.isfile(os.path.join(user_data, "Preferences")):
+            return ["Default"]  # Single-profile layout, e.g. Opera
+        try:
+            names = sorted(os.listdir(user_data))
+        except OSError:
+            return []
+        return [name for name in names if os.path.isfile(os.path.join(user_data, name, "Preferences"))]
+
+    def targets(self):
+        """Yield (home, [(browser, profiles)]) for every home with something to deploy to."""
+        for home in self.homes():
+            browsers = []
+            for name, info in BROWSERS.items():
+                if self.browsers is not None and name not in self.browsers:
+                    continue
+                user_data = self.user_data_dir(home, info)
+                found = user_data is not None and os.path.isdir(user_data)
+                # Named browsers are set up even for users who have not run them yet
+                if found or self.browsers is not None:
+                    browsers.append((name, self.profiles(user_data) if found else []))
+            if browsers:
+                yield home, browsers
+
+    def make_user_dirs(self, home, path):
+        """
+        Create path and any missing parents, owned by the home's owner.
+        Raises chomper_core.UnsafePath if any of them is a symlink.
+        """
+        chomper_core.check_no_symlinks(home, path)
+        missing = []
+        while not os.path.isdir(path) and path != home:
+            missing.append(path)
+            path = os.path.dirname(path)
+        for directory in reversed(missing):
+            os.mkdir(directory)
+            self.give_to_owner(home, directory)
+
+    @staticmethod
+    def give_to_owner(home, path):
+        """When running as root, hand path (never a symlink's target) to the owner of home."""
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            st = os.stat(home)
+            os.chown(path, st.st_uid, st.st_gid, follow_symlinks=False)
+
+    def write_launcher(self, home, info, dest):
+        """
+        Write a per-user .desktop launcher that loads dest, based on the
+        user's own launcher or the system one. Returns its path, or None
+        when the browser has no launcher to base it on. A symlinked user
+        launcher, or folder on the way to it, raises chomper_core.UnsafePath.
+        """
+        for desktop_id in info.get("desktop_files", []):
+            user_path = os.path.join(home, *USER_DESKTOP_DIR.split("/"), desktop_id)
+            chomper_core.check_no_symlinks(home, user_path)
+            sources = [user_path] + [self.paths.rooted(os.path.join(d, desktop_id)) for d in SYSTEM_DESKTOP_DIRS]
+            for source in sources:
+                try:
+                    with open(source, encoding="utf-8") as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                updated = add_load_extension(text, dest)
+                if source != user_path or updated != text:
+                    self.make_user_dirs(home, os.path.dirname(user_path))
+                    tmp_path = user_path + ".chomper-tmp"
+                    with chomper_core.open_new_file(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(updated)
+                    self.give_to_owner(home, tmp_path)
+                    os.replace(tmp_path, user_path)
+                return user_path
+        return None
+
+    def write_cmd_launcher(self, home, name, dest):
+        """
+        Write a per-user Start menu .cmd that starts the browser with dest
+        loaded. Returns its path, or None when the browser is not installed.
+        A symlinked launcher, or folder on the way to it, raises
+        chomper_core.UnsafePath.
+        """
+        executable = self.paths.resolve(name)
+        if not executable:
+            return None
+        path = os.path.join(home, *USER_START_MENU_DIR.split("\\"), f"{name} (Chomper).cmd")
+        chomper_core.check_no_symlinks(home, path)
+        self.make_user_dirs(home, os.path.dirname(path))
+        tmp_path = path + ".chomper-tmp"
+        with chomper_core.open_new_file(tmp_path, "w", encoding="utf-8", newline="\r\n") as f:
+            f.write("@echo off\nchcp 65001 >nul\n")
+            # cmd expands %VAR% even inside quotes
+            command = f'start "" "{executable}" "{LOAD_EXTENSION_FLAG}{dest}"'.replace("%", "%%")
+            f.write(command + " %*\n")
+        self.give_to_owner(home, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def install_home(self, source, home, browsers):
+        """Install into one home folder; returns its summary rows."""
+        dest = os.path.join(home, "Documents", chomper_core.EXTENSION_NAME)
+        base = {"user": os.path.basename(home), "home": home, "dest": dest,
+                "extension_id": unpacked_extension_id(dest, self.platform)}
+        try:
+            self.make_user_dirs(home, dest)
+            chomper_core.check_install_dest(dest, source)
+            stats = chomper_core.copy_extension_tree(source, dest, link=True)
+            for dirpath, dirnames, filenames in os.walk(dest):
+                for dirname in dirnames:
+                    self.give_to_owner(home, os.path.join(dirpath, dirname))
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    # Copies (and the install manifest) are the user's; hard
+                    # links share their owner with the source tree
+                    if os.lstat(path).st_nlink == 1:
+                        self.give_to_owner(home, path)
+        except Exception as e:
+            return [{**base, "browser": name, "profiles": profiles, "status": "failed", "error": str(e)}
+                    for name, profiles in browsers]
+
+        rows = []
+        for name, profiles in browsers:
+            row = {**base, "browser": name, "profiles": profiles, "status": "installed", **stats}
+            try:
+                if self.is_windows:
+                    row["launcher"] = self.write_cmd_launcher(home, name, dest)
+                else:
+                    row["launcher"] = self.write_launcher(home, BROWSERS[name], dest)
+            except OSError as e:
+                row.update(status="failed", error=f"launcher: {e}")
+            rows.append(row)
+        return rows
+
+    def write_policies(self, rows):
+        """
+        Point every installed copy at the update feed through each
+        browser's managed policy folder, or its policy registry key on
+        Windows. Returns {browser: policy path or key}.
+        """
+        if not self.update_url:
+            return {}
+        written = {}
+        for name, info in BROWSERS.items():
+            ids = sorted({row["extension_id"] for row in rows
+                          if row["browser"] == name and row["status"] == "installed"})
+            if not ids:
+                continue
+            if self.is_windows:
+                if info.get("windows_policies"):
+                    written[name] = write_registry_policy(info["windows_policies"], ids, self.update_url)
+                continue
+            if not info.get("linux_policies"):
+                continue
+            directory = self.paths.rooted(info["linux_policies"])
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, POLICY_FILENAME)
+            # Homes left out of this run keep their entries
+            policy = read_policy(path)
+            extensions = policy.setdefault("3rdparty", {}).setdefault("extensions", {})
+            extensions.update({ext_id: {"updateUrl": self.update_url} for ext_id in ids})
+            tmp_path = path + ".tmp"
+            with chomper_core.open_new_file(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(policy, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+            written[name] = path
+        return written
+
+    def run(self, source, shared_dir=None):
+        """
+        Deploy source to every target; returns the summary rows. With
+        shared_dir the source is first extracted there once, so the homes
+        can hard-link from a tree on their own filesystem.
+        """
+        if shared_dir:
+            chomper_core.copy_extension_tree(source, shared_dir)
+            source = shared_dir
+
+        targets = list(self.targets())
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(targets)))) as pool:
+            results = pool.map(lambda target: self.install_home(source, *target), targets)
+            rows = [row for home_rows in results for row in home_rows]
+
+        policies = self.write_policies(rows)
+        for row in rows:
+            if row["browser"] in policies and row["status"] == "installed":
+                row["policy"] = policies[row["browser"]]
+        return rows
@@ -0,0 +1,251 @@
+"""
+Chomper Ad Blocker - Rule Compiler
+Compiles the cosmetic selector lists in rules/ into the rulesets that the
+extension's content script loads.
+
+Each line of a list is a CSS selector, optionally limited to some sites
+with an Adblock Plus-style prefix ("example.com,~shop.example.com##.ad").
+Generic selectors go to chomper-ad-blocker/rules.js, which every page
+loads, and to chomper-ad-blocker/hide.css, which the background script
+registers so the browser applies it before the page is first painted.
+Site-specific selectors go to chomper-ad-blocker/site_rules.json,
+an index keyed by "site:<hostname>" that the background script copies
+into chrome.storage; a page looks up only the keys for its own hostname
+and its parent domains, so unrelated sites never pay for them.
+
+For every list (and every site entry) the compiler emits:
+  groups     selectors merged into a few comma-joined strings; the content
+             script turns each group into one rule of its hiding stylesheet
+  selectors  the same selectors one by one
+  exclude    (site entries only) generic selectors switched off on that site
+
+The selector list lets the content script rebuild the groups without the
+selectors a site excludes; groups cannot be split back reliably because
+selectors such as ":is(a, b)" contain commas themselves.
+
+Every hide.css rule is scoped to ":root:not([data-chomper-off])", so the
+content script can switch the registered stylesheet off in place by
+setting that attribute. Every list is its own ruleset, including lists
+imported with filter_parser.py; all but the YouTube rules spare the
+protected playback containers, in hide.css and in the content script.
+
+Usage:
+    python rule_compiler.py [--rules-dir rules] [--output chomper-ad-blocker/rules.js]
+                            [--site-output chomper-ad-blocker/site_rules.json]
+                            [--css-output chomper-ad-blocker/hide.css]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_DIR = os.path.join(BASE_DIR, "rules")
+OUTPUT_PATH = os.path.join(BASE_DIR, "chomper-ad-blocker", "rules.js")
+SITE_OUTPUT_PATH = os.path.join(BASE_DIR, "chomper-ad-blocker", "site_rules.json")
+CSS_OUTPUT_PATH = os.path.join(BASE_DIR, "chomper-ad-blocker", "hide.css")
+SITE_KEY_PREFIX = "site:"
+
+# Generic rules never hide these playback containers or their content
+PROTECTED_CONTAINERS = ["#movie_player", ".video-ads", "ytd-display-ad-renderer"]
+# Rulesets written for the YouTube player itself, the only ones allowed inside
+# PROTECTED_CONTAINERS; "universal" and every imported list are guarded
+UNGUARDED_RULESETS = ["youtube"]
+# Set on <html> by the content script while blocking is off
+OFF_ATTRIBUTE = "data-chomper-off"
+# Custom property hide.css sets, so the content script can tell it was applied
+CSS_SENTINEL = "--chomper-hide-css"
+
+# Longest comma-joined selector string emitted per group
+MAX_GROUP_LENGTH = 8192
+
+IDENT = r"-?[A-Za-z_][\w-]*"
+CLASS_RE = re.compile(rf"^\.({IDENT})$")
+
+
+class RuleError(ValueError):
+    """Raised for a selector the content script could not use."""
+
+
+def read_rule_list(path):
+    """
+    Yield (domains, selector) for each rule in a list, skipping blank lines
+    and "!" comments. domains is "" for generic rules.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("!"):
+                continue
+            domains, selector = line.split("##", 1) if "##" in line else ("", line)
+            selector = selector.strip()
+            if not selector or any(ch in selector for ch in "{};") or selector.endswith(","):
+                raise RuleError(f"{path}:{line_no}: not a single CSS selector: {selector}")
+            yield domains.strip().lower(), selector
+
+
+def unique(items):
+    """Drop duplicates while keeping first-seen order."""
+    seen = set()
+    return [item for item in items if not (item in seen or seen.add(item))]
+
+
+def group_selectors(selectors, max_length=MAX_GROUP_LENGTH):
+    """Join selectors with commas into strings no longer than max_length."""
+    groups, current, length = [], [], 0
+    for selector in selectors:
+        if current and length + len(selector) + 1 > max_length:
+            groups.append(",".join(current))
+            current, length = [], 0
+        current.append(selector)
+        length += len(selector) + 1
+    if current:
+        groups.append(",".join(current))
+    return groups
+
+
+def compile_ruleset(selectors, max_length=MAX_GROUP_LENGTH):
+    """Compile one list of selectors into its content-script form."""
+    selectors = unique(selectors)
+    return {"groups": group_selectors(selectors, max_length), "selectors": selectors}
+
+
+def split_site_rules(rules):
+    """
+    Separate generic selectors from site-specific ones.
+
+    Returns (generic, adds, excludes) where adds and excludes map a
+    hostname to the selectors it turns on or off.
+    """
+    generic, adds, excludes = [], {}, {}
+    for domains, selector in rules:
+        included = [d for d in domains.split(",") if d and not d.startswith("~")]
+        excluded = [d[1:] for d in domains.split(",") if d.startswith("~") and len(d) > 1]
+        if not included:
+            generic.append(selector)
+        for domain in included:
+            adds.setdefault(domain, []).append(selector)
+        for domain in excluded:
+            excludes.setdefault(domain, []).append(selector)
+    return generic, adds, excludes
+
+
+def compile_rules(rules_dir=RULES_DIR, max_length=MAX_GROUP_LENGTH):
+    """
+    Compile every *.txt list in rules_dir; rulesets are named after the file.
+
+    Returns (rulesets, site_index): the generic rulesets for rules.js and
+    the per-hostname entries for site_rules.json.
+    """
+    rulesets, site_index = {}, {}
+    for filename in sorted(os.listdir(rules_dir)):
+        if filename.endswith(".txt"):
+            name = os.path.splitext(filename)[0]
+            generic, adds, excludes = split_site_rules(read_rule_list(os.path.join(rules_dir, filename)))
+            rulesets[name] = compile_ruleset(generic, max_length)
+
+            for domain in sorted(set(adds) | set(excludes)):
+                entry = compile_ruleset(adds.get(domain, []), max_length)
+                entry = {key: value for key, value in entry.items() if value}
+                if domain in excludes:
+                    entry["exclude"] = unique(excludes[domain])
+                site_index.setdefault(SITE_KEY_PREFIX + domain, {})[name] = entry
+    return rulesets, site_index
+
+
+def render_rules_js(rulesets):
+    """Render compiled rulesets as the rules.js content script."""
+    body = json.dumps(rulesets, indent=2, sort_keys=True)
+    css = json.dumps({"offAttribute": OFF_ATTRIBUTE, "protected": PROTECTED_CONTAINERS,
+                      "sentinel": CSS_SENTINEL, "unguarded": UNGUARDED_RULESETS}, indent=2, sort_keys=True)
+    return (
+        "// Generated by rule_compiler.py from chomper_installer/rules - do not edit.\n"
+        f"const CHOMPER_RULES = {body};\n"
+        f"const CHOMPER_CSS = {css};\n"
+    )
+
+
+def hide_rules(groups, guarded=False):
+    """
+    CSS rules hiding each selector group, switched off by OFF_ATTRIBUTE.
+    Guarded rules spare PROTECTED_CONTAINERS and their content.
+    """
+    guard = ""
+    if guarded:
+        protected = ", ".join(part for sel in PROTECTED_CONTAINERS for part in (sel, sel + " *"))
+        guard = f":not({protected})"
+    return [f":root:not([{OFF_ATTRIBUTE}]) :is({group}){guard} {{ display: none !important; }}"
+            for group in groups]
+
+
+def render_hide_css(rulesets):
+    """Render the generic rulesets as the registered hide.css stylesheet."""
+    lines = [
+        "/* Generated by rule_compiler.py from chomper_installer/rules - do not edit. */",
+        f":root:not([{OFF_ATTRIBUTE}]) {{ {CSS_SENTINEL}: 1; }}",
+    ]
+    for name, ruleset in sorted(rulesets.items()):
+        lines += hide_rules(ruleset["groups"], guarded=name not in UNGUARDED_RULESETS)
+    return "\n".join(lines) + "\n"
+
+
+def write_if_changed(text, path):
+    """Write text to path unless it already holds exactly that; returns True if written."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    return True
+
+
+def write_rules_js(rulesets, path=OUTPUT_PATH):
+    """Write rules.js, leaving the file untouched if nothing changed."""
+    return write_if_changed(render_rules_js(rulesets), path)
+
+
+def write_hide_css(rulesets, path=CSS_OUTPUT_PATH):
+    """Write hide.css, leaving the file untouched if nothing changed."""
+    return write_if_changed(render_hide_css(rulesets), path)
+
+
+def write_site_index(site_index, path=SITE_OUTPUT_PATH):
+    """Write the compact per-hostname index; returns its size in bytes."""
+    text = json.dumps(site_index, separators=(",", ":"), sort_keys=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    return len(text.encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile Chomper cosmetic rule lists.")
+    parser.add_argument("--rules-dir", default=RULES_DIR, help="folder of *.txt selector lists")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="compiled rules.js to write")
+    parser.add_argument("--site-output", default=SITE_OUTPUT_PATH, help="per-site index to write")
+    parser.add_argument("--css-output", default=CSS_OUTPUT_PATH, help="registered hide.css to write")
+    args = parser.parse_args(argv)
+
+    try:
+        rulesets, site_index = compile_rules(args.rules_dir)
+    except RuleError as e:
+        print(f"rule_compiler: {e}", file=sys.stderr)
+        return 1
+
+    changed = write_rules_js(rulesets, args.output)
+    css_changed = write_hide_css(rulesets, args.css_output)
+    site_bytes = write_site_index(site_index, args.site_output)
+    for name, ruleset in rulesets.items():
+        print(f"{name}: {len(ruleset['selectors'])} selectors in {len(ruleset['groups'])} group(s)")
+    print(f"{'Wrote' if changed else 'Unchanged'} {args.output}")
+    print(f"{'Wrote' if css_changed else 'Unchanged'} {args.css_output}")
+    print(f"Wrote {args.site_output} ({len(site_index)} sites, {site_bytes} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
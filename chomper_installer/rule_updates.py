@@ -0,0 +1,438 @@
+"""
+Chomper Ad Blocker - Rule Updates
+Publishes versioned rule snapshots and compact diffs between them, so
+installed extensions pick up new rules without a new installer.
+
+A feed is a folder served over HTTP:
+  latest.json           {"version", "base", "diffs": [versions with a diff to latest]}
+  snapshots/<v>.json    the full rule state of version v
+  diffs/<a>-<b>.json    what changed from version a to version b
+
+Version 0 is the state bundled with the extension (site_rules.json and the
+static declarativeNetRequest rulesets); "base" is a hash of those files,
+so an extension only applies a feed built on top of its own bundle. Site
+entries are diffed per "site:<hostname>" storage key. Network rules keep a
+stable key across versions: "<ruleset>/<id>" for bundled static rules,
+which the extension switches off or on again, and a number for newer
+rules, which become dynamic rules with that id.
+
+The background script polls <update URL>/latest.json on a schedule and
+fetches the diff from its own version, or resets to version 0 and applies
+diffs/0-<latest>.json when no shorter diff is published.
+
+Usage:
+    python rule_updates.py publish [--feed updates] [--keep 10] [--new-base]
+    python rule_updates.py serve [--feed updates] [--port 8765]
+    python rule_updates.py bench [--sites 5000] [--rules 20000] [--change 0.01]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import dnr_compiler
+import rule_compiler
+from rule_compiler import RuleError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEED_DIR = os.path.join(BASE_DIR, "updates")
+EXTENSION_DIR = dnr_compiler.EXTENSION_DIR
+SITE_RULES_FILENAME = "site_rules.json"
+
+DEFAULT_KEEP = 10
+DEFAULT_PORT = 8765
+
+
+# ----------------------------------------------------------------------
+# Rule state
+# ----------------------------------------------------------------------
+
+def rule_key(rule):
+    """Order-independent text of a network rule without its id."""
+    return json.dumps({k: v for k, v in rule.items() if k != "id"}, sort_keys=True)
+
+
+def bundle_files(extension_dir=EXTENSION_DIR):
+    """Paths of the bundled rule files, in the order the base hash covers them."""
+    with open(os.path.join(extension_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    resources = manifest.get("declarative_net_request", {}).get("rule_resources", [])
+    return [SITE_RULES_FILENAME] + [resource["path"] for resource in resources]
+
+
+def bundle_base(extension_dir=EXTENSION_DIR):
+    """
+    SHA-256 of the bundled rule files; background.js computes the same hash
+    of its own files to tell whether a feed applies to it.
+    """
+    digest = hashlib.sha256()
+    for rel_path in bundle_files(extension_dir):
+        with open(os.path.join(extension_dir, *rel_path.split("/")), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def bundled_state(extension_dir=EXTENSION_DIR):
+    """Version 0: the site index and static rules shipped with the extension."""
+    with open(os.path.join(extension_dir, SITE_RULES_FILENAME), encoding="utf-8") as f:
+        site = json.load(f)
+
+    network = {}
+    with open(os.path.join(extension_dir, "manifest.json"), encoding="utf-8") as f:
+        resources = json.load(f).get("declarative_net_request", {}).get("rule_resources", [])
+    for resource in resources:
+        with open(os.path.join(extension_dir, *resource["path"].split("/")), encoding="utf-8") as f:
+            for rule in json.load(f):
+                network[f"{resource['id']}/{rule['id']}"] = {k: v for k, v in rule.items() if k != "id"}
+
+    return {"version": 0, "base": bundle_base(extension_dir), "next_id": 1, "site": site, "network": network}
+
+
+def next_state(previous, site, network_rules, bundled=None):
+    """
+    Build the state that follows previous. Rules already in previous keep
+    their key, rules back from the bundled state get their static key again
+    and new rules get the next unused dynamic id.
+    """
+    known = {}
+    for state in (previous, bundled or previous):
+        for key, rule in state["network"].items():
+            known.setdefault(rule_key(rule), key)
+
+    network, seen, next_id = {}, set(), previous["next_id"]
+    for rule in network_rules:
+        text = rule_key(rule)
+        if text in seen:
+            continue
+        seen.add(text)
+        key = known.get(text)
+        if key is None:
+            key, next_id = str(next_id), next_id + 1
+        network[key] = {k: v for k, v in rule.items() if k != "id"}
+
+    return {"version": previous["version"] + 1, "base": previous["base"], "next_id": next_id,
+            "site": site, "network": network}
+
+
+def compiled_rules(rules_dir=rule_compiler.RULES_DIR, network_rules_dir=dnr_compiler.NETWORK_RULES_DIR):
+    """Compile the current rule lists into (site index, network rules)."""
+    _, site = rule_compiler.compile_rules(rules_dir)
+    rulesets = dnr_compiler.compile_network_lists(network_rules_dir)
+    return site, [rule for rules in rulesets.values() for rule in rules]
+
+
+# ----------------------------------------------------------------------
+# Diffs
+# ----------------------------------------------------------------------
+
+def diff_states(old, new):
+    """The changes that turn state old into state new."""
+    return {
+        "from": old["version"],
+        "to": new["version"],
+        "base": new["base"],
+        "site": {
+            "set": {key: entry for key, entry in sorted(new["site"].items()) if old["site"].get(key) != entry},
+            "remove": sorted(set(old["site"]) - set(new["site"])),
+        },
+        "network": {
+            "add": {key: rule for key, rule in sorted(new["network"].items())
+                    if old["network"].get(key) != rule},
+            "remove": sorted(set(old["network"]) - set(new["network"])),
+        },
+    }
+
+
+def apply_diff(state, diff):
+    """Apply a diff to a state; the reference for what background.js does."""
+    if diff["from"] != state["version"] or diff["base"] != state["base"]:
+        raise RuleError(f"diff {diff['from']}-{diff['to']} does not apply to version {state['version']}")
+    site = {key: entry for key, entry in state["site"].items() if key not in diff["site"]["remove"]}
+    site.update(diff["site"]["set"])
+    network = {key: rule for key, rule in state["network"].items() if key not in diff["network"]["remove"]}
+    network.update(diff["network"]["add"])
+    return {**state, "version": diff["to"], "site": site, "network": network}
+
+
+def same_rules(a, b):
+    return a["site"] == b["site"] and a["network"] == b["network"]
+
+
+# ----------------------------------------------------------------------
+# Feed
+# ----------------------------------------------------------------------
+
+def to_json(data):
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+
+def write_json(path, data):
+    """Write compact JSON through a temporary file, so readers never see half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8", newline="\n") as f:
+        f.write(to_json(data))
+    os.replace(path + ".tmp", path)
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def snapshot_path(feed_dir, version):
+    return os.path.join(feed_dir, "snapshots", f"{version}.json")
+
+
+def diff_path(feed_dir, old_version, new_version):
+    return os.path.join(feed_dir, "diffs", f"{old_version}-{new_version}.json")
+
+
+def publish(state, feed_dir=FEED_DIR, keep=DEFAULT_KEEP):
+    """
+    Write state as a new version with diffs from version 0 and the last
+    keep versions, then point latest.json at it. Returns {from_version: bytes}.
+    """
+    write_json(snapshot_path(feed_dir, state["version"]), state)
+    sources = sorted({0} | set(range(max(0, state["version"] - keep), state["version"])))
+
+    sizes = {}
+    for version in sources:
+        old = read_json(snapshot_path(feed_dir, version))
+        diff = diff_states(old, state)
+        if not same_rules(apply_diff(old, diff), state):
+            raise RuleError(f"diff {version}-{state['version']} does not reproduce the snapshot")
+        write_json(diff_path(feed_dir, version, state["version"]), diff)
+        sizes[version] = len(to_json(diff).encode("utf-8"))
+
+    # Diffs to older versions are never requested again
+    for filename in os.listdir(os.path.join(feed_dir, "diffs")):
+        if not filename.endswith(f"-{state['version']}.json"):
+            os.remove(os.path.join(feed_dir, "diffs", filename))
+
+    write_json(os.path.join(feed_dir, "latest.json"),
+               {"version": state["version"], "base": state["base"], "diffs": sources})
+    return sizes
+
+
+def publish_current(feed_dir=FEED_DIR, keep=DEFAULT_KEEP, new_base=False, extension_dir=EXTENSION_DIR):
+    """
+    Publish the current rule lists as the next version of the feed.
+
+    Returns (version, diff sizes), with diff sizes None when nothing changed.
+    """
+    base = bundled_state(extension_dir)
+    latest_path = os.path.join(feed_dir, "latest.json")
+
+    if new_base and os.path.isdir(feed_dir):
+        shutil.rmtree(feed_dir)
+    if not os.path.exists(latest_path):
+        write_json(snapshot_path(feed_dir, 0), base)
+        os.makedirs(os.path.join(feed_dir, "diffs"), exist_ok=True)
+        write_json(latest_path, {"version": 0, "base": base["base"], "diffs": []})
+
+    latest = read_json(latest_path)
+    if latest["base"] != base["base"]:
+        raise RuleError("the extension's bundled rules changed since this feed was started; "
+                        "publish with --new-base to start a feed for the new bundle")
+
+    previous = read_json(snapshot_path(feed_dir, latest["version"]))
+    state = next_state(previous, *compiled_rules(), bundled=read_json(snapshot_path(feed_dir, 0)))
+    if same_rules(previous, state):
+        return previous["version"], None
+    return state["version"], publish(state, feed_dir, keep)
+
+
+def serve(feed_dir=FEED_DIR, port=DEFAULT_PORT):
+    """Serve a feed folder over HTTP until interrupted."""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=feed_dir)
+    with ThreadingHTTPServer(("127.0.0.1", port), handler) as server:
+        print(f"Serving {feed_dir} at http://127.0.0.1:{server.server_address[1]}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+def synthetic_state(sites, rules, seed=1):
+    """A version 0 state with the given number of site entries and network rules."""
+    rng = random.Random(seed)
+    site = {
+        f"site:site{i}.example": {"ads": {"groups": [f".ad-{i},.promo-{rng.randrange(10**6)}"],
+                                          "selectors": [f".ad-{i}", f".promo-{i}"]}}
+        for i in range(sites)
+    }
+    network = {
+        f"ads/{i + 1}": {"action": {"type": "block"}, "priority": 1,
+                         "condition": {"urlFilter": f"||ads{i}.example^", "domainType": "thirdParty"}}
+        for i in range(rules)
+    }
+    return {"version": 0, "base": "synthetic", "next_id": 1, "site": site, "network": network}
+
+
+def changed_state(state, change, seed=2):
+    """The next version of a state with a fraction of its entries and rules changed."""
+    rng = random.Random(seed)
+    site = dict(state["site"])
+    for key in rng.sample(sorted(site), int(len(site) * change)):
+        if rng.random() < 0.5:
+            del site[key]
+        else:
+            site[key] = {"ads": {"groups": [f".changed-{rng.randrange(10**6)}"]}}
+    for i in range(int(len(site) * change / 2)):
+        site[f"site:new{i}.example"] = {"ads": {"groups": [f".new-{i}"]}}
+
+    rules = [rule for rule in state["network"].values()]
+    for index in sorted(rng.sample(range(len(rules)), int(len(rules) * change)), reverse=True):
+        del rules[index]
+    rules += [{"action": {"type": "block"}, "priority": 1,
+               "condition": {"urlFilter": f"||fresh{i}.example^"}} for i in range(int(len(rules) * change))]
+    return next_state(state, site, rules)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def apply_to_store(store, diff):
+    """
+    Apply a diff to a key-value store the way background.js does, one
+    serialized value per "site:" or "net:" key. Returns keys written or removed.
+    """
+    for key in diff["site"]["remove"]:
+        store.pop(key, None)
+    for key in diff["network"]["remove"]:
+        store.pop("net:" + key, None)
+    for key, entry in diff["site"]["set"].items():
+        store[key] = json.dumps(entry, sort_keys=True)
+    for key, rule in diff["network"]["add"].items():
+        store["net:" + key] = json.dumps(rule, sort_keys=True)
+    return (len(diff["site"]["remove"]) + len(diff["network"]["remove"])
+            + len(diff["site"]["set"]) + len(diff["network"]["add"]))
+
+
+def fetch(url):
+    """GET url; returns (body bytes, seconds)."""
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        body = response.read()
+    return body, time.perf_counter() - started
+
+
+def run_benchmark(sites, rules, change):
+    """
+    Publish two synthetic versions to a local feed, then fetch and apply the
+    update both as a diff and as a full replacement.
+    """
+    old = synthetic_state(sites, rules)
+    new = changed_state(old, change)
+
+    with tempfile.TemporaryDirectory() as feed_dir:
+        write_json(snapshot_path(feed_dir, 0), old)
+        os.makedirs(os.path.join(feed_dir, "diffs"))
+        publish(new, feed_dir)
+
+        handler = functools.partial(QuietHandler, directory=feed_dir)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            fetch(f"{url}/latest.json")  # Warm up the connection path
+            diff_body, diff_fetch = fetch(f"{url}/diffs/0-1.json")
+            full_body, full_fetch = fetch(f"{url}/snapshots/1.json")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    # Both start from a store holding version 0
+    base_store = {}
+    apply_to_store(base_store, diff_states({**old, "site": {}, "network": {}}, old))
+
+    store = dict(base_store)
+    started = time.perf_counter()
+    diff_keys = apply_to_store(store, json.loads(diff_body))
+    diff_apply = time.perf_counter() - started
+
+    full_store = dict(base_store)
+    started = time.perf_counter()
+    snapshot = json.loads(full_body)
+    full_store.clear()
+    full_keys = apply_to_store(full_store, diff_states({**snapshot, "version": 0, "site": {}, "network": {}},
+                                                       snapshot))
+    full_apply = time.perf_counter() - started
+
+    if store != full_store:
+        raise RuleError("diff and full replacement disagree")
+    return {
+        "diff": {"bytes": len(diff_body), "fetch_ms": round(diff_fetch * 1000, 2),
+                 "apply_ms": round(diff_apply * 1000, 2), "keys": diff_keys},
+        "full": {"bytes": len(full_body), "fetch_ms": round(full_fetch * 1000, 2),
+                 "apply_ms": round(full_apply * 1000, 2), "keys": full_keys},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish differential Chomper rule updates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish_cmd = commands.add_parser("publish", help="publish the current rule lists as a new version")
+    publish_cmd.add_argument("--feed", default=FEED_DIR, help="feed folder (default: %(default)s)")
+    publish_cmd.add_argument("--keep", type=int, default=DEFAULT_KEEP,
+                             help="earlier versions that get a direct diff (default: %(default)s)")
+    publish_cmd.add_argument("--new-base", action="store_true",
+                             help="start a new feed on the extension's current bundled rules")
+
+    serve_cmd = commands.add_parser("serve", help="serve a feed folder over HTTP")
+    serve_cmd.add_argument("--feed", default=FEED_DIR)
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    bench_cmd = commands.add_parser("bench", help="compare a diff update with a full replacement")
+    bench_cmd.add_argument("--sites", type=int, default=5000)
+    bench_cmd.add_argument("--rules", type=int, default=20000)
+    bench_cmd.add_argument("--change", type=float, default=0.01, help="fraction of rules changed")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.feed, args.port)
+        return 0
+
+    if args.command == "bench":
+        result = run_benchmark(args.sites, args.rules, args.change)
+        for mode, info in result.items():
+            print(f"{mode}: {info['bytes']} bytes, fetch {info['fetch_ms']} ms, "
+                  f"apply {info['apply_ms']} ms ({info['keys']} keys)")
+        return 0
+
+    try:
+        version, sizes = publish_current(args.feed, args.keep, args.new_base)
+    except RuleError as e:
+        print(f"rule_updates: {e}", file=sys.stderr)
+        return 1
+
+    if sizes is None:
+        print(f"Unchanged: version {version} is current")
+        return 0
+    for old_version, size in sizes.items():
+        print(f"diff {old_version}-{version}: {size} bytes")
+    print(f"Published version {version} to {args.feed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
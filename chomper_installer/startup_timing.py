@@ -0,0 +1,61 @@
+"""
+Chomper Ad Blocker Installer - Startup Timing
+Measures how long the GUI installer takes to paint its first page.
+
+Run it on a display, or headless under Xvfb:
+
+    xvfb-run -a python startup_timing.py --runs 5
+    xvfb-run -a python startup_timing.py --runs 5 --all-pages
+
+--all-pages also builds every page before the first paint, which is what
+the installer did before pages were built lazily, so the two runs give a
+before/after comparison.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure_once(all_pages):
+    """Start the installer in this process and return ms to first paint."""
+    started = time.perf_counter()
+
+    from chomper_gui import ChomperAdBlockerInstaller
+
+    app = ChomperAdBlockerInstaller()
+    if all_pages:
+        for index, build in enumerate(app.page_builders):
+            if app.pages[index] is None:
+                app.pages[index] = build()
+    app.root.update()
+    elapsed = (time.perf_counter() - started) * 1000
+    app.root.destroy()
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure installer time-to-first-page.")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to time (default: %(default)s)")
+    parser.add_argument("--all-pages", action="store_true", help="build every page up front")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(f"{measure_once(args.all_pages):.1f}")
+        return 0
+
+    # Each run gets a fresh interpreter so imports and font loading are cold
+    command = [sys.executable, __file__, "--child"] + (["--all-pages"] if args.all_pages else [])
+    timings = [float(subprocess.check_output(command, text=True).strip()) for _ in range(args.runs)]
+
+    mode = "all pages" if args.all_pages else "lazy pages"
+    print(f"time to first page ({mode}, {args.runs} runs): "
+          f"median {statistics.median(timings):.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Shared test setup: the installer modules import each other as top-level
+modules, so the chomper_installer folder goes on sys.path.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,130 @@
+"""Browser discovery against fake filesystem roots, for Linux and Windows layouts."""
+
+import os
+import time
+
+from browser_discovery import BrowserDiscovery
+
+SLOW_PROBE = 0.005  # s per probe when simulating a slow disk
+
+
+def touch(root, path, text="", executable=True):
+    full = os.path.join(str(root), *path.replace("\\", "/").replace(":", "").split("/"))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "w", encoding="utf-8") as f:
+        f.write(text)
+    if executable:
+        os.chmod(full, 0o755)
+    return full
+
+
+def linux(root, browsers=None, path="/usr/local/bin"):
+    return BrowserDiscovery(browsers=browsers, root=str(root), platform="linux",
+                            environ={"HOME": "/home/me", "PATH": path})
+
+
+def test_linux_install_locations(tmp_path):
+    chrome = touch(tmp_path, "/opt/google/chrome/chrome")
+
+    assert linux(tmp_path).resolve("Google Chrome") == chrome
+    assert linux(tmp_path).detected() == ["Google Chrome"]
+
+
+def test_path_commands_are_rooted(tmp_path):
+    brave = touch(tmp_path, "/usr/local/bin/brave-browser")
+
+    assert linux(tmp_path).resolve("Brave Browser") == brave
+
+
+def test_desktop_launchers(tmp_path):
+    vivaldi = touch(tmp_path, "/srv/vivaldi/vivaldi")
+    touch(tmp_path, "/home/me/.local/share/applications/vivaldi-stable.desktop",
+          "[Desktop Entry]\nExec=/srv/vivaldi/vivaldi %U\n", executable=False)
+    # Sandboxed launchers are skipped
+    touch(tmp_path, "/usr/share/applications/opera.desktop",
+          "[Desktop Entry]\nExec=flatpak run com.opera.Opera\n", executable=False)
+
+    found = linux(tmp_path).resolve_all()
+
+    assert found["Vivaldi"] == vivaldi
+    assert found["Opera"] is None
+
+
+def test_candidates_keep_their_priority(tmp_path):
+    fixed = touch(tmp_path, "/usr/bin/google-chrome")
+    touch(tmp_path, "/usr/local/bin/google-chrome-stable")
+
+    assert linux(tmp_path).resolve("Google Chrome") == fixed
+
+
+def test_windows_system_and_per_user_installs(tmp_path):
+    edge = touch(tmp_path, r"C:\Program Files\Microsoft\Edge\Application\msedge.exe")
+    brave = touch(tmp_path, r"C:\Users\me\AppData\Local\BraveSoftware\Brave-Browser\Application\brave.exe")
+    discovery = BrowserDiscovery(root=str(tmp_path), platform="win32",
+                                 environ={"LOCALAPPDATA": r"C:\Users\me\AppData\Local", "PATH": ""})
+
+    assert discovery.resolve("Microsoft Edge") == edge
+    assert discovery.resolve("Brave Browser") == brave
+    assert discovery.detected() == ["Microsoft Edge", "Brave Browser"]
+
+
+def test_results_are_cached_until_cleared(tmp_path):
+    chrome = touch(tmp_path, "/usr/bin/google-chrome")
+    discovery = linux(tmp_path)
+    assert discovery.resolve("Google Chrome") == chrome
+
+    os.remove(chrome)
+    assert discovery.resolve("Google Chrome") == chrome
+
+    discovery.clear_cache()
+    assert discovery.resolve("Google Chrome") is None
+
+
+def synthetic_browsers(root, count):
+    """count fake browsers with several candidates each; every third is installed."""
+    browsers = {}
+    for index in range(count):
+        name = f"Browser {index}"
+        browsers[name] = {
+            "linux_paths": [f"/opt/b{index}/missing", f"/opt/b{index}/browser"],
+            "commands": [f"browser-{index}"],
+            "desktop_files": [f"browser-{index}.desktop"],
+        }
+        if index % 3 == 0:
+            touch(root, f"/opt/b{index}/browser")
+    return browsers
+
+
+def test_many_synthetic_candidates(tmp_path):
+    browsers = synthetic_browsers(tmp_path, 300)
+
+    found = linux(tmp_path, browsers).resolve_all()
+
+    assert [name for name, path in found.items() if path] == [f"Browser {i}" for i in range(0, 300, 3)]
+
+
+def timed_resolve(discovery):
+    started = time.perf_counter()
+    discovery.resolve_all()
+    return time.perf_counter() - started
+
+
+def test_concurrent_probing_beats_sequential_on_a_slow_disk(tmp_path, monkeypatch):
+    browsers = synthetic_browsers(tmp_path, 40)
+    probe = BrowserDiscovery.probe
+
+    def slow_probe(self, candidate):
+        time.sleep(SLOW_PROBE)
+        return probe(self, candidate)
+
+    monkeypatch.setattr(BrowserDiscovery, "probe", slow_probe)
+    sequential = linux(tmp_path, browsers)
+    sequential.max_workers = 1
+    concurrent = linux(tmp_path, browsers)
+
+    before = timed_resolve(sequential)
+    after = timed_resolve(concurrent)
+    cached = timed_resolve(concurrent)
+
+    assert after < before / 3
+    assert cached < after / 10
@@ -0,0 +1,40 @@
+"""Build numbers only grow, and installs never build into the installer's tree."""
+
+import os
+import subprocess
+
+import build_extension
+
+
+def no_git(*args, **kwargs):
+    raise OSError("git not found")
+
+
+def test_version_is_the_build_number_and_the_hash_goes_in_the_name():
+    manifest = build_extension.stamp_version({"version": "1.2.3"}, "ffffffff" + "0" * 56, 7)
+
+    assert manifest == {"version": "1.2.3.7", "version_name": "1.2.3 (ffffffff)"}
+
+
+def test_without_git_each_new_content_gets_a_higher_number(tmp_path, monkeypatch):
+    monkeypatch.setattr(subprocess, "run", no_git)
+    out_dir = str(tmp_path / "out")
+
+    _, first = build_extension.build_extension(out_dir=out_dir)
+    _, same = build_extension.build_extension(out_dir=out_dir)
+    stamp = build_extension.read_stamp(os.path.join(out_dir, build_extension.EXTENSION_NAME))
+    changed = build_extension.build_number(build_extension.SOURCE_DIR, "0" * 64, stamp)
+
+    assert first == same == "1.0.0.1"
+    assert changed == 2
+
+
+def test_installs_build_into_the_user_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
+
+    target = build_extension.ensure_built()
+
+    assert target == os.path.join(str(tmp_path / "cache"), "chomper", "build", build_extension.EXTENSION_NAME)
+    assert os.path.isfile(os.path.join(target, "manifest.json"))
+    assert build_extension.ensure_built() == target
@@ -0,0 +1,64 @@
+"""The headless install command only installs into a folder it may own."""
+
+import os
+
+import pytest
+
+import chomper
+import chomper_core
+
+
+def write(path, text="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    root = tmp_path / "src"
+    write(str(root / "manifest.json"), '{"manifest_version": 3, "name": "Chomper Ad-Blocker"}')
+    write(str(root / "content.js"), "// content")
+    monkeypatch.setattr(chomper_core, "find_extension_source", lambda: str(root))
+    return str(root)
+
+
+def test_refuses_a_non_empty_folder_without_a_manifest(tmp_path, source, capsys):
+    dest = tmp_path / "mydocs"
+    write(str(dest / "important.txt"), "keep me")
+    write(str(dest / "sub" / "a.txt"), "keep me too")
+
+    code = chomper.main(["install", "--dest", str(dest), "--quiet"])
+
+    assert code == chomper.EXIT_USAGE
+    assert "not empty" in capsys.readouterr().err
+    assert sorted(os.listdir(dest)) == ["important.txt", "sub"]
+    assert (dest / "important.txt").read_text(encoding="utf-8") == "keep me"
+    assert (dest / "sub" / "a.txt").read_text(encoding="utf-8") == "keep me too"
+
+
+def test_installs_into_a_new_folder_and_updates_it_later(tmp_path, source):
+    dest = tmp_path / "new" / "chomper"
+
+    assert chomper.main(["install", "--dest", str(dest), "--quiet"]) == chomper.EXIT_OK
+    assert (dest / chomper_core.INSTALL_MANIFEST).is_file()
+    # Now an install of ours, so a second run is allowed
+    assert chomper.main(["install", "--dest", str(dest), "--quiet"]) == chomper.EXIT_OK
+
+
+def test_installs_into_an_empty_folder(tmp_path, source):
+    dest = tmp_path / "empty"
+    dest.mkdir()
+
+    assert chomper.main(["install", "--dest", str(dest), "--quiet"]) == chomper.EXIT_OK
+    assert (dest / "content.js").is_file()
+
+
+def test_upgrades_a_copy_made_before_install_manifests(tmp_path, source):
+    dest = tmp_path / "old"
+    write(str(dest / "manifest.json"), '{"manifest_version": 3, "name": "Chomper Ad-Blocker"}')
+    write(str(dest / "popup.js"), "// old")
+
+    assert chomper.main(["install", "--dest", str(dest), "--quiet"]) == chomper.EXIT_OK
+    assert (dest / "content.js").is_file()
+    assert (dest / "popup.js").is_file()  # Not recorded by any manifest, so left alone
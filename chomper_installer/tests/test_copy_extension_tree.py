@@ -0,0 +1,131 @@
+"""copy_extension_tree only ever removes files an earlier run installed."""
+
+import json
+import os
+
+import chomper_core
+
+
+def write(path, text="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_source(root, files=("manifest.json", "content.js", "icons/icon.png")):
+    for rel_path in files:
+        write(os.path.join(root, *rel_path.split("/")), rel_path)
+    return root
+
+
+def listing(root):
+    return sorted(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/")
+                  for dirpath, _, names in os.walk(root) for name in names)
+
+
+def test_first_install_keeps_foreign_files(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    write(os.path.join(dest, "important.txt"))
+    write(os.path.join(dest, "sub", "a.txt"))
+
+    stats = chomper_core.copy_extension_tree(source, dest)
+
+    assert stats["removed"] == 0
+    assert "important.txt" in listing(dest)
+    assert "sub/a.txt" in listing(dest)
+
+
+def test_files_dropped_from_the_source_are_removed(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    chomper_core.copy_extension_tree(source, dest)
+
+    os.remove(os.path.join(source, "icons", "icon.png"))
+    os.rmdir(os.path.join(source, "icons"))
+    stats = chomper_core.copy_extension_tree(source, dest)
+
+    assert stats["removed"] == 1
+    assert not os.path.exists(os.path.join(dest, "icons"))
+    assert listing(dest) == sorted(["content.js", chomper_core.INSTALL_MANIFEST, "manifest.json"])
+
+
+def test_files_added_next_to_an_install_are_kept(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    chomper_core.copy_extension_tree(source, dest)
+    write(os.path.join(dest, "notes.txt"))
+    write(os.path.join(dest, "icons", "mine.png"))
+
+    os.remove(os.path.join(source, "icons", "icon.png"))
+    stats = chomper_core.copy_extension_tree(source, dest)
+
+    assert stats["removed"] == 1
+    assert "notes.txt" in listing(dest)
+    assert "icons/mine.png" in listing(dest)
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    chomper_core.copy_extension_tree(source, dest)
+
+    stats = chomper_core.copy_extension_tree(source, dest)
+
+    assert stats == {"copied": 0, "linked": 0, "skipped": 3, "removed": 0,
+                     "bytes_copied": 0, "bytes_hashed": 0, "bytes_read": 0}
+
+
+def test_repeat_install_reads_and_copies_nothing(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    size = sum(os.path.getsize(os.path.join(source, *rel_path.split("/")))
+               for rel_path in ("manifest.json", "content.js", "icons/icon.png"))
+
+    first = chomper_core.copy_extension_tree(source, dest)
+    second = chomper_core.copy_extension_tree(source, dest)
+
+    # The first install hashes every file and reads it again to copy it
+    assert (first["bytes_copied"], first["bytes_hashed"], first["bytes_read"]) == (size, size, 2 * size)
+    assert (second["bytes_copied"], second["bytes_hashed"], second["bytes_read"]) == (0, 0, 0)
+
+
+def test_manifest_entries_outside_dest_are_ignored(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    outside = str(tmp_path / "outside.txt")
+    write(outside)
+    chomper_core.copy_extension_tree(source, dest)
+
+    manifest_path = os.path.join(dest, chomper_core.INSTALL_MANIFEST)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    entry = manifest["files"]["content.js"]
+    manifest["files"]["../outside.txt"] = entry
+    manifest["files"]["/etc/passwd"] = entry
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    stats = chomper_core.copy_extension_tree(source, dest)
+
+    assert stats["removed"] == 0
+    assert os.path.exists(outside)
+
+
+def test_stale_entries_go_through_no_symlinked_folder(tmp_path):
+    source = make_source(str(tmp_path / "src"))
+    dest = str(tmp_path / "dest")
+    chomper_core.copy_extension_tree(source, dest)
+
+    # icons/ is swapped for a link to a folder holding a file of the same name
+    victim = tmp_path / "victim"
+    write(str(victim / "icon.png"))
+    for name in os.listdir(os.path.join(dest, "icons")):
+        os.remove(os.path.join(dest, "icons", name))
+    os.rmdir(os.path.join(dest, "icons"))
+    os.symlink(str(victim), os.path.join(dest, "icons"))
+    os.remove(os.path.join(source, "icons", "icon.png"))
+
+    chomper_core.copy_extension_tree(source, dest)
+
+    assert (victim / "icon.png").exists()
@@ -0,0 +1,145 @@
+"""dnr_compiler turns network filter lists into declarativeNetRequest rulesets."""
+
+import json
+import os
+
+import pytest
+
+import dnr_compiler
+from rule_compiler import RuleError
+
+
+def compile_lines(lines):
+    return dnr_compiler.merge_filters(filter(None, map(dnr_compiler.parse_network_filter, lines)))
+
+
+def write_list(directory, name, lines):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_domain_filters_fold_into_request_domains():
+    rules = compile_lines(["||ads.example.com^", "||Tracker.example.net^", "||ads.example.com^",
+                           "/banner/*"])
+
+    assert rules == [
+        {"action": {"type": "block"}, "priority": dnr_compiler.BLOCK_PRIORITY,
+         "condition": {"urlFilter": "/banner/*"}},
+        {"action": {"type": "block"}, "priority": dnr_compiler.BLOCK_PRIORITY,
+         "condition": {"requestDomains": ["ads.example.com", "tracker.example.net"]}},
+    ]
+
+
+def test_domain_filters_only_fold_with_matching_options():
+    rules = compile_lines(["||a.example^", "||b.example^$script", "||c.example^$script",
+                           "||d.example^$match-case"])
+    conditions = [rule["condition"] for rule in rules]
+
+    assert {"requestDomains": ["a.example"]} in conditions
+    assert {"requestDomains": ["b.example", "c.example"], "resourceTypes": ["script"]} in conditions
+    assert {"urlFilter": "||d.example^", "isUrlFilterCaseSensitive": True} in conditions
+    assert len(rules) == 3
+
+
+def test_third_party_and_domain_options():
+    parsed = dnr_compiler.parse_network_filter("/ad.js$third-party,script,domain=a.example|~b.a.example")
+
+    assert parsed == {"action": "block", "condition": {
+        "urlFilter": "/ad.js",
+        "domainType": "thirdParty",
+        "resourceTypes": ["script"],
+        "initiatorDomains": ["a.example"],
+        "excludedInitiatorDomains": ["b.a.example"],
+    }}
+    assert dnr_compiler.parse_network_filter("/x$~third-party")["condition"]["domainType"] == "firstParty"
+    assert dnr_compiler.parse_network_filter("/x$1p")["condition"]["domainType"] == "firstParty"
+    assert dnr_compiler.parse_network_filter("/x$~image")["condition"]["excludedResourceTypes"] == ["image"]
+
+
+def test_exceptions_become_allow_rules_that_outrank_blocks():
+    rules = compile_lines(["||ads.example^", "@@||ads.example^$domain=news.example", "@@/ok/ad.js"])
+    allow = [rule for rule in rules if rule["action"] == {"type": "allow"}]
+    block = [rule for rule in rules if rule["action"] == {"type": "block"}]
+
+    assert [rule["condition"] for rule in allow] == [
+        {"urlFilter": "/ok/ad.js"},
+        {"requestDomains": ["ads.example"], "initiatorDomains": ["news.example"]},
+    ]
+    assert all(rule["priority"] > block[0]["priority"] for rule in allow)
+
+
+@pytest.mark.parametrize("line", [
+    "",
+    "! comment",
+    "[Adblock Plus 2.0]",
+    "example.com##.ad",
+    "example.com#@#.ad",
+    "example.com#?#.ad:-abp-has(.x)",
+    "/ad.js$popup",
+    "/ad.js$csp=script-src 'none'",
+    "/ad.js$redirect=noop.js",
+    "$script,third-party",
+    "||",
+    "/r\u00e9clame/*",
+])
+def test_unsupported_syntax_is_skipped(line):
+    assert dnr_compiler.parse_network_filter(line) is None
+
+
+def test_regex_filters_keep_their_pattern():
+    parsed = dnr_compiler.parse_network_filter(r"/\/ads?\/[0-9]+\//")
+    assert parsed == {"action": "block", "condition": {"regexFilter": r"\/ads?\/[0-9]+\/"}}
+
+
+def test_rulesets_split_at_the_rule_limit(tmp_path):
+    rules_dir = str(tmp_path / "rules")
+    write_list(rules_dir, "ads.txt", [f"/banner-{i}/*" for i in range(25)])
+    write_list(rules_dir, "small.txt", ["/one/*"])
+
+    rulesets = dnr_compiler.compile_network_lists(rules_dir, max_rules=10)
+
+    assert list(rulesets) == ["ads_1", "ads_2", "ads_3", "small"]
+    assert [len(rules) for rules in rulesets.values()] == [10, 10, 5, 1]
+    # Ids restart in every ruleset
+    assert [rule["id"] for rule in rulesets["ads_3"]] == [1, 2, 3, 4, 5]
+
+
+def test_limits_are_enforced(monkeypatch, tmp_path):
+    rules_dir = str(tmp_path / "rules")
+    write_list(rules_dir, "ads.txt", [f"/banner-{i}/*" for i in range(6)] + ["/a+/", "/b+/"])
+
+    monkeypatch.setattr(dnr_compiler, "GUARANTEED_STATIC_RULES", 5)
+    with pytest.raises(RuleError, match="guaranteed static rules"):
+        dnr_compiler.compile_network_lists(rules_dir)
+
+    monkeypatch.setattr(dnr_compiler, "GUARANTEED_STATIC_RULES", 30000)
+    monkeypatch.setattr(dnr_compiler, "MAX_REGEX_RULES", 1)
+    with pytest.raises(RuleError, match="regex rules"):
+        dnr_compiler.compile_network_lists(rules_dir)
+
+    monkeypatch.setattr(dnr_compiler, "MAX_REGEX_RULES", 1000)
+    monkeypatch.setattr(dnr_compiler, "MAX_ENABLED_RULESETS", 2)
+    with pytest.raises(RuleError, match="enabled rulesets"):
+        dnr_compiler.compile_network_lists(rules_dir, max_rules=3)
+
+
+def test_main_writes_rulesets_and_manifest(tmp_path, capsys):
+    rules_dir = str(tmp_path / "rules")
+    extension_dir = str(tmp_path / "extension")
+    write_list(rules_dir, "ads.txt", ["||ads.example^", "||more.example^", "/banner/*"])
+    os.makedirs(os.path.join(extension_dir, "rulesets"))
+    with open(os.path.join(extension_dir, "rulesets", "old.json"), "w", encoding="utf-8") as f:
+        f.write("[]")
+    with open(os.path.join(extension_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "Chomper", "permissions": ["storage"]}, f)
+
+    assert dnr_compiler.main(["--rules-dir", rules_dir, "--extension-dir", extension_dir]) == 0
+
+    assert os.listdir(os.path.join(extension_dir, "rulesets")) == ["ads.json"]
+    with open(os.path.join(extension_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["permissions"] == ["storage", "declarativeNetRequest"]
+    assert manifest["declarative_net_request"]["rule_resources"] == [
+        {"id": "ads", "enabled": True, "path": "rulesets/ads.json"}]
+    assert "ads: 2 rules (2 merged domains, 0 regex)" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+"""filter_parser drops repeated rules once and writes LF rule lists."""
+
+import os
+
+import filter_parser
+
+
+def write(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_repeated_rules_are_dropped_within_and_across_lists(tmp_path):
+    first, second = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    write(first, ["! title", "##.ad", "##.ad", "news.example##.story-ad", "||ads.example^"])
+    write(second, ["##.ad", "##.promo", "||ads.example^", "example.com#?#.x:-abp-has(.y)"])
+
+    merged = filter_parser.parse_lists([first, second])
+
+    assert merged["selectors"] == [".ad", "news.example##.story-ad", ".promo"]
+    assert merged["network"] == ["||ads.example^"]
+    assert merged["stats"]["duplicates"] == 3
+    assert merged["stats"]["comments"] == 1
+    assert merged["stats"]["unsupported"] == 1
+
+
+def test_compiled_lists_use_lf_line_endings(tmp_path):
+    source = str(tmp_path / "easylist.txt")
+    write(source, ["##.ad", "||ads.example^"])
+    rules_dir, network_dir = tmp_path / "rules", tmp_path / "network_rules"
+    rules_dir.mkdir()
+    network_dir.mkdir()
+
+    filter_parser.compile_lists([source], "easylist", rules_dir=str(rules_dir),
+                                network_rules_dir=str(network_dir))
+
+    for directory in (rules_dir, network_dir):
+        with open(os.path.join(directory, "easylist.txt"), "rb") as f:
+            data = f.read()
+        assert b"\r" not in data
+        assert data.endswith(b"\n")
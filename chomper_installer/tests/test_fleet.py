@@ -0,0 +1,222 @@
+"""FleetDeployment rehearsed on a fake Linux root with a few hundred homes."""
+
+import json
+import os
+
+import pytest
+
+import fleet
+
+HOMES = 300
+CHROME = "Google Chrome"
+EDGE = "Microsoft Edge"
+UPDATE_URL = "https://rules.example.com/feed/"
+
+
+def write(path, text="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_source(root):
+    write(os.path.join(root, "manifest.json"), json.dumps({"name": "Chomper", "manifest_version": 3}))
+    write(os.path.join(root, "content.js"), "// content")
+    write(os.path.join(root, "icons", "icon.png"), "png")
+    return root
+
+
+def make_root(tmp_path):
+    """A fake root: system launchers plus HOMES homes with Chrome, Edge or both."""
+    root = str(tmp_path / "root")
+    for desktop_id, command in [("google-chrome.desktop", "/usr/bin/google-chrome-stable"),
+                                ("microsoft-edge.desktop", "/usr/bin/microsoft-edge-stable")]:
+        write(os.path.join(root, "usr", "share", "applications", desktop_id),
+              f"[Desktop Entry]\nName=Browser\nExec={command} %U\n")
+
+    browsers = {}
+    for index in range(HOMES):
+        user = f"user{index:03d}"
+        home = os.path.join(root, "home", user)
+        browsers[user] = [CHROME, EDGE] if index % 3 == 0 else [CHROME] if index % 3 == 1 else [EDGE]
+        if CHROME in browsers[user]:
+            write(os.path.join(home, ".config", "google-chrome", "Default", "Preferences"), "{}")
+        if EDGE in browsers[user]:
+            write(os.path.join(home, ".config", "microsoft-edge", "Profile 1", "Preferences"), "{}")
+    # Not people, or nothing to deploy to
+    os.makedirs(os.path.join(root, "home", "Public", ".config", "google-chrome"))
+    os.makedirs(os.path.join(root, "home", "nobrowser"))
+    return root, browsers
+
+
+def test_deploys_to_every_home(tmp_path):
+    root, browsers = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    shared = str(tmp_path / "shared")
+
+    rows = fleet.FleetDeployment(root=root, platform="linux", update_url=UPDATE_URL).run(source, shared)
+
+    assert sorted((row["user"], row["browser"]) for row in rows) == sorted(
+        (user, name) for user, names in browsers.items() for name in names)
+    assert {row["status"] for row in rows} == {"installed"}
+
+    shared_manifest = os.stat(os.path.join(shared, "manifest.json"))
+    for row in rows:
+        assert row["dest"] == os.path.join(root, "home", row["user"], "Documents", "chomper-ad-blocker")
+        assert row["profiles"] == (["Default"] if row["browser"] == CHROME else ["Profile 1"])
+
+        # Every copy is a hard link to the shared tree
+        installed = os.stat(os.path.join(row["dest"], "manifest.json"))
+        assert installed.st_ino == shared_manifest.st_ino
+        assert installed.st_nlink > 1
+
+        with open(row["launcher"], encoding="utf-8") as f:
+            assert f"--load-extension={row['dest']} %U" in f.read()
+        assert row["launcher"].startswith(os.path.join(root, "home", row["user"], ".local"))
+
+    assert shared_manifest.st_nlink == 1 + HOMES
+
+    with open(os.path.join(root, "etc", "opt", "chrome", "policies", "managed", "chomper.json"),
+              encoding="utf-8") as f:
+        policy = json.load(f)["3rdparty"]["extensions"]
+    chrome_ids = {row["extension_id"] for row in rows if row["browser"] == CHROME}
+    assert set(policy) == chrome_ids
+    assert len(chrome_ids) == sum(CHROME in names for names in browsers.values())
+    assert {entry["updateUrl"] for entry in policy.values()} == {UPDATE_URL}
+    assert all(row["policy"].endswith("chomper.json") for row in rows)
+
+
+def test_rerun_keeps_launchers_and_links(tmp_path):
+    root, _ = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    deployment = fleet.FleetDeployment(root=root, platform="linux", browsers=[CHROME])
+
+    deployment.run(source)
+    rows = deployment.run(source)
+
+    assert {row["status"] for row in rows} == {"installed"}
+    assert {row["copied"] for row in rows} == {0}
+    with open(rows[0]["launcher"], encoding="utf-8") as f:
+        assert f.read().count("--load-extension=") == 1
+
+
+def test_symlinks_in_a_home_are_refused(tmp_path):
+    root, _ = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    victim = str(tmp_path / "victim")
+    write(os.path.join(victim, "passwd"), "root:x:0:0")
+    write(os.path.join(victim, "chomper-ad-blocker", "keep.txt"), "mine")
+    write(os.path.join(victim, "google-chrome.desktop"), "[Desktop Entry]\nExec=/bin/secret\n")
+
+    homes = os.path.join(root, "home")
+    # The whole Documents folder, the install folder, and the launcher folder
+    os.symlink(victim, os.path.join(homes, "user001", "Documents"))
+    os.makedirs(os.path.join(homes, "user004", "Documents"))
+    os.symlink(os.path.join(victim, "chomper-ad-blocker"),
+               os.path.join(homes, "user004", "Documents", "chomper-ad-blocker"))
+    os.makedirs(os.path.join(homes, "user007", ".local", "share"))
+    os.symlink(victim, os.path.join(homes, "user007", ".local", "share", "applications"))
+    # A launcher that is itself a link
+    launchers = os.path.join(homes, "user010", ".local", "share", "applications")
+    os.makedirs(launchers)
+    os.symlink(os.path.join(victim, "passwd"), os.path.join(launchers, "google-chrome.desktop"))
+
+    rows = fleet.FleetDeployment(root=root, platform="linux", browsers=[CHROME]).run(source)
+    by_user = {row["user"]: row for row in rows}
+
+    for user in ("user001", "user004", "user007", "user010"):
+        assert by_user[user]["status"] == "failed"
+        assert "symlink" in by_user[user]["error"]
+    assert sum(row["status"] == "installed" for row in rows) == len(rows) - 4
+
+    assert sorted(os.listdir(victim)) == ["chomper-ad-blocker", "google-chrome.desktop", "passwd"]
+    assert os.listdir(os.path.join(victim, "chomper-ad-blocker")) == ["keep.txt"]
+    with open(os.path.join(victim, "passwd"), encoding="utf-8") as f:
+        assert f.read() == "root:x:0:0"
+    with open(os.path.join(victim, "google-chrome.desktop"), encoding="utf-8") as f:
+        assert "--load-extension" not in f.read()
+
+
+def test_planted_temporary_file_is_not_written_through(tmp_path):
+    root, _ = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    victim = str(tmp_path / "victim.txt")
+    write(victim, "untouched")
+    deployment = fleet.FleetDeployment(root=root, platform="linux", users=["user002"])
+    dest = deployment.run(source)[0]["dest"]
+
+    # The next run replaces content.js and the manifest through these names
+    write(os.path.join(source, "content.js"), "// content, updated")
+    os.symlink(victim, os.path.join(dest, "content.js.chomper-tmp"))
+    os.symlink(victim, os.path.join(dest, ".chomper-install.json.tmp"))
+    rows = deployment.run(source)
+
+    assert [row["status"] for row in rows] == ["installed"]
+    assert rows[0]["copied"] == 1
+    with open(victim, encoding="utf-8") as f:
+        assert f.read() == "untouched"
+
+
+def test_partial_run_keeps_other_policy_entries(tmp_path):
+    root, browsers = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    policy_path = os.path.join(root, "etc", "opt", "chrome", "policies", "managed", "chomper.json")
+    with_chrome = [user for user, names in browsers.items() if CHROME in names]
+
+    rows = fleet.FleetDeployment(root=root, platform="linux", update_url=UPDATE_URL).run(source)
+    fleet.FleetDeployment(root=root, platform="linux", update_url=UPDATE_URL,
+                          users=[with_chrome[0]]).run(source)
+
+    with open(policy_path, encoding="utf-8") as f:
+        policy = json.load(f)["3rdparty"]["extensions"]
+    assert set(policy) == {row["extension_id"] for row in rows if row["browser"] == CHROME}
+    assert len(policy) == len(with_chrome)
+    assert not os.path.exists(policy_path + ".tmp")
+
+
+def test_windows_gets_cmd_launchers_and_registry_policy(tmp_path, monkeypatch):
+    root = str(tmp_path / "root")
+    chrome = os.path.join(root, "C", "Program Files", "Google", "Chrome", "Application", "chrome.exe")
+    write(chrome, "exe")
+    for user in ("alice", "bob"):
+        write(os.path.join(root, "C", "Users", user, "AppData", "Local", "Google", "Chrome",
+                           "User Data", "Default", "Preferences"), "{}")
+    source = make_source(str(tmp_path / "source"))
+    calls = []
+    monkeypatch.setattr(fleet, "write_registry_policy",
+                        lambda key, ids, url: calls.append((key, ids, url)) or f"HKEY_LOCAL_MACHINE\\{key}")
+
+    rows = fleet.FleetDeployment(root=root, platform="win32", update_url=UPDATE_URL).run(source)
+
+    assert [(row["user"], row["status"]) for row in rows] == [("alice", "installed"), ("bob", "installed")]
+    for row in rows:
+        assert row["launcher"].endswith(os.path.join("Start Menu", "Programs", "Google Chrome (Chomper).cmd"))
+        with open(row["launcher"], "rb") as f:
+            launcher = f.read().decode("utf-8")
+        assert f'"{chrome}" "--load-extension={row["dest"]}" %*\r\n' in launcher
+        assert row["policy"] == r"HKEY_LOCAL_MACHINE\SOFTWARE\Policies\Google\Chrome"
+    assert calls == [(r"SOFTWARE\Policies\Google\Chrome", sorted(row["extension_id"] for row in rows),
+                      UPDATE_URL)]
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="needs root to chown")
+def test_copied_files_belong_to_the_user(tmp_path, monkeypatch):
+    root, _ = make_root(tmp_path)
+    source = make_source(str(tmp_path / "source"))
+    for user, uid in (("user000", 4000), ("user001", 4001)):
+        os.chown(os.path.join(root, "home", user), uid, uid)
+    deployment = fleet.FleetDeployment(root=root, platform="linux", users=["user000", "user001"])
+
+    # user000 gets hard links, user001 copies from a filesystem that cannot link
+    linked = deployment.install_home(source, os.path.join(root, "home", "user000"), [(CHROME, [])])
+    monkeypatch.setattr(os, "link", lambda src, dest: (_ for _ in ()).throw(OSError("cross-device link")))
+    copied = deployment.install_home(source, os.path.join(root, "home", "user001"), [(CHROME, [])])
+
+    assert (linked[0]["linked"], copied[0]["linked"]) == (3, 0)
+    for dirpath, _, filenames in os.walk(copied[0]["dest"]):
+        for filename in filenames:
+            assert os.lstat(os.path.join(dirpath, filename)).st_uid == 4001
+    # Linked files keep the source's owner; only the manifest is the user's
+    owners = {name: os.lstat(os.path.join(linked[0]["dest"], name)).st_uid
+              for name in ("manifest.json", "content.js", ".chomper-install.json")}
+    assert owners == {"manifest.json": 0, "content.js": 0, ".chomper-install.json": 4000}
@@ -0,0 +1,122 @@
+"""
+The GUI's install worker must leave the Tk event loop free: a large copy
+runs on its own thread and only talks to the UI through a queue that an
+after() callback drains.
+"""
+
+import heapq
+import os
+import queue
+import threading
+import time
+
+import chomper_core
+
+FILES = 3000
+FILE_SIZE = 16 * 1024
+TICK_MS = 10
+POLL_MS = 50
+
+
+class StubLoop:
+    """Stands in for Tk's after() loop: runs due callbacks on the calling thread."""
+
+    def __init__(self):
+        self.pending = []
+        self.order = 0
+
+    def after(self, ms, callback):
+        self.order += 1
+        heapq.heappush(self.pending, (time.perf_counter() + ms / 1000, self.order, callback))
+
+    def run(self, timeout):
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            due, _, callback = heapq.heappop(self.pending)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            callback()
+
+
+def make_extension(path, files=FILES):
+    """A large extension tree: a manifest plus files spread over subfolders."""
+    os.makedirs(path)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        f.write('{"manifest_version": 3, "name": "Chomper"}')
+    payload = os.urandom(FILE_SIZE)
+    for index in range(files):
+        folder = os.path.join(path, f"part{index % 20}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"file{index}.bin"), "wb") as f:
+            f.write(payload)
+
+
+def run_worker(loop, source, dest, cancel_after=None):
+    """Start the worker and poll it the way the GUI does; returns what the loop saw."""
+    messages = queue.Queue()
+    cancel = threading.Event()
+    seen = {"ticks": [], "progress_polls": 0, "progress": 0, "result": None}
+
+    def tick():
+        seen["ticks"].append(time.perf_counter())
+        if seen["result"] is None:
+            loop.after(TICK_MS, tick)
+
+    def poll():
+        got_progress = False
+        try:
+            while True:
+                message = messages.get_nowait()
+                if message[0] == "progress":
+                    got_progress = True
+                    seen["progress"] += 1
+                    if cancel_after and seen["progress"] >= cancel_after:
+                        cancel.set()
+                else:
+                    seen["result"] = message
+        except queue.Empty:
+            pass
+        seen["progress_polls"] += got_progress
+        if seen["result"] is None:
+            loop.after(POLL_MS, poll)
+
+    worker = threading.Thread(target=chomper_core.run_install_worker,
+                              args=(messages, cancel, dest, source), daemon=True)
+    started = time.perf_counter()
+    worker.start()
+    loop.after(TICK_MS, tick)
+    loop.after(POLL_MS, poll)
+    loop.run(timeout=120)
+    worker.join(5)
+    seen["elapsed"] = time.perf_counter() - started
+    return seen
+
+
+def test_event_loop_keeps_running_during_large_copy(tmp_path):
+    source = str(tmp_path / "src")
+    dest = str(tmp_path / "dest")
+    make_extension(source)
+
+    seen = run_worker(StubLoop(), source, dest)
+
+    assert seen["result"][0] == "done", seen["result"]
+    assert seen["result"][1]["copied"] == FILES + 1
+    assert seen["progress"] == FILES + 1
+    # Progress arrived over several polls instead of all at the end
+    assert seen["progress_polls"] >= 2
+    # The loop kept servicing its callbacks for the whole copy
+    gaps = [b - a for a, b in zip(seen["ticks"], seen["ticks"][1:])]
+    assert len(seen["ticks"]) >= seen["elapsed"] / (TICK_MS / 1000) / 4
+    assert max(gaps) < 0.5
+
+
+def test_cancel_from_the_event_loop_stops_the_worker(tmp_path):
+    source = str(tmp_path / "src")
+    dest = str(tmp_path / "dest")
+    make_extension(source)
+
+    seen = run_worker(StubLoop(), source, dest, cancel_after=100)
+
+    assert seen["result"] == ("cancelled",)
+    assert seen["progress"] < FILES + 1
@@ -0,0 +1,40 @@
+"""Every compiled ruleset, imported lists included, reaches hide.css and rules.js."""
+
+import os
+
+import rule_compiler
+
+
+def write_lists(rules_dir, lists):
+    os.makedirs(rules_dir)
+    for name, lines in lists.items():
+        with open(os.path.join(rules_dir, f"{name}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def test_imported_lists_are_guarded_like_universal(tmp_path):
+    rules_dir = str(tmp_path / "rules")
+    write_lists(rules_dir, {
+        "universal": [".ad-banner"],
+        "youtube": [".ytp-ad-overlay-slot"],
+        "easylist": [".sponsored-box", "news.example##.story-ad"],
+    })
+
+    rulesets, site_index = rule_compiler.compile_rules(rules_dir)
+    css = rule_compiler.render_hide_css(rulesets).splitlines()
+
+    guard = ":not(#movie_player, #movie_player *"
+    assert [line for line in css if ".sponsored-box" in line][0].count(guard) == 1
+    assert [line for line in css if ".ad-banner" in line][0].count(guard) == 1
+    assert guard not in [line for line in css if ".ytp-ad-overlay-slot" in line][0]
+    assert site_index["site:news.example"]["easylist"] == {"groups": [".story-ad"], "selectors": [".story-ad"]}
+
+
+def test_rules_js_lists_every_ruleset_and_the_unguarded_ones(tmp_path):
+    rules_dir = str(tmp_path / "rules")
+    write_lists(rules_dir, {"universal": [".ad-banner"], "easylist": [".sponsored-box"]})
+
+    rules_js = rule_compiler.render_rules_js(rule_compiler.compile_rules(rules_dir)[0])
+
+    assert '"easylist": {' in rules_js
+    assert '"unguarded": [\n    "youtube"\n  ]' in rules_js
@@ -0,0 +1,189 @@
+"""
+Chomper Ad Blocker - Trace Analyzer
+Summarizes the traces the popup exports in trace mode.
+
+A trace is Chrome Trace Event JSON (it also opens in chrome://tracing or
+Perfetto) holding the last events content.js kept in its ring buffer:
+
+  pass      "X" events for every timed pass (flushAddedNodes, chomperAdBlock,
+            playerMutation, skipAds, recovery)
+  observer  "X" events for every mutation observer callback
+  tick      instants for every sweep, with its removals and next delay
+  match     "X" events for every hiding rule group matched against the
+            nodes a flush added (named "<ruleset>[<group>]", with the
+            group's first selector), and instants for removed overlays
+  skip      instants for every skipped video ad
+  recovery  "X" events spanning every playback stall, named after the
+            method that ended it
+  reload    site rules being (re)applied, and reload recoveries
+
+For one or more traces it reports the pass time percentiles, the rule
+groups that cost the most to match, and how many events of each category
+happened in each time bucket, counted from the start of each trace.
+
+Usage:
+    python trace_analyzer.py TRACE [TRACE ...] [--bucket 10] [--top 10] [--json]
+"""
+
+import argparse
+import json
+import math
+import sys
+
+CATEGORIES = ["pass", "observer", "tick", "match", "skip", "recovery", "reload"]
+PERCENTILES = [0.5, 0.9, 0.99]
+
+
+class TraceError(ValueError):
+    """Raised for a file that is not a Chomper trace."""
+
+
+def load_trace(path):
+    """Return the events of a trace file, without metadata events."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TraceError(f"{path}: {e}") from e
+
+    # Both the object and the bare array form are valid trace files
+    events = data.get("traceEvents") if isinstance(data, dict) else data
+    if not isinstance(events, list):
+        raise TraceError(f"{path}: no traceEvents array")
+    return [event for event in events if isinstance(event, dict) and event.get("ph") in ("X", "i", "I")]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values, as the benchmark harness computes it."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def pass_stats(events):
+    """Count, total and percentile durations (ms) of every pass, by name."""
+    durations = {}
+    for event in events:
+        if event.get("cat") == "pass" and event["ph"] == "X":
+            durations.setdefault(event["name"], []).append(event.get("dur", 0) / 1000)
+
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {"count": len(values), "total_ms": sum(values), "max_ms": values[-1]}
+        for fraction in PERCENTILES:
+            stats[name][f"p{round(fraction * 100)}_ms"] = percentile(values, fraction)
+    return stats
+
+
+def rule_costs(events, top=None):
+    """Rules by the time spent matching them (ms), costliest first."""
+    rules = {}
+    for event in events:
+        if event.get("cat") != "match":
+            continue
+        rule = rules.setdefault(event["name"], {"rule": event["name"], "count": 0, "total_ms": 0.0,
+                                                "max_ms": 0.0, "matches": 0, "first": None})
+        duration = event.get("dur", 0) / 1000
+        rule["count"] += 1
+        rule["total_ms"] += duration
+        rule["max_ms"] = max(rule["max_ms"], duration)
+        args = event.get("args") or {}
+        rule["matches"] += args.get("matches", 0)
+        rule["first"] = rule["first"] or args.get("first")
+
+    ranked = sorted(rules.values(), key=lambda rule: (-rule["total_ms"], -rule["matches"], rule["rule"]))
+    return ranked[:top] if top else ranked
+
+
+def frequency(traces, bucket):
+    """
+    Events per category in bucket-second slices, counted from the first
+    event of each trace, as [{"start_s", "counts"}].
+    """
+    counts = {}
+    for events in traces:
+        if not events:
+            continue
+        start = min(event["ts"] for event in events)
+        for event in events:
+            index = int((event["ts"] - start) / 1e6 // bucket)
+            slot = counts.setdefault(index, {})
+            slot[event.get("cat", "")] = slot.get(event.get("cat", ""), 0) + 1
+
+    last = max(counts, default=-1)
+    return [{"start_s": index * bucket, "counts": counts.get(index, {})} for index in range(last + 1)]
+
+
+def analyze(paths, bucket=10, top=10):
+    """Load every trace and return the combined report."""
+    traces = [load_trace(path) for path in paths]
+    events = [event for trace in traces for event in trace]
+    return {
+        "traces": len(traces),
+        "events": len(events),
+        "passes": pass_stats(events),
+        "rules": rule_costs(events, top),
+        "bucket_s": bucket,
+        "frequency": frequency(traces, bucket),
+    }
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value:.3f}"
+
+
+def print_report(report):
+    print(f"{report['events']} events in {report['traces']} trace(s)")
+
+    print("\npasses (ms):")
+    print(f"  {'name':<20} {'count':>7} {'total':>10} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for name, stats in sorted(report["passes"].items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"  {name:<20} {stats['count']:>7} {stats['total_ms']:>10.1f} {format_ms(stats['p50_ms']):>8} "
+              f"{format_ms(stats['p90_ms']):>8} {format_ms(stats['p99_ms']):>8} {format_ms(stats['max_ms']):>8}")
+
+    print("\ncostliest rules:")
+    if not report["rules"]:
+        print("  (no rule matches recorded)")
+    for rule in report["rules"]:
+        mean = rule["total_ms"] / rule["count"] if rule["count"] else 0
+        print(f"  {rule['rule']:<20} {rule['total_ms']:>10.2f} ms over {rule['count']} checks "
+              f"(mean {mean:.3f} ms, max {rule['max_ms']:.3f} ms), {rule['matches']} matches")
+        if rule["first"]:
+            print(f"    first selector: {rule['first']}")
+
+    print(f"\nevents per {report['bucket_s']:g} s:")
+    categories = [cat for cat in CATEGORIES
+                  if any(cat in slot["counts"] for slot in report["frequency"])]
+    print(f"  {'from':>8} " + " ".join(f"{cat:>8}" for cat in categories))
+    for slot in report["frequency"]:
+        print(f"  {slot['start_s']:>7g}s " + " ".join(f"{slot['counts'].get(cat, 0):>8}" for cat in categories))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize Chomper trace mode exports.")
+    parser.add_argument("traces", nargs="+", help="trace JSON files exported from the popup")
+    parser.add_argument("--bucket", type=float, default=10,
+                        help="seconds per event frequency bucket (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="costliest rules to list (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.bucket > 0 or not math.isfinite(args.bucket):
+        parser.error("--bucket must be a positive number of seconds")
+
+    try:
+        report = analyze(args.traces, args.bucket, args.top)
+    except TraceError as e:
+        print(f"trace_analyzer: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())